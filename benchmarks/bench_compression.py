@@ -0,0 +1,130 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+"""Bytes on the wire and latency of REST call with compressed bodies.
+
+Local stub server receives a large json payload and returns a large json
+response. Each body is delayed by its size divided by bandwidth, to
+simulate slow WAN link of edge site.
+
+Run: python benchmarks/bench_compression.py [bandwidth in Mbit/s]
+"""
+
+import sys
+import gzip
+import json
+import time
+import zlib
+import threading
+from six.moves import BaseHTTPServer, socketserver
+
+from plugins_rest_sdk import utility
+
+TEMPLATE = """
+rest_calls:
+- path: /items
+  method: post
+  host: 127.0.0.1
+  port: {port}
+  ssl: false
+  response_streaming: true
+  response_translation: [[['items', ['id']], ['ids']]]
+"""
+
+CASES = [
+    ('plain', {'response_compression': False}),
+    ('gzip', {'request_compression': 'gzip',
+              'response_compression': ['gzip']}),
+    ('deflate', {'request_compression': 'deflate',
+                 'response_compression': ['deflate']}),
+]
+
+
+def build_items(count=20000):
+    return {'items': [{
+        'id': idx,
+        'name': 'interface-{}'.format(idx),
+        'description': 'uplink of edge gateway',
+        'settings': {'mtu': 1500, 'enabled': True, 'vlan': idx % 4096},
+    } for idx in range(count)]}
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def start_server(response, bandwidth):
+    response = json.dumps(response).encode('utf-8')
+    bodies = {
+        'identity': response,
+        'gzip': gzip.compress(response),
+        'deflate': zlib.compress(response),
+    }
+    stats = {}
+
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            time.sleep(len(body) / bandwidth)
+            encoding = self.headers.get('Content-Encoding')
+            if encoding == 'gzip':
+                json.loads(gzip.decompress(body))
+            elif encoding == 'deflate':
+                json.loads(zlib.decompress(body))
+            else:
+                json.loads(body)
+            accepted = self.headers.get('Accept-Encoding', 'identity')
+            encoding = 'identity'
+            for name in ('gzip', 'deflate'):
+                if name in accepted:
+                    encoding = name
+                    break
+            stats['sent'] = len(body)
+            stats['received'] = len(bodies[encoding])
+            time.sleep(len(bodies[encoding]) / bandwidth)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(bodies[encoding])))
+            if encoding != 'identity':
+                self.send_header('Content-Encoding', encoding)
+            self.end_headers()
+            self.wfile.write(bodies[encoding])
+
+        def log_message(self, *args):
+            pass
+
+    server = _Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, stats
+
+
+def main():
+    bandwidth = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    items = build_items()
+    server, stats = start_server(items, bandwidth * 1024 * 1024 / 8)
+    template = TEMPLATE.format(port=server.server_address[1])
+    print('payload: {0:.1f} MB, bandwidth: {1} Mbit/s'.format(
+        len(json.dumps(items)) / 1024.0 / 1024.0, bandwidth))
+    try:
+        for name, request_props in CASES:
+            seconds = []
+            for _ in range(3):
+                start_time = time.time()
+                # payload is merged to call same as other request props
+                result = utility.process(
+                    {}, template, dict(request_props, payload=items))
+                seconds.append(time.time() - start_time)
+                assert len(result['result_properties']['ids']) == len(
+                    items['items'])
+            print('{0}: sent {1} bytes, received {2} bytes, '
+                  '{3:.3f} s per call'.format(
+                      name, stats['sent'], stats['received'], min(seconds)))
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+"""Cost of REST engine debug logs for a 10 MB response when debug is off.
+
+Run: python benchmarks/bench_lazy_logging.py
+"""
+
+import json
+import logging
+import timeit
+
+from plugins_sdk.filters import (
+    LazyLogText,
+    shorted_text,
+    obfuscate_passwords,
+)
+
+logger = logging.getLogger('rest.sdk.benchmark')
+logger.setLevel(logging.INFO)
+
+
+def build_response(size=10 * 1024 * 1024):
+    item = {
+        'name': 'interface',
+        'description': 'x' * 200,
+        'password': 'secret',
+        'settings': {'mtu': 1500, 'enabled': True},
+    }
+    count = size // len(json.dumps(item))
+    return {'items': [dict(item, id=idx) for idx in range(count)]}
+
+
+def eager(response):
+    logger.debug('Check response in json: {}'.format(
+        shorted_text(obfuscate_passwords(response))))
+
+
+def lazy(response):
+    logger.debug('Check response in json: %s', LazyLogText(response))
+
+
+def main():
+    response = build_response()
+    print('payload: {0:.1f} MB'.format(
+        len(json.dumps(response)) / 1024.0 / 1024.0))
+    for func in (eager, lazy):
+        seconds = min(timeit.repeat(
+            lambda: func(response), number=1, repeat=3))
+        print('{0}: {1:.6f} s per log call'.format(func.__name__, seconds))
+
+
+if __name__ == '__main__':
+    main()
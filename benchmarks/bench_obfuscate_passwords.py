@@ -0,0 +1,80 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+"""Cost of obfuscate_passwords for payloads with 10k keys.
+
+Copy on write walk is compared with previous implementation, which made
+deep copy of dictionary for every string value and secret key.
+
+Run: python benchmarks/bench_obfuscate_passwords.py
+"""
+
+import timeit
+from copy import deepcopy
+
+from plugins_sdk.filters import (
+    OBFUSCATION_KEYWORDS,
+    OBFUSCATED_SECRET,
+    obfuscate_passwords,
+)
+
+
+def deepcopy_obfuscate_passwords(obj):
+    """Dictionary walk of previous implementation."""
+    if not isinstance(obj, dict):
+        return obfuscate_passwords(obj)
+    result = obj
+    for k, v in list(result.items()):
+        if any(x for x in OBFUSCATION_KEYWORDS if x in k.upper()):
+            a_copy = deepcopy(result)
+            a_copy[k] = OBFUSCATED_SECRET
+            result = a_copy
+        elif isinstance(v, str):
+            a_copy = deepcopy(result)
+            a_copy[k] = obfuscate_passwords(v)
+            result = a_copy
+        if isinstance(v, (dict, list,)):
+            obfuscated_v = deepcopy_obfuscate_passwords(v)
+            if obfuscated_v is not v:
+                a_copy = deepcopy(result)
+                a_copy[k] = obfuscated_v
+                result = a_copy
+    return result
+
+
+def build_flat(count):
+    payload = {'key{}'.format(idx): 'value {}'.format(idx)
+               for idx in range(count)}
+    payload['password'] = 'secret'
+    return payload
+
+
+def build_nested(groups=100, keys=100):
+    return {'group{}'.format(group): dict(
+        {'key{}'.format(idx): 'value {}'.format(idx)
+         for idx in range(keys - 1)}, token='secret')
+        for group in range(groups)}
+
+
+def main():
+    payloads = [
+        ('flat 1k keys', build_flat(1000), True),
+        ('flat 10k keys', build_flat(10000), False),
+        ('nested 100x100 keys', build_nested(), True),
+        ('nested 1000x10 keys', build_nested(1000, 10), True),
+    ]
+    for name, payload, with_deepcopy in payloads:
+        funcs = [obfuscate_passwords]
+        if with_deepcopy:
+            # too slow for flat 10k keys
+            assert obfuscate_passwords(payload) == \
+                deepcopy_obfuscate_passwords(payload)
+            funcs.append(deepcopy_obfuscate_passwords)
+        for func in funcs:
+            seconds = min(timeit.repeat(
+                lambda: func(payload), number=1, repeat=3))
+            print('{0}, {1}: {2:.4f} s'.format(
+                name, func.__name__, seconds))
+
+
+if __name__ == '__main__':
+    main()
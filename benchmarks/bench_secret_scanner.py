@@ -0,0 +1,51 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+"""Cost of secret obfuscation in script output and log text.
+
+Scanner searches lower cased ascii text for all keywords at once, it is
+compared with case insensitive regexp used for text before.
+
+Run: python benchmarks/bench_secret_scanner.py
+"""
+
+import random
+import string
+import timeit
+
+from plugins_sdk.filters import OBFUSCATION_RE, get_secret_scanner
+
+
+def build_output(count=20000):
+    random.seed(1)
+    lines = []
+    for idx in range(count):
+        lines.append('2024-01-01 INFO step {0}: {1}'.format(idx, ''.join(
+            random.choice(string.ascii_letters + ' ') for _ in range(40))))
+        if idx % 500 == 0:
+            lines.append('  "password": "secret{}",'.format(idx))
+    return lines
+
+
+def main():
+    scanner = get_secret_scanner()
+    lines = build_output()
+    text = '\n'.join(lines)
+    assert scanner.obfuscate_text(text) == OBFUSCATION_RE.sub(
+        scanner._obfuscate_value, text)
+    cases = [
+        ('text {} KB'.format(len(text) // 1024),
+         lambda: scanner.obfuscate_text(text),
+         lambda: OBFUSCATION_RE.sub(scanner._obfuscate_value, text)),
+        ('{} lines'.format(len(lines)),
+         lambda: [scanner.obfuscate_text(line) for line in lines],
+         lambda: [OBFUSCATION_RE.sub(scanner._obfuscate_value, line)
+                  for line in lines]),
+    ]
+    for name, scan, regexp in cases:
+        for kind, func in (('scanner', scan), ('ignorecase regexp', regexp)):
+            seconds = min(timeit.repeat(func, number=1, repeat=5))
+            print('{0}, {1}: {2:.4f} s'.format(name, kind, seconds))
+
+
+if __name__ == '__main__':
+    main()
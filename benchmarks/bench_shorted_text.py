@@ -0,0 +1,41 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+"""Cost of shorted_text for a 10 MB response, compared with full repr.
+
+Run: python benchmarks/bench_shorted_text.py
+"""
+
+import json
+import timeit
+
+from plugins_sdk.filters import shorted_text
+
+
+def build_response(size=10 * 1024 * 1024):
+    item = {
+        'name': 'interface',
+        'description': 'x' * 200,
+        'settings': {'mtu': 1500, 'enabled': True},
+    }
+    count = size // len(json.dumps(item))
+    return {'items': [dict(item, id=idx) for idx in range(count)]}
+
+
+def full_repr(response, size=1024):
+    text = repr(response)
+    return text[:size - 3] + '...' if len(text) > size else text
+
+
+def main():
+    response = build_response()
+    print('payload: {0:.1f} MB'.format(
+        len(json.dumps(response)) / 1024.0 / 1024.0))
+    assert shorted_text(response) == full_repr(response)
+    for func in (shorted_text, full_repr):
+        seconds = min(timeit.repeat(
+            lambda: func(response), number=1, repeat=3))
+        print('{0}: {1:.6f} s per call'.format(func.__name__, seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,12 @@ class ExpectationException(BaseSdkException):
 
 
 class RecoverableStatusCodeCodeException(BaseSdkException):
-    pass
+
+    def __init__(self, *args, **kwargs):
+        # seconds requested by Retry-After header of response
+        self.retry_after = kwargs.pop('retry_after', None)
+        super(RecoverableStatusCodeCodeException, self).__init__(
+            *args, **kwargs)
 
 
 class WrongTemplateDataException(BaseSdkException):
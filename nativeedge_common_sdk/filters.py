@@ -1,12 +1,15 @@
 # Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
 
 import re
+import hashlib
 import xmltodict
-from copy import deepcopy
-from jinja2 import Environment
+from copy import copy, deepcopy
+from jinja2 import Environment, FileSystemBytecodeCache, meta
 from six import string_types, ensure_text
 
 from nativeedge_common_sdk._compat import text_type
+from nativeedge_common_sdk.lru_cache import LRUCache
+from nativeedge_common_sdk.paths import CompiledPath, get_compiled_path
 
 OBFUSCATION_KEYWORDS = (
     'AUTHORIZATION',
@@ -22,34 +25,19 @@ RE_STRING_ELEM = '|'.join(OBFUSCATION_KEYWORDS)
 RE_STR = r'(("*)(' + repr(RE_STRING_ELEM)[1:-1] + r')("*)(:|=)\s*("*))[^\n",]*'
 OBFUSCATION_RE = re.compile(RE_STR, flags=re.IGNORECASE | re.MULTILINE)
 OBFUSCATED_SECRET = 'x' * 16
+# count of compiled translation rules kept
+TRANSLATION_CACHE_SIZE = 256
+# count of compiled Jinja templates kept
+COMPILED_TEMPLATE_CACHE_SIZE = 256
+# count of secret scanners kept, one for each set of keywords
+SCANNER_CACHE_SIZE = 32
 
 
 def get_field_value_recursive(logger, properties, path):
+    """Value on path in properties, None if path is not found."""
     if not path:
         return properties
-    key = path[0]
-    if isinstance(properties, list):
-        try:
-            return get_field_value_recursive(
-                logger,
-                properties[int(key)],
-                path[1:]
-            )
-        except Exception as e:
-            logger.debug("Can't filter by {}".format(repr(e)))
-            return None
-    elif isinstance(properties, dict):
-        try:
-            return get_field_value_recursive(
-                logger,
-                properties[key],
-                path[1:]
-            )
-        except Exception as e:
-            logger.debug("Can't filter by {}".format(repr(e)))
-            return None
-    else:
-        return None
+    return get_compiled_path(path).get(properties, logger)
 
 
 def _save(runtime_properties_dict_or_subdict, list, value):
@@ -153,17 +141,229 @@ def _translate_and_save_v3(logger, response_json, response_translation,
             logger, response_json, response_translation[param_name])
 
 
+def _get_translation_version(response_translation, translation_version):
+    if translation_version == "v3":
+        return "v3"
+    elif _check_if_v2(response_translation) or translation_version == "v2":
+        return "v2"
+    return "v1"
+
+
+def _store(runtime_dict, parents, last, value):
+    # same as _save, but path is not consumed
+    for key in parents:
+        runtime_dict[key] = runtime_dict.get(key, {}) if isinstance(
+            runtime_dict, dict) else runtime_dict[key]
+        runtime_dict = runtime_dict[key]
+    runtime_dict[last] = value
+
+
+def _is_scalar(value):
+    return not isinstance(value, (list, dict))
+
+
+class _IrregularRules(Exception):
+    pass
+
+
+class TranslationPlan(object):
+    """Translation rules compiled to flat list of steps.
+
+    Result is same as with _translate_and_save_v* functions, but rules
+    are not consumed, so plan can be applied any count of times. Rules
+    with unusual structure are applied by these functions on copy of
+    rules.
+    """
+
+    def __init__(self, response_translation, translation_version="auto"):
+        self.version = _get_translation_version(response_translation,
+                                                translation_version)
+        self.steps = []
+        self._rules = None
+        if not response_translation:
+            return
+        try:
+            if self.version == "v3":
+                self._compile_v3(response_translation)
+            elif self.version == "v2":
+                self._compile_v2(response_translation)
+            else:
+                self._compile_v1(response_translation, ())
+        except _IrregularRules:
+            self.steps = []
+            self._rules = deepcopy(response_translation)
+
+    def _compile_v1(self, response_translation, source):
+        if isinstance(response_translation, list) and response_translation:
+            scalars = [_is_scalar(value) for value in response_translation]
+            if all(scalars):
+                self.steps.append(
+                    (source, (tuple(response_translation[:-1]),
+                              response_translation[-1])))
+            elif any(scalars):
+                raise _IrregularRules()
+            else:
+                # list items are read only from not empty response
+                for idx, value in enumerate(response_translation):
+                    self._compile_v1(value, source + ((True, idx),))
+        elif isinstance(response_translation, dict) and response_translation:
+            for key, value in response_translation.items():
+                self._compile_v1(value, source + ((False, key),))
+        elif source:
+            # nothing to save, but value is still read from response
+            self.steps.append((source, None))
+
+    def _compile_v2(self, response_translation):
+        for translation in response_translation:
+            if not isinstance(translation, list) or len(translation) < 2 \
+                    or not isinstance(translation[0], list) \
+                    or not isinstance(translation[1], list) \
+                    or not translation[1]:
+                raise _IrregularRules()
+            source, target = translation[0], translation[1]
+            markers = [idx for idx, key in enumerate(source)
+                       if isinstance(key, list)]
+            if not markers:
+                self.steps.append((tuple(source), None, None, (
+                    tuple(target[:-1]), target[-1]), None))
+                continue
+            idx = markers[0]
+            if len(markers) > 1 or not source[idx] or \
+                    isinstance(source[idx][0], list):
+                raise _IrregularRules()
+            if isinstance(target[-1], list):
+                prefix, suffix = tuple(target[:-1]), tuple(target[-1])
+            else:
+                prefix, suffix = tuple(target), ()
+            self.steps.append((tuple(source[:idx]), source[idx][0],
+                               tuple(source[idx + 1:]), (prefix, suffix),
+                               deepcopy(target)))
+            # original code stops on first list translation
+            return
+
+    def _compile_v3(self, response_translation):
+        if not isinstance(response_translation, dict):
+            raise _IrregularRules()
+        for param_name, path in response_translation.items():
+            if not isinstance(path, list):
+                raise _IrregularRules()
+            self.steps.append((param_name, CompiledPath(path)))
+
+    def apply(self, logger, response_json, runtime_dict):
+        if self._rules is not None:
+            rules = deepcopy(self._rules)
+            if self.version == "v3":
+                _translate_and_save_v3(logger, response_json, rules,
+                                       runtime_dict)
+            elif self.version == "v2":
+                _translate_and_save_v2(response_json, rules, runtime_dict)
+            else:
+                _translate_and_save_v1(response_json, rules, runtime_dict)
+        elif self.version == "v3":
+            for param_name, path in self.steps:
+                runtime_dict[param_name] = path.get(response_json, logger)
+        elif self.version == "v2":
+            self._apply_v2(response_json, runtime_dict)
+        else:
+            self._apply_v1(response_json, runtime_dict)
+
+    def _apply_v1(self, response_json, runtime_dict):
+        for source, target in self.steps:
+            value = response_json
+            for check_empty, key in source:
+                if check_empty and not value:
+                    break
+                value = value[key]
+            else:
+                if target is not None:
+                    _store(runtime_dict, target[0], target[1], value)
+
+    def _apply_v2(self, response_json, runtime_dict):
+        for source, list_key, list_source, target, list_target \
+                in self.steps:
+            value = response_json
+            for key in source:
+                value = value[key]
+            if list_key is None:
+                _store(runtime_dict, target[0], target[1], value)
+                continue
+            _prepare_runtime_props_for_list(runtime_dict, list_target,
+                                            len(value))
+            prefix, suffix = target
+            for idx, _ in enumerate(value):
+                item = value[idx][list_key]
+                for key in list_source:
+                    item = item[key]
+                path = prefix + (idx,) + suffix
+                _store(runtime_dict, path[:-1], path[-1], item)
+
+
+def compile_translation(response_translation, translation_version="auto"):
+    return TranslationPlan(response_translation, translation_version)
+
+
+_translation_plans = LRUCache(TRANSLATION_CACHE_SIZE)
+
+
+def get_translation_plan(response_translation, translation_version="auto"):
+    """Return cached plan for translation rules."""
+    # rules are plain literals, repr keeps types and order of keys
+    return _translation_plans.get_or_create(
+        (translation_version, repr(response_translation)),
+        lambda: compile_translation(response_translation,
+                                    translation_version))
+
+
+def clear_translation_cache():
+    _translation_plans.clear()
+
+
 def translate_and_save(logger, response_json, response_translation,
                        runtime_dict, translation_version="auto"):
+    get_translation_plan(response_translation, translation_version).apply(
+        logger, response_json, runtime_dict)
+
+
+def _get_v1_result_keys(response_translation):
+    if isinstance(response_translation, dict):
+        items = list(response_translation.values())
+    elif isinstance(response_translation, list):
+        if response_translation and \
+                not isinstance(response_translation[0], (list, dict)):
+            return {response_translation[0]}
+        items = response_translation
+    else:
+        return None
+    keys = set()
+    for item in items:
+        item_keys = _get_v1_result_keys(item)
+        if item_keys is None:
+            return None
+        keys |= item_keys
+    return keys
+
+
+def get_translation_result_keys(response_translation,
+                                translation_version="auto"):
+    """Top level keys which translate_and_save stores to runtime_dict.
+
+    Returns None if keys can't be detected from translation rules.
+    """
+    if not response_translation:
+        return set()
     if translation_version == "v3":
-        _translate_and_save_v3(logger, response_json, response_translation,
-                               runtime_dict)
+        if not isinstance(response_translation, dict):
+            return None
+        return set(response_translation)
     elif _check_if_v2(response_translation) or translation_version == "v2":
-        _translate_and_save_v2(response_json, response_translation,
-                               runtime_dict)
-    else:
-        _translate_and_save_v1(response_json, response_translation,
-                               runtime_dict)
+        keys = set()
+        for translation in response_translation:
+            try:
+                keys.add(translation[1][0])
+            except (TypeError, IndexError, KeyError):
+                return None
+        return keys
+    return _get_v1_result_keys(response_translation)
 
 
 def __correct_substr(text, size):
@@ -180,12 +380,107 @@ def remove_nonascii(text, placeholder="?"):
     return "".join([i if ord(i) < 128 else placeholder for i in text])
 
 
+class _ReprLimitReached(Exception):
+    pass
+
+
+class _BoundedRepr(object):
+    """Builds start of repr of object, stops when limit is reached.
+
+    Dictionaries, lists, tuples, strings and bytes are written part by
+    part, repr of other objects is written whole.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.remaining = limit
+        self.parts = []
+        self._active = set()
+
+    def build(self, obj):
+        try:
+            self._write_obj(obj)
+        except _ReprLimitReached:
+            pass
+        return ''.join(self.parts)[:self.limit]
+
+    def _write(self, text):
+        self.parts.append(text)
+        self.remaining -= len(text)
+        if self.remaining <= 0:
+            raise _ReprLimitReached()
+
+    def _write_obj(self, obj):
+        obj_type = type(obj)
+        if obj_type in (text_type, bytes):
+            self._write(_text_repr_prefix(obj, self.remaining))
+        elif obj_type in (dict, list, tuple):
+            if id(obj) in self._active:
+                # recursive reference, same as repr
+                self._write('{...}' if obj_type is dict else
+                            '[...]' if obj_type is list else '(...)')
+                return
+            self._active.add(id(obj))
+            try:
+                self._write_container(obj)
+            finally:
+                self._active.discard(id(obj))
+        else:
+            self._write(repr(obj))
+
+    def _write_container(self, obj):
+        if type(obj) is dict:
+            self._write('{')
+            for idx, (key, value) in enumerate(obj.items()):
+                if idx:
+                    self._write(', ')
+                self._write_obj(key)
+                self._write(': ')
+                self._write_obj(value)
+            self._write('}')
+            return
+        self._write('[' if type(obj) is list else '(')
+        for idx, value in enumerate(obj):
+            if idx:
+                self._write(', ')
+            self._write_obj(value)
+        if type(obj) is list:
+            self._write(']')
+        else:
+            self._write(',)' if len(obj) == 1 else ')')
+
+
+def _text_repr_prefix(text, limit):
+    """repr of str or bytes, or its start longer than limit"""
+    if len(text) <= limit:
+        return repr(text)
+    result = repr(text[:limit])
+    start = 1 if isinstance(text, bytes) else 0
+    single, double = ("'", '"') if not start else (b"'", b'"')
+    # quotes of repr depend on whole text
+    if single in text and double not in text:
+        quote = '"'
+    else:
+        quote = "'"
+    if result[start] == quote:
+        return result[:-1]
+    body = result[start + 1:-1]
+    if quote == "'":
+        # start of text has single quotes, whole text has both
+        body = body.replace("'", "\\'")
+    return result[:start] + quote + body
+
+
 def shorted_text(obj, size=1024):
     """Limit text to size"""
     if isinstance(obj, string_types):
         text = obj
-    else:
+    elif size < 0:
         text = repr(obj)
+    else:
+        # only start of repr is built, one more symbol shows that repr
+        # is longer than size
+        text = _BoundedRepr(size + 1).build(obj)
     if size <= 3:
         return __correct_substr(text, size)
     elif len(text) > size:
@@ -193,115 +488,219 @@ def shorted_text(obj, size=1024):
     return text
 
 
-def obfuscate_passwords(obj,
-                        regex_string=OBFUSCATION_RE,
-                        obfuscation_keywords=OBFUSCATION_KEYWORDS):
-    """Obfuscate passwords in dictionary or list of dictionaries.
+class LazyLogText(object):
+    """Log argument, obfuscated and shorted only when record is emitted.
 
-    Returns a copy of original object with elements potentially containing
-    passwords obfuscated.  A copy.deepcopy() is used for copying dictionaries
-    but only when absolutely necessary.  If a given object does not contain
-    any passwords, original is returned and deepcopy never performed.
+    logger.debug('Call: %s', LazyLogText(call)) costs nothing when debug
+    is disabled, while shorted_text(obfuscate_passwords(call)) copies and
+    scans the whole object before the logger checks its level.
+    """
+
+    def __init__(self, obj, size=1024, obfuscate=True, use_repr=False):
+        self.obj = obj
+        self.size = size
+        self.obfuscate = obfuscate
+        self.use_repr = use_repr
+
+    def __str__(self):
+        obj = repr(self.obj) if self.use_repr else self.obj
+        if self.obfuscate:
+            obj = obfuscate_passwords(obj)
+        return shorted_text(obj, self.size)
+
+
+# values which are not secrets: numbers, lists of numbers or booleans and
+# dynamic values of helm templates
+_RE_NUMBERS = re.compile(r'^[.0-9]+$')
+_RE_BRACKET_LITERAL = re.compile(r'[\[+]([.0-9]|true|false)')
+_RE_DYNAMIC = re.compile(r'^(\$|\\)')
+# keywords searched in lower cased text by fast path of scanner
+_RE_PLAIN_KEYWORD = re.compile(r'[A-Za-z0-9_]+\Z')
+
+
+def _is_empty_key(line):
+    # check if line has empty key value
+    # case of yaml:
+    # secret: \n
+    #   some_value: test
+    key_val_line = ':' in line and len(line.split(':')) == 2 \
+        and not line.split(':')[1]
+    key_eq_val_line = '=' in line and len(line.split('=')) == 2 \
+        and not line.split('=')[1]
+    if key_val_line or key_eq_val_line:
+        return True
+    return False
+
+
+class SecretScanner(object):
+    """Finds and obfuscates secrets for set of keywords.
+
+    Scanner is built once and shared, see get_secret_scanner. Text is
+    scanned in one pass, ascii text with plain keywords is lower cased
+    and searched with single case sensitive pattern of all keywords, which
+    is much faster than case insensitive search. Every match is then
+    extended to key and value span by regexp of scanner.
+
+    :param keywords: keywords of secret keys.
+    :param regexp: regexp matching key and value, built from keywords
+        if not set.
     """
-    def is_empty_key(line):
-        # check if line has empty key value
-        # case of yaml:
-        # secret: \n
-        #   some_value: test
-        key_val_line = ':' in line and len(line.split(':')) == 2 \
-            and not line.split(':')[1]
-        key_eq_val_line = '=' in line and len(line.split('=')) == 2 \
-            and not line.split('=')[1]
-        if key_val_line or key_eq_val_line:
-            return True
-        return False
-
-    def obfuscate_value(matchobj):
+
+    def __init__(self, keywords=OBFUSCATION_KEYWORDS, regexp=None):
+        self.keywords = tuple(keywords)
+        pattern = r'(("*)(' + repr('|'.join(self.keywords))[1:-1] + \
+            r')("*)(:|=)\s*("*))[^\n",]*'
+        if regexp is None:
+            regexp = re.compile(pattern, flags=re.IGNORECASE | re.MULTILINE)
+        self.regexp = regexp
+        # keywords are compared with upper cased keys of dictionary,
+        # empty keyword never matches
+        key_keywords = [keyword for keyword in self.keywords if keyword]
+        self._key_regexp = None
+        if key_keywords:
+            self._key_regexp = re.compile(
+                '|'.join(re.escape(keyword) for keyword in key_keywords))
+        self._candidate_regexp = None
+        if self.keywords and regexp.pattern == pattern and \
+                regexp.flags & re.IGNORECASE and \
+                all(_RE_PLAIN_KEYWORD.match(keyword)
+                    for keyword in self.keywords):
+            self._candidate_regexp = re.compile(
+                '(' + '|'.join(
+                    keyword.lower() for keyword in self.keywords) +
+                ')"*(:|=)')
+
+    def is_secret_key(self, key):
+        """Key of dictionary contains one of keywords."""
+        if self._key_regexp is None:
+            return False
+        return self._key_regexp.search(key.upper()) is not None
+
+    def obfuscate_text(self, text):
+        """Obfuscate values of secret keys in text."""
+        candidate_regexp = self._candidate_regexp
+        if candidate_regexp is None or not isinstance(text, text_type) or \
+                not text.isascii():
+            return self.regexp.sub(self._obfuscate_value, text)
+        lowered = text.lower()
+        parts = []
+        pos = 0
+        while True:
+            candidate = candidate_regexp.search(lowered, pos)
+            if candidate is None:
+                break
+            # match starts with quotes before keyword
+            start = candidate.start()
+            while start > pos and text[start - 1] == '"':
+                start -= 1
+            match = self.regexp.match(text, start)
+            parts.append(text[pos:start])
+            parts.append(self._obfuscate_value(match))
+            pos = match.end()
+        if not parts:
+            return text
+        parts.append(text[pos:])
+        return ''.join(parts)
+
+    def _obfuscate_value(self, match):
         # this method will investigate the value passed to it
         # and decide whether to hide value or return it as is
-        last_portion = matchobj.group(0).lower().replace(
-            matchobj.group(1).lower(), '')
-        # we have numbers case
-        re_numbers = re.compile(r'^[.0-9]+$')
-        # array of numbers
-        re_bracket_numbers = re.compile(r'[[+][.0-9]+')
-        # true/false
-        re_bracket_true_false = re.compile(r'[[+](true|false)')
-        # a value of $ inside helm comment
-        re_dynamic = re.compile(r'^(\$|\\)')
-        # check if the value has new line
-        re_new_line = re.compile(r'.*\\n')
+        key = match.group(1)
+        last_portion = match.group(0).lower().replace(key.lower(), '')
 
         # new line case
-        if re_new_line.search(last_portion):
-            result = ""
-            splits = matchobj.group(0).split(r'\n')
+        if r'\n' in last_portion:
             # go line by line to check for values to obfuscate
-            for i, line in enumerate(splits):
-                if i < len(splits)-1:
-                    # if empty key_value just skip the line
-                    if is_empty_key(line):
-                        result += line + r'\n'
-                    else:
-                        result += regex_string.sub(obfuscate_value, line) + \
-                            r'\n'
-                else:
-                    result += regex_string.sub(obfuscate_value, line)
-            return result
+            lines = match.group(0).split(r'\n')
+            result = [
+                # if empty key_value just skip the line
+                line if _is_empty_key(line) else self.obfuscate_text(line)
+                for line in lines[:-1]
+            ]
+            result.append(self.obfuscate_text(lines[-1]))
+            return r'\n'.join(result)
 
         # if we have numbers/array-of-numbers/array-of-true-false/dynamic-value
         # return the value as is
-        if re_numbers.search(last_portion) or \
-            re_bracket_numbers.search(last_portion) or \
-                re_bracket_true_false.search(last_portion) or \
-                re_dynamic.search(last_portion):
-            return matchobj.group(0)
+        if _RE_NUMBERS.search(last_portion) or \
+                _RE_BRACKET_LITERAL.search(last_portion) or \
+                _RE_DYNAMIC.search(last_portion):
+            return match.group(0)
         # empty arrays/dict or true/false return the value as is
         last_portion = last_portion.replace(']', '')
         last_portion = last_portion.replace('}', '')
         last_portion = last_portion.replace(')', '')
-        if last_portion.endswith('{') or last_portion.endswith('[') or \
-            last_portion.endswith('(') or \
-            last_portion.lower().endswith('true') or \
-            last_portion.lower().endswith('false') or \
-                last_portion.lower().endswith('null'):
-            return matchobj.group(0)
+        if last_portion.endswith(('{', '[', '(', 'true', 'false', 'null')):
+            return match.group(0)
 
         # check if value has text then obfuscate other than this return value
-        if not matchobj.group(1).endswith('""'):
-            return matchobj.group(1) + OBFUSCATED_SECRET
+        if not key.endswith('""'):
+            return key + OBFUSCATED_SECRET
         else:
-            return matchobj.group(0)
-
-    if isinstance(obj, (text_type, bytes,)):
-        result = regex_string.sub(obfuscate_value, obj)
-        if isinstance(obj, text_type) and obj.endswith('\n'):
-            result = result + '\n'
+            return match.group(0)
+
+    def obfuscate(self, obj):
+        """Obfuscate secrets in text, dictionary or list, same as
+        obfuscate_passwords."""
+        if isinstance(obj, (text_type, bytes,)):
+            result = self.obfuscate_text(obj)
+            if isinstance(obj, text_type) and obj.endswith('\n'):
+                result = result + '\n'
+            return result
+        if isinstance(obj, list):
+            return [self.obfuscate(elem) for elem in obj]
+        if not isinstance(obj, dict):
+            return obj
+        result = obj
+        for k, v in list(obj.items()):
+            new_v = v
+            if self.is_secret_key(k):
+                if isinstance(v, text_type) and v.endswith('\n'):
+                    new_v = OBFUSCATED_SECRET + '\n'
+                else:
+                    new_v = OBFUSCATED_SECRET
+            elif isinstance(v, (text_type, )):
+                new_v = self.obfuscate_text(v)
+            if isinstance(v, (dict, list,)):
+                obfuscated_v = self.obfuscate(v)
+                if obfuscated_v is not v:
+                    new_v = obfuscated_v
+            if new_v is v and not isinstance(v, text_type):
+                continue
+            if result is obj:
+                # dictionary with string value is always returned as copy
+                result = copy(obj)
+            result[k] = new_v
         return result
-    if isinstance(obj, list):
-        return [obfuscate_passwords(elem) for elem in obj]
-    if not isinstance(obj, dict):
-        return obj
-    result = obj
-    for k, v in list(result.items()):
-        if any(x for x in obfuscation_keywords if x in k.upper()):
-            a_copy = deepcopy(result)
-            if isinstance(a_copy[k], text_type) and a_copy[k].endswith('\n'):
-                a_copy[k] = OBFUSCATED_SECRET + '\n'
-            else:
-                a_copy[k] = OBFUSCATED_SECRET
-            result = a_copy
-        elif isinstance(v, (text_type, )):
-            a_copy = deepcopy(result)
-            a_copy[k] = regex_string.sub(obfuscate_value, v)
-            result = a_copy
-        if isinstance(v, (dict, list,)):
-            obfuscated_v = obfuscate_passwords(v)
-            if obfuscated_v is not v:
-                a_copy = deepcopy(result)
-                a_copy[k] = obfuscated_v
-                result = a_copy
-    return result
+
+
+_default_secret_scanner = SecretScanner(OBFUSCATION_KEYWORDS, OBFUSCATION_RE)
+_secret_scanners = LRUCache(SCANNER_CACHE_SIZE)
+
+
+def get_secret_scanner(keywords=OBFUSCATION_KEYWORDS, regexp=None):
+    """Return cached scanner for keywords."""
+    if keywords is OBFUSCATION_KEYWORDS and regexp in (None, OBFUSCATION_RE):
+        return _default_secret_scanner
+    key = (tuple(keywords),
+           None if regexp is None else (regexp.pattern, regexp.flags))
+    return _secret_scanners.get_or_create(
+        key, lambda: SecretScanner(keywords, regexp))
+
+
+def obfuscate_passwords(obj,
+                        regex_string=OBFUSCATION_RE,
+                        obfuscation_keywords=OBFUSCATION_KEYWORDS):
+    """Obfuscate passwords in dictionary or list of dictionaries.
+
+    Returns a copy of original object with elements potentially containing
+    passwords obfuscated.  Dictionaries are copied on write, each changed
+    dictionary is copied once and unchanged values are shared with
+    original.  If a given object does not contain any passwords, original
+    is returned and nothing is copied.
+    """
+    scanner = get_secret_scanner(obfuscation_keywords, regex_string)
+    return scanner.obfuscate(obj)
 
 
 def _toxml(value):
@@ -319,9 +718,65 @@ def _toxml(value):
     return result
 
 
-def render_template(template_txt, params):
-    """Render Jinja template"""
+def _create_template_environment():
     env = Environment()
     env.filters["toxml"] = _toxml
-    template = env.from_string(template_txt)
+    return env
+
+
+# environment is configured once, after that it is safe to share between
+# threads
+_template_env = _create_template_environment()
+_compiled_templates = LRUCache(COMPILED_TEMPLATE_CACHE_SIZE)
+
+
+def set_template_bytecode_cache(directory):
+    """Store bytecode of compiled templates in directory, so other
+    processes skip compilation of same template. None disables it."""
+    if directory is None:
+        _template_env.bytecode_cache = None
+    else:
+        _template_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def _compile_template(name, template_txt):
+    # same as jinja loader with bytecode cache, template has no name same
+    # as template from string
+    bytecode_cache = _template_env.bytecode_cache
+    bucket = None
+    code = None
+    if bytecode_cache is not None:
+        bucket = bytecode_cache.get_bucket(
+            _template_env, name, None, template_txt)
+        code = bucket.code
+    if code is None:
+        code = _template_env.compile(template_txt)
+        if bucket is not None:
+            bucket.code = code
+            bytecode_cache.set_bucket(bucket)
+    return _template_env.template_class.from_code(
+        _template_env, code, _template_env.make_globals(None))
+
+
+def compile_template(template_txt):
+    """Compile Jinja template, result can be rendered many times.
+
+    Compiled templates are cached by hash of source and shared."""
+    key = hashlib.sha256(template_txt.encode('utf-8')).hexdigest()
+    return _compiled_templates.get_or_create(
+        key, lambda: _compile_template(key, template_txt))
+
+
+def clear_compiled_template_cache():
+    _compiled_templates.clear()
+
+
+def get_template_variables(template_txt):
+    """Names of variables which Jinja template takes from params"""
+    return meta.find_undeclared_variables(_template_env.parse(template_txt))
+
+
+def render_template(template_txt, params):
+    """Render Jinja template"""
+    template = compile_template(template_txt)
     return template.render(params)
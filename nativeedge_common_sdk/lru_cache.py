@@ -0,0 +1,57 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache(object):
+    """Thread safe cache of most recently used values.
+
+    :param max_size: count of values kept, least recently used value is
+        removed when limit is reached.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._values.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+
+    def get_or_create(self, key, create):
+        """Return cached value or store value returned by create().
+
+        Value is created without lock, so threads can create value for
+        same key at once, last created value is kept.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = create()
+            self.set(key, value)
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._values.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
@@ -0,0 +1,66 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+from functools import lru_cache
+
+# count of compiled paths kept
+PATH_CACHE_SIZE = 1024
+
+
+class CompiledPath(object):
+    """Path to value in nested dictionaries and lists, parsed once.
+
+    Each step is a dictionary key and a list index, the value is read
+    in a loop without recursion and without slicing the path.
+
+    :param path: keys and indexes.
+    :param index_from_text: convert keys to int for list indexes, so
+        "0" is the first item of list. Without it a key is used as index
+        as is.
+    """
+
+    def __init__(self, path, index_from_text=True):
+        steps = []
+        for key in path:
+            index = key
+            if index_from_text:
+                try:
+                    index = int(key)
+                except (TypeError, ValueError):
+                    # list can't be read by this key
+                    index = None
+            steps.append((key, index))
+        self.steps = tuple(steps)
+
+    def get(self, obj, logger=None):
+        """Value on path, None if path is not found in obj."""
+        value = obj
+        try:
+            for key, index in self.steps:
+                if isinstance(value, dict):
+                    value = value[key]
+                elif isinstance(value, list):
+                    value = value[index]
+                else:
+                    return None
+        except (LookupError, TypeError) as e:
+            if logger:
+                logger.debug("Can't filter by {}".format(repr(e)))
+            return None
+        return value
+
+
+# lookup is cheaper than compilation only without python level lock
+_cached_path = lru_cache(maxsize=PATH_CACHE_SIZE)(CompiledPath)
+
+
+def get_compiled_path(path, index_from_text=True):
+    """Return compiled path from cache or compile and store it."""
+    try:
+        return _cached_path(tuple(path), index_from_text)
+    except TypeError:
+        # path with not hashable keys is not cached
+        return CompiledPath(path, index_from_text)
+
+
+def clear_path_cache():
+    _cached_path.cache_clear()
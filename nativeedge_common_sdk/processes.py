@@ -1,9 +1,15 @@
 # Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
 
+import os
 import sys
 import time
 import psutil
+import select
+import threading
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from six.moves import queue
 
 from script_runner.tasks import (
     start_ctx_proxy,
@@ -15,15 +21,34 @@ from script_runner.tasks import (
     ILLEGAL_CTX_OPERATION_ERROR,
     UNSUPPORTED_SCRIPT_FEATURE_ERROR
 )
-from nativeedge_common_sdk.filters import obfuscate_passwords
+from nativeedge_common_sdk.filters import get_secret_scanner
 from nativeedge_common_sdk._compat import (
     ne_exc,
+    current_ctx,
     ScriptException,
     ctx_from_import,
 )
 
+# seconds to wait for output or end of process in each poll
+POLL_TIMEOUT = 5
+# lines of stdout and stderr kept for result of streamed process
+STREAM_OUTPUT_LINES = 10000
+# lines read from process and not logged yet, reader waits when full
+STREAM_QUEUE_SIZE = 1000
+# seconds between checks of process end when pidfd is not supported,
+# interval grows from min to max while process runs
+MIN_WAIT_INTERVAL = 0.01
+MAX_WAIT_INTERVAL = 0.5
+
 
 class GeneralExecutor(object):
+    """Runs command and logs its output.
+
+    By default output is read when process ends. With stream_output
+    lines are read by threads while process runs and logged as they
+    arrive, only last max_output_lines lines of each stream are kept for
+    stdout and stderr.
+    """
 
     def __init__(self,
                  command,
@@ -33,24 +58,39 @@ class GeneralExecutor(object):
                  logger=None,
                  ctx=None,
                  log_stdout=True,
-                 log_stderr=True):
+                 log_stderr=True,
+                 stream_output=False,
+                 max_output_lines=STREAM_OUTPUT_LINES,
+                 log_prefix=None):
         self.command = command
         self.logger = logger or ctx_from_import.logger
         self.ctx = ctx or ctx_from_import
-        self._stdout = []
-        self._stderr = []
+        self.stream_output = stream_output
+        if stream_output:
+            self._stdout = deque(maxlen=max_output_lines)
+            self._stderr = deque(maxlen=max_output_lines)
+        else:
+            self._stdout = []
+            self._stderr = []
         self.process = subprocess.Popen(
             args=command,
             shell=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            stdin=subprocess.PIPE,
+            # streamed process is never communicated, so reading of stdin
+            # ends at once instead of waiting for input
+            stdin=subprocess.DEVNULL if stream_output else subprocess.PIPE,
             env=self.desecretize_env(env),
             cwd=cwd,
             bufsize=48,
             close_fds=on_posix)
         self.pid = self.process.pid
         self.logger.debug('Process created, PID: {0}'.format(self.pid))
+        # one handle is used for every status check
+        self._psutil_process = psutil.Process(self.pid)
+        self._pidfd = None
+        self._pidfd_poll = None
+        self._open_pidfd()
         self.last_clock = time.time()
         self._return_code = None
         self.last_state = self.current_status = self.get_status()
@@ -58,6 +98,12 @@ class GeneralExecutor(object):
         self.state_changes = 0
         self.log_stdout = log_stdout
         self.log_stderr = log_stderr
+        self.log_prefix = log_prefix
+        self._lines = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._open_streams = 0
+        if stream_output:
+            self._start_reader(self.process.stdout, False)
+            self._start_reader(self.process.stderr, True)
 
     @staticmethod
     def desecretize_env(env):
@@ -72,12 +118,15 @@ class GeneralExecutor(object):
         logger = logger or self.logger.info
         if hasattr(message, 'decode'):
             message = message.decode('ascii', 'ignore')
-        clean_message = obfuscate_passwords(message)
+        clean_message = get_secret_scanner().obfuscate(message)
 
         try:
             clean_message = clean_message.rstrip('\r\n')
         except (AttributeError, TypeError):
             pass
+        if self.log_prefix:
+            # lines of concurrent commands are told apart by prefix
+            clean_message = '[{}] {}'.format(self.log_prefix, clean_message)
 
         if not prefix and self.log_stdout:
             logger(clean_message)
@@ -106,6 +155,103 @@ class GeneralExecutor(object):
             pass
         sys.stdout.flush()
 
+    def _start_reader(self, stream, is_stderr):
+        reader = threading.Thread(
+            target=self._read_stream, args=(stream, is_stderr))
+        reader.daemon = True
+        self._open_streams += 1
+        reader.start()
+
+    def _read_stream(self, stream, is_stderr):
+        try:
+            for line in iter(stream.readline, b''):
+                self._lines.put((is_stderr, line))
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+            # end of stream
+            self._lines.put((is_stderr, None))
+
+    def _emit_line(self, is_stderr, line):
+        if is_stderr:
+            self._stderr.append(self._emit_log_message(
+                line, prefix='<err>', logger=self.logger.error))
+        else:
+            self._stdout.append(self._emit_log_message(line))
+
+    def _open_pidfd(self):
+        # file descriptor of process is readable when process ends, so
+        # waiting costs nothing, requires linux 5.3 and python 3.9
+        if not hasattr(os, 'pidfd_open') or not hasattr(select, 'poll'):
+            return
+        try:
+            self._pidfd = os.pidfd_open(self.pid)
+        except OSError:
+            return
+        self._pidfd_poll = select.poll()
+        self._pidfd_poll.register(self._pidfd, select.POLLIN)
+
+    def _close_pidfd(self):
+        if self._pidfd is not None:
+            os.close(self._pidfd)
+            self._pidfd = None
+            self._pidfd_poll = None
+
+    def _release_process(self):
+        # handles of process are not used after run, also when it fails
+        self._close_pidfd()
+        self._psutil_process = None
+
+    def _wait(self, timeout):
+        """Return code of process, None if it still runs after timeout."""
+        if self._pidfd is not None:
+            if not self._pidfd_poll.poll(timeout * 1000):
+                return None
+            self._close_pidfd()
+            return self.process.wait()
+        deadline = time.time() + timeout
+        interval = MIN_WAIT_INTERVAL
+        while True:
+            return_code = self.process.poll()
+            if return_code is not None:
+                return return_code
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, MAX_WAIT_INTERVAL)
+
+    def _poll_streams(self, timeout=POLL_TIMEOUT):
+        # log lines until both streams end, return code is read after that
+        # so no line is lost
+        deadline = time.time() + timeout
+        while self._open_streams:
+            try:
+                is_stderr, line = self._lines.get(
+                    timeout=max(deadline - time.time(), 0))
+            except queue.Empty:
+                return
+            if line is None:
+                self._open_streams -= 1
+            else:
+                self._emit_line(is_stderr, line)
+        self._return_code = self._wait(max(deadline - time.time(), 0))
+        sys.stdout.flush()
+
+    def _wait_streamed(self, timeout):
+        """Wait for streamed process and log its lines meanwhile, reader
+        threads wait when queue of lines is full, so it is read until
+        process ends or timeout.
+        """
+        deadline = time.time() + timeout
+        while self._return_code is None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.command, timeout)
+            self._poll_streams(min(remaining, POLL_TIMEOUT))
+        return self._return_code
+
     @property
     def stdout(self):
         return '\n'.join(self._stdout)
@@ -115,10 +261,11 @@ class GeneralExecutor(object):
         return '\n'.join(self._stderr)
 
     def poll(self):
+        if self.stream_output:
+            self._poll_streams()
+            return
         try:
-            self._return_code = self.process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            pass
+            self._return_code = self._wait(POLL_TIMEOUT)
         except ValueError:
             return
         self.emit_io()
@@ -137,7 +284,10 @@ class GeneralExecutor(object):
         return self.current_status
 
     def get_status(self):
-        return psutil.Process(self.pid)
+        if self._psutil_process is None:
+            raise psutil.NoSuchProcess(self.pid)
+        with self._psutil_process.oneshot():
+            return self._psutil_process.status()
 
     def check_exception(self):
         if isinstance(self.ctx._return_value, RuntimeError):
@@ -150,39 +300,43 @@ class GeneralExecutor(object):
 
     def run(self, proxy, max_sleep_time):
         self.last_state = self.current_status
-
-        while True:
-            process_ctx_request(proxy)
-            self.poll()
-            if self.return_code is not None:
-                break
-            self.liveness_counter += 1
-            # Poke the process with a stick every 20 seconds
-            # to see if it's alive.
-            if self.liveness_counter == POLL_LOOP_LOG_ITERATIONS:
-                self.liveness_counter = 0
-                self.last_state, self.last_clock = handle_max_sleep(
-                    self.pid,
-                    self.last_state,
-                    self.state_changes,
-                    self.last_clock,
-                    max_sleep_time,
-                    self.process)
-                if not self.last_state and not self.last_clock:
+        try:
+            while True:
+                process_ctx_request(proxy)
+                self.poll()
+                if self.return_code is not None:
                     break
-                self.logger.debug(
-                    'Waiting for process {0} to end...'.format(self.pid))
-                # Reset the number of times the process has changed since last
-                # called handle_max_sleep.
-                self.state_changes = 0
-
-            # If the state has changed since the last time we checked, it means
-            # it's not dead.
-            if self.status != self.last_state:
-                self.state_changes += 1
-                self.last_clock = time.time()
-            self.last_state = self.current_status
-            time.sleep(POLL_LOOP_INTERVAL)
+                self.liveness_counter += 1
+                # Poke the process with a stick every 20 seconds
+                # to see if it's alive.
+                if self.liveness_counter == POLL_LOOP_LOG_ITERATIONS:
+                    self.liveness_counter = 0
+                    self.last_state, self.last_clock = handle_max_sleep(
+                        self.pid,
+                        self.last_state,
+                        self.state_changes,
+                        self.last_clock,
+                        max_sleep_time,
+                        self.process,
+                        self._psutil_process,
+                        self._wait_streamed if self.stream_output else None)
+                    if not self.last_state and not self.last_clock:
+                        break
+                    self.logger.debug(
+                        'Waiting for process {0} to end...'.format(self.pid))
+                    # Reset the number of times the process has changed
+                    # since last called handle_max_sleep.
+                    self.state_changes = 0
+
+                # If the state has changed since the last time we checked,
+                # it means it's not dead.
+                if self.status != self.last_state:
+                    self.state_changes += 1
+                    self.last_clock = time.time()
+                self.last_state = self.current_status
+                time.sleep(POLL_LOOP_INTERVAL)
+        finally:
+            self._release_process()
 
         self.logger.debug(
             'Execution done (PID={0}, return_code={1}): {2}'.format(
@@ -221,12 +375,17 @@ def general_executor(script_path, ctx, process):
     log_stdout = process.get('log_stdout', True)
     log_stderr = process.get('log_stderr', True)
     stderr_to_stdout = process.get('stderr_to_stdout', False)
+    stream_output = process.get('stream_output', False)
+    max_output_lines = process.get('max_output_lines', STREAM_OUTPUT_LINES)
+    log_prefix = process.get('log_prefix')
 
-    ctx.logger.debug('log_stdout=%r, log_stderr=%r, stderr_to_stdout=%r',
-                     log_stdout, log_stderr, stderr_to_stdout)
+    ctx.logger.debug('log_stdout=%r, log_stderr=%r, stderr_to_stdout=%r, '
+                     'stream_output=%r',
+                     log_stdout, log_stderr, stderr_to_stdout, stream_output)
 
     execution = GeneralExecutor(
-        command, env, cwd, on_posix, ctx.logger, ctx, log_stdout, log_stderr)
+        command, env, cwd, on_posix, ctx.logger, ctx, log_stdout, log_stderr,
+        stream_output, max_output_lines, log_prefix)
     execution.run(proxy, max_sleep_time)
 
     try:
@@ -238,7 +397,91 @@ def general_executor(script_path, ctx, process):
 
     execution.check_exception()
     # some processes returns only stderr
-    return execution.stdout if execution.stdout else execution.stderr
+    stdout = execution.stdout
+    return stdout if stdout else execution.stderr
+
+
+class _ScriptContext(object):
+    """ctx of one of concurrent scripts. Return value and operations set
+    by process_execution are kept per script, so each script can call
+    ctx returns, other attributes are read from shared ctx."""
+
+    def __init__(self, ctx):
+        self._ctx = ctx
+
+    def __getattr__(self, name):
+        return getattr(self._ctx, name)
+
+
+def _run_in_context(context, func, *args):
+    # ctx of operation is thread local
+    current_ctx.set(context)
+    try:
+        return func(*args)
+    finally:
+        current_ctx.clear()
+
+
+def _get_script_name(script_path, process):
+    return process.get('log_prefix') or script_path
+
+
+def concurrent_general_executor(script_paths, ctx, processes,
+                                max_workers=4, fail_fast=True):
+    """Run general_executor for each script in threads, same as
+    process_execution runs it for single script.
+
+    :param script_paths: scripts to run.
+    :param ctx: ctx shared by scripts, each script has own ctx proxy and
+        return value.
+    :param processes: process params of each script.
+    :param max_workers: count of scripts running at same time.
+    :param fail_fast: don't start remaining scripts after first failure
+        and raise its error. Otherwise all scripts run and errors are
+        returned with outputs.
+    :return: list of stdout strings in order of scripts, or with
+        fail_fast disabled list of (stdout, error) tuples, one of them is
+        None.
+    """
+    context = current_ctx.get_ctx()
+    results = [None] * len(script_paths)
+    errors = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for idx, (script_path, process) in enumerate(
+                zip(script_paths, processes)):
+            futures[executor.submit(
+                _run_in_context, context, process_execution,
+                general_executor, script_path, _ScriptContext(ctx),
+                process)] = idx
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            idx = futures[future]
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                ctx.logger.error('Script {0} failed: {1}'.format(
+                    _get_script_name(script_paths[idx], processes[idx]), e))
+                errors.append((idx, e))
+                if fail_fast:
+                    for pending in futures:
+                        pending.cancel()
+    if not fail_fast:
+        errors = dict(errors)
+        return [(result, errors.get(idx))
+                for idx, result in enumerate(results)]
+    if len(errors) == 1:
+        raise errors[0][1]
+    elif errors:
+        errors.sort(key=lambda error: error[0])
+        raise ne_exc.NonRecoverableError(
+            '{0} of {1} scripts failed: {2}'.format(
+                len(errors), len(script_paths), '; '.join(
+                    '{0}: {1}'.format(
+                        _get_script_name(script_paths[idx], processes[idx]), e)
+                    for idx, e in errors)))
+    return results
 
 
 def process_execution(script_func, script_path, ctx=None, process=None):
@@ -308,7 +551,9 @@ def handle_max_sleep(pid,
                      state_changes=0,
                      last_clock=None,
                      max_sleep_time=0,
-                     process=None):
+                     process=None,
+                     psutil_process=None,
+                     wait=None):
     """Check and see if a process is sleeping and if the max sleep time has
     elapsed. If so, try to end it. If the process is a zombie process, then
     terminate it. All the while calculate how many changes are happening
@@ -319,6 +564,9 @@ def handle_max_sleep(pid,
     :param state_changes:
     :param max_sleep_time:
     :param process: A Subprocess Popen object.
+    :param psutil_process: psutil Process of pid, created if not set.
+    :param wait: called with max_sleep_time instead of communicate of
+        process, when output of process is read by threads.
     :return: The current state and the last time the state was checked.
     """
 
@@ -327,7 +575,7 @@ def handle_max_sleep(pid,
 
     last_clock = last_clock or time.time()  # the most recent measurement.
     try:
-        psutil_process = psutil.Process(pid)
+        psutil_process = psutil_process or psutil.Process(pid)
         current_state = psutil_process.status()
     except psutil.NoSuchProcess:
         # Sometimes we get here, from the call below for zombie processes
@@ -362,7 +610,10 @@ def handle_max_sleep(pid,
                 'Communicating sleeping process {0} whose max sleep time {1} '
                 'has elapsed.'.format(pid, max_sleep_time))
             try:
-                process.communicate(timeout=max_sleep_time)
+                if wait is not None:
+                    wait(max_sleep_time)
+                else:
+                    process.communicate(timeout=max_sleep_time)
             except (subprocess.TimeoutExpired, OSError) as e:
                 ctx_from_import.logger.error(e)
                 ctx_from_import.logger.error(
@@ -1,8 +1,7 @@
-import re
 from copy import deepcopy
 
 from nativeedge_common_sdk.filters import (
-    obfuscate_passwords,
+    get_secret_scanner,
     OBFUSCATION_KEYWORDS
 )
 
@@ -19,13 +18,9 @@ class SecureLogger(object):
         self._logger = logger
         self.sensitive_keys = sensitive_keys
         self.sensitive_keys.extend(OBFUSCATION_KEYWORDS)
-        re_string_elem = '|'.join(self.sensitive_keys)
-        re_str = r'(("*)(' + repr(re_string_elem)[1:-1] + \
-                 r')("*)(:|=)\s*("*))[^\n",]*'
-        self.obfuscation_re = re.compile(
-            re_str,
-            flags=re.IGNORECASE | re.MULTILINE
-        )
+        # scanner is shared by loggers with same sensitive keys
+        self.scanner = get_secret_scanner(self.sensitive_keys)
+        self.obfuscation_re = self.scanner.regexp
 
     def format_dict(self, data, parent_hide=False):
         """
@@ -62,11 +57,7 @@ class SecureLogger(object):
 
     def filter_message(self, data, parent_hide=False):
         log_message = self.format_data(data, parent_hide)
-        log_message = obfuscate_passwords(
-            log_message,
-            self.obfuscation_re,
-            self.sensitive_keys
-        )
+        log_message = self.scanner.obfuscate(log_message)
         return log_message
 
     def info(self, message):
@@ -1,6 +1,9 @@
 # Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
 
+import os
 import json
+import shutil
+import tempfile
 import six
 import unittest
 from mock import Mock
@@ -385,6 +388,21 @@ class TestFilters(unittest.TestCase):
         self.assertEqual(
             filters.obfuscate_passwords(call), call)
 
+    def test_obfuscate_passwords_copy_on_write(self):
+        call = {
+            'port': -2,
+            'params': {'id': 1, 'scope': {'level': 3}},
+            'auth': {'user': 'admin', 'password': 'secret'},
+        }
+        obfuscated_call = filters.obfuscate_passwords(call)
+        self.assertEqual(obfuscated_call['auth'],
+                         {'user': 'admin', 'password': 'x' * 16})
+        # original is not changed and unchanged values are not copied
+        self.assertEqual(call['auth']['password'], 'secret')
+        self.assertIs(obfuscated_call['params'], call['params'])
+        self.assertIs(filters.obfuscate_passwords(call['params']),
+                      call['params'])
+
     def test_obfuscate_passwords_deep(self):
         call = {
             'host': 'localhost',
@@ -495,6 +513,165 @@ class TestFilters(unittest.TestCase):
         self.assertEqual(filters.obfuscate_passwords(call),
                          obfuscated_call)
 
+    def test_get_translation_result_keys(self):
+        self.assertEqual(filters.get_translation_result_keys(None), set())
+        # v1
+        self.assertEqual(
+            filters.get_translation_result_keys({
+                "name": ["user-full-name"],
+                "address": [{
+                    "geo": {
+                        "lat": ["user-city-geo", "latitude"],
+                    }
+                }]
+            }),
+            {'user-full-name', 'user-city-geo'})
+        # v2
+        self.assertEqual(
+            filters.get_translation_result_keys([
+                [['payload', 'pages', ['page_name']],
+                 ['pages', ['page_name']]],
+                [['id'], ['id']]
+            ]),
+            {'pages', 'id'})
+        # v3
+        self.assertEqual(
+            filters.get_translation_result_keys({'g': ['a', 'b']}, "v3"),
+            {'g'})
+        # unknown
+        self.assertIsNone(filters.get_translation_result_keys("a"))
+
+    def test_lazy_log_text(self):
+        self.assertEqual(
+            str(filters.LazyLogText({'password': 'a'})),
+            "{'password': 'xxxxxxxxxxxxxxxx'}")
+        self.assertEqual(
+            str(filters.LazyLogText({'password': 'a'}, obfuscate=False)),
+            "{'password': 'a'}")
+        self.assertEqual(
+            str(filters.LazyLogText(b'token: 12345abc', use_repr=True)),
+            "b'token: xxxxxxxxxxxxxxxx")
+        self.assertEqual(str(filters.LazyLogText('12345', size=4)), '1...')
+
+    def test_compile_translation(self):
+        parsed_json = {
+            'id': 10,
+            'payload': {'pages': [{'page_name': 'marvin'},
+                                  {'page_name': 'cool_wool'}]},
+            'items': ['a', 'b']
+        }
+        # v1, rules are not changed, so plan can be applied again
+        response_translation = {'id': ['object', 'id'],
+                                'items': [{}, ['second']]}
+        plan = filters.compile_translation(response_translation)
+        for _ in range(2):
+            runtime_props = {}
+            plan.apply(Mock(), parsed_json, runtime_props)
+            self.assertEqual(runtime_props,
+                             {'object': {'id': 10}, 'second': 'b'})
+        self.assertEqual(response_translation,
+                         {'id': ['object', 'id'], 'items': [{}, ['second']]})
+        # v2 list translation
+        plan = filters.compile_translation([
+            [['payload', 'pages', ['page_name']], ['names']],
+            [['id'], ['id']]
+        ])
+        runtime_props = {}
+        plan.apply(Mock(), parsed_json, runtime_props)
+        self.assertEqual(runtime_props, {'names': ['marvin', 'cool_wool']})
+        # v3
+        runtime_props = {}
+        filters.compile_translation(
+            {'last': ['items', '-1']}, "v3").apply(
+                Mock(), parsed_json, runtime_props)
+        self.assertEqual(runtime_props, {'last': 'b'})
+        # errors are same as before
+        with self.assertRaises(KeyError):
+            filters.compile_translation({'name': ['name']}).apply(
+                Mock(), parsed_json, {})
+
+    def test_compile_translation_irregular(self):
+        # nested list translation is applied by original code
+        response_translation = [[
+            ['a', ['b'], ['c']],
+            ['a', ['b', ['c']]]
+        ]]
+        plan = filters.compile_translation(response_translation)
+        self.assertEqual(plan.steps, [])
+        runtime_props = {}
+        with self.assertRaises(AttributeError):
+            plan.apply(Mock(), {'a': [{'b': [{'c': 1}]}]}, runtime_props)
+        self.assertEqual(runtime_props, {'a': [{}]})
+        self.assertEqual(response_translation[0][1], ['a', ['b', ['c']]])
+
+    def test_get_translation_plan(self):
+        filters.clear_translation_cache()
+        plan = filters.get_translation_plan({'id': ['id']})
+        self.assertIs(filters.get_translation_plan({'id': ['id']}), plan)
+        self.assertIsNot(filters.get_translation_plan({'id': ['id']}, "v3"),
+                         plan)
+        # same value, but different type of key
+        self.assertIsNot(filters.get_translation_plan({'id': [1]}),
+                         filters.get_translation_plan({'id': [True]}))
+
+    def test_secret_scanner(self):
+        scanner = filters.get_secret_scanner()
+        self.assertIs(filters.get_secret_scanner(), scanner)
+        self.assertTrue(scanner.is_secret_key('db_Password'))
+        self.assertFalse(scanner.is_secret_key('user'))
+        text = 'user: admin\n"token": "abc", PASSWORD=1.5, secret=[]'
+        self.assertEqual(scanner.obfuscate_text(text),
+                         'user: admin\n"token": "xxxxxxxxxxxxxxxx", '
+                         'PASSWORD=1.5, secret=[]')
+        # not ascii text is searched by regexp only
+        self.assertEqual(scanner.obfuscate_text(u'pässe, token: abc'),
+                         u'pässe, token: xxxxxxxxxxxxxxxx')
+        # custom keywords are used for nested values too
+        custom = filters.get_secret_scanner(['api_key'])
+        self.assertIs(filters.get_secret_scanner(['api_key']), custom)
+        self.assertEqual(
+            filters.obfuscate_passwords(
+                {'a': {'b': 'api_key=abc', 'API_KEY_ID': 1}},
+                custom.regexp, ['API_KEY']),
+            {'a': {'b': 'api_key=xxxxxxxxxxxxxxxx',
+                   'API_KEY_ID': 'xxxxxxxxxxxxxxxx'}})
+
+    def test_compile_template_cache(self):
+        filters.clear_compiled_template_cache()
+        self.addCleanup(filters.clear_compiled_template_cache)
+        template = filters.compile_template('{{a|toxml}}')
+        self.assertIs(filters.compile_template('{{a|toxml}}'), template)
+        self.assertEqual(template.render({'a': {'b': 'c'}}), '<b>c</b>')
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(filters.set_template_bytecode_cache, None)
+        filters.set_template_bytecode_cache(directory)
+        filters.clear_compiled_template_cache()
+        self.assertEqual(filters.render_template('{{a}}-', {'a': 1}), '1-')
+        self.assertEqual(len(os.listdir(directory)), 1)
+        # bytecode is loaded from directory
+        filters.clear_compiled_template_cache()
+        self.assertEqual(filters.render_template('{{a}}-', {'a': 2}), '2-')
+
+    def test_shorted_text_bounded(self):
+        response = {'items': [{'id': idx, 'name': "it's"}
+                              for idx in range(1000)], 'empty': ()}
+        for size in (0, 3, 10, 200, 30000):
+            text = repr(response)
+            if len(text) > size > 3:
+                text = text[:size - 3] + '...'
+            elif size <= 3:
+                text = text[:size]
+            self.assertEqual(filters.shorted_text(response, size), text)
+        self.assertEqual(filters.shorted_text(('a' * 20, b"'\""), 14),
+                         "('aaaaaaaaa...")
+        # whole text has both quotes, so single quotes are escaped
+        self.assertEqual(filters.shorted_text([("'" * 10 + '"',)], 10),
+                         "[('\\'\\'...")
+        data = [1]
+        data.append(data)
+        self.assertEqual(filters.shorted_text(data), '[1, [...]]')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,40 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import unittest
+from mock import Mock
+
+from plugins_sdk.lru_cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_lru(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        # touch first value, so second one is evicted
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('b', 0), 0)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertIsNone(cache.pop('a'))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_get_or_create(self):
+        cache = LRUCache(2)
+        create = Mock(return_value=None)
+        # none is cached same as other values
+        self.assertIsNone(cache.get_or_create('a', create))
+        self.assertIsNone(cache.get_or_create('a', create))
+        create.assert_called_once_with()
+        cache.max_size = 1
+        cache.get_or_create('b', create)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get('a', 0), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
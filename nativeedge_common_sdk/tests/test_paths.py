@@ -0,0 +1,41 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import unittest
+from mock import Mock
+
+from plugins_sdk import paths
+
+
+class TestPaths(unittest.TestCase):
+
+    def setUp(self):
+        paths.clear_path_cache()
+        self.addCleanup(paths.clear_path_cache)
+
+    def test_compiled_path(self):
+        path = paths.CompiledPath(['items', '1', 'id'])
+        self.assertEqual(path.steps,
+                         (('items', None), ('1', 1), ('id', None)))
+        self.assertEqual(path.get({'items': [{}, {'id': 'b'}]}), 'b')
+        self.assertEqual(path.get({'items': {'1': {'id': 'c'}}}), 'c')
+        self.assertIsNone(path.get({'items': 'ab'}))
+        logger = Mock()
+        self.assertIsNone(path.get({'items': [{}]}, logger))
+        logger.debug.assert_called_once_with(
+            "Can't filter by IndexError('list index out of range')")
+        # keys are used as list indexes as is
+        path = paths.CompiledPath(['0', 1], index_from_text=False)
+        self.assertIsNone(path.get([[1, 2]]))
+        self.assertEqual(path.get({'0': [1, 2]}), 2)
+
+    def test_get_compiled_path(self):
+        path = paths.get_compiled_path(['a', 0])
+        self.assertIs(paths.get_compiled_path(('a', 0)), path)
+        self.assertIsNot(
+            paths.get_compiled_path(['a', 0], index_from_text=False), path)
+        # not hashable key
+        self.assertIsNone(paths.get_compiled_path([['a']]).get({'a': 1}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,23 @@
 # Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
 
+import os
 import time
 import unittest
 import subprocess
+from mock import Mock, patch
 from tempfile import NamedTemporaryFile
 
+from script_runner.tasks import ProcessException
 from nativeedge_common_sdk._compat import (
     current_ctx,
+    NonRecoverableError,
     MockNativeEdgeContext
 )
 from nativeedge_common_sdk.processes import (
+    GeneralExecutor,
     general_executor,
     handle_max_sleep,
+    concurrent_general_executor,
 )
 
 many_children = """#!/bin/bash
@@ -98,3 +104,158 @@ class TestProcesses(unittest.TestCase):
             general_executor_params['args'] = [t.name]
             result = general_executor('bash', ctx, general_executor_params)
             self.assertEqual(len(result), 89)
+
+    def test_general_executor_stream_output(self):
+        ctx = MockNativeEdgeContext()
+        ctx._return_value = None
+        current_ctx.set(ctx)
+        ctx.is_script_exception_defined = False
+
+        general_executor_params = {
+            'log_stdout': True,
+            'log_stderr': True,
+            'max_sleep_time': 0.1,
+            'stream_output': True,
+            'max_output_lines': 2,
+        }
+        with NamedTemporaryFile() as t:
+            with open(t.name, 'w') as outfile:
+                outfile.write('echo start\nsleep 1\nseq 1 5\n')
+            general_executor_params['args'] = [t.name]
+            result = general_executor('bash', ctx, general_executor_params)
+            # only last lines are kept
+            self.assertEqual(result, '4\n5')
+
+    def test_general_executor_stream_stdin(self):
+        ctx = MockNativeEdgeContext()
+        ctx._return_value = None
+        current_ctx.set(ctx)
+        ctx.is_script_exception_defined = False
+
+        # streamed process gets no input instead of waiting for it
+        start_time = time.time()
+        result = general_executor('bash', ctx, {
+            'args': ['-c', '"read x; echo got:$x"'],
+            'max_sleep_time': 10,
+            'stream_output': True,
+        })
+        self.assertEqual(result, 'got:')
+        self.assertLess(time.time() - start_time, 5)
+
+        # sleeping streamed process is waited for max sleep time, output
+        # is left to reader threads
+        process = Mock(spec=subprocess.Popen)
+        wait = Mock(side_effect=subprocess.TimeoutExpired('cmd', 1))
+        psutil_process = Mock()
+        psutil_process.status.return_value = 'sleeping'
+        psutil_process.children.return_value = []
+        self.assertEqual(
+            handle_max_sleep(1, 'sleeping', 0, time.time() - 10, 1,
+                             process, psutil_process, wait=wait),
+            (None, None))
+        wait.assert_called_once_with(1)
+        process.communicate.assert_not_called()
+
+    def test_general_executor_stream_max_sleep(self):
+        ctx = MockNativeEdgeContext()
+        current_ctx.set(ctx)
+
+        # process writes more lines than queue and pipe hold, so it sleeps
+        # until lines are read while it is waited for max sleep time
+        execution = GeneralExecutor(
+            'yes {0} | head -n 5000'.format('x' * 40), dict(os.environ),
+            None, True, ctx.logger, ctx, stream_output=True)
+        time.sleep(0.5)
+        self.assertEqual(execution.status, 'sleeping')
+        result = handle_max_sleep(
+            execution.pid, 'sleeping', 0, time.time() - 10, 5,
+            execution.process, execution._psutil_process,
+            wait=execution._wait_streamed)
+        self.assertNotEqual(result, (None, None))
+        self.assertEqual(execution.return_code, 0)
+        self.assertEqual(len(execution.stdout.split('\n')), 5000)
+
+    def test_general_executor_wait(self):
+        ctx = MockNativeEdgeContext()
+        current_ctx.set(ctx)
+
+        execution = GeneralExecutor(
+            'sleep 1', dict(os.environ), None, True, ctx.logger, ctx)
+        # status of process is read, not psutil.Process
+        self.assertIsInstance(execution.status, str)
+        self.assertIsNone(execution._wait(0.01))
+        self.assertEqual(execution._wait(5), 0)
+        # without pidfd process is polled
+        execution = GeneralExecutor(
+            'exit 2', dict(os.environ), None, True, ctx.logger, ctx)
+        execution._close_pidfd()
+        self.assertEqual(execution._wait(5), 2)
+
+        # handles of process are released when run fails
+        execution = GeneralExecutor(
+            'sleep 1', dict(os.environ), None, True, ctx.logger, ctx)
+        with patch('nativeedge_common_sdk.processes.process_ctx_request',
+                   side_effect=RuntimeError('proxy failed')):
+            with self.assertRaises(RuntimeError):
+                execution.run(None, 10)
+        self.assertIsNone(execution._pidfd)
+        self.assertIsNone(execution._psutil_process)
+        self.assertIsNone(execution.status)
+        execution.process.wait()
+
+    def test_concurrent_general_executor(self):
+        ctx = MockNativeEdgeContext()
+        ctx._return_value = None
+        current_ctx.set(ctx)
+        ctx.is_script_exception_defined = False
+
+        def get_params(script, log_prefix):
+            return {
+                'args': ['-c', '"{}"'.format(script)],
+                'max_sleep_time': 10,
+                'log_prefix': log_prefix,
+            }
+
+        start_time = time.time()
+        result = concurrent_general_executor(
+            ['bash'] * 3, ctx,
+            [get_params('sleep 1; echo {}'.format(idx), str(idx))
+             for idx in range(3)],
+            max_workers=3)
+        self.assertEqual(result, ['0', '1', '2'])
+        self.assertLess(time.time() - start_time, 2.5)
+
+        # failed script stops scripts which are not started
+        processes = [get_params('exit 3', 'fail'),
+                     get_params('echo ok', 'ok')]
+        with self.assertRaises(ProcessException):
+            concurrent_general_executor(
+                ['bash'] * 2, ctx, processes, max_workers=1)
+        # all scripts run, outputs and errors are returned
+        processes.append(get_params('exit 4', 'fail2'))
+        result = concurrent_general_executor(
+            ['bash'] * 3, ctx, processes, max_workers=1, fail_fast=False)
+        self.assertEqual([output for output, _ in result], [None, 'ok', None])
+        self.assertIsNone(result[1][1])
+        self.assertIsInstance(result[0][1], ProcessException)
+        self.assertIsInstance(result[2][1], ProcessException)
+        # errors of scripts running at same time are raised together
+        processes = [get_params('sleep 0.5; exit 3', 'fail'),
+                     get_params('sleep 0.5; exit 4', 'fail2')]
+        with self.assertRaises(NonRecoverableError) as e:
+            concurrent_general_executor(
+                ['bash'] * 2, ctx, processes, max_workers=2)
+        self.assertIn('2 of 2 scripts failed', str(e.exception))
+
+        # each script returns own value, same as single script
+        def _returns(script_path, script_ctx, process):
+            script_ctx.returns(script_path)
+            return script_ctx._return_value
+
+        with patch('nativeedge_common_sdk.processes.general_executor',
+                   _returns):
+            self.assertEqual(
+                concurrent_general_executor(
+                    ['a', 'b'], ctx, [{}, {}], max_workers=2),
+                ['a', 'b'])
+        self.assertIsNone(ctx._return_value)
@@ -699,3 +699,30 @@ class BatchUtilsTests(unittest.TestCase):
             mock.call('foo', outfile=outfile),
             mock.call('foo', outfile=outfile)
         ]
+
+    def test_run_subprocesses(self):
+        ctx = MockNativeEdgeContext(properties={})
+        current_ctx.set(ctx)
+        self.addCleanup(current_ctx.clear)
+        cwd = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cwd, True)
+
+        # same additional args are used by both commands
+        common = {'env': {'MODE': 'test'}}
+        result = utils.run_subprocesses([
+            {'command': ['echo', 'one'], 'cwd': cwd,
+             'additional_args': common, 'additional_env': {'A': '1'}},
+            {'command': ['pwd'], 'cwd': cwd,
+             'additional_args': common, 'log_prefix': 'where'},
+        ], max_workers=2)
+        self.assertEqual(result, ['one', cwd])
+        self.assertEqual(common, {'env': {'MODE': 'test'}})
+
+        # failed command doesn't hide output of other commands
+        result = utils.run_subprocesses(
+            [{'command': ['false'], 'cwd': cwd},
+             {'command': ['echo', 'two'], 'cwd': cwd}],
+            max_workers=1, fail_fast=False)
+        self.assertEqual(result[1], ('two', None))
+        self.assertIsNone(result[0][0])
+        self.assertIsInstance(result[0][1], Exception)
@@ -31,10 +31,12 @@ from nativeedge_common_sdk.resource_downloader import (
     untar_archive,
     unzip_archive
 )
+from nativeedge_common_sdk.paths import get_compiled_path
 from nativeedge_common_sdk.constants import MASKED_ENV_VARS
 from nativeedge_common_sdk.processes import (
     general_executor,
     process_execution,
+    concurrent_general_executor,
 )
 from nativeedge_common_sdk.exceptions import \
     NonRecoverableError as SDKNonRecoverableError
@@ -394,28 +396,14 @@ def desecretize_client_config(config):
 
 
 def evaluate_path(root, path):
-    value = root
     if isinstance(path, list) and len(path) > 2:
         # get_attribute [node, attribute, ....] returned a dict
         targeted_path = path[2:]
     else:
         # in case of get_input/get_capability [attribute, ...] returned a dict
         targeted_path = path[1:]
-    for index, attr in enumerate(targeted_path):
-        if isinstance(value, dict):
-            if attr not in value:
-                return None
-            value = value[attr]
-        elif isinstance(value, list):
-            try:
-                value = value[attr]
-            except TypeError:
-                return None
-            except IndexError:
-                return None
-        else:
-            return None
-    return value
+    return get_compiled_path(
+        targeted_path, index_from_text=False).get(root)
 
 
 def resolve_args(args, dep_id=None):
@@ -1592,6 +1580,68 @@ def run_subprocess(command,
                    return_output=True,
                    masked_env_vars=None):
     """Execute a shell script or command."""
+    script_path, general_executor_params = _get_general_executor_params(
+        command, logger, cwd, additional_env, additional_args,
+        return_output, masked_env_vars)
+
+    return process_execution(
+        general_executor,
+        script_path,
+        ctx_from_import,
+        general_executor_params)
+
+
+def run_subprocesses(commands, max_workers=4, fail_fast=True, logger=None):
+    """Execute independent shell scripts or commands concurrently.
+
+    :param commands: list of commands, each is a list same as command of
+        run_subprocess, or a dict with command and optional cwd,
+        additional_env, additional_args, return_output, masked_env_vars
+        and log_prefix. Output lines are logged with log_prefix, index of
+        command by default.
+    :param max_workers: count of commands running at same time.
+    :param fail_fast: don't start remaining commands after first failure,
+        commands already running are finished and error is raised.
+        Otherwise all commands run and errors are returned.
+    :param logger: logger for commands without own logger.
+    :return: list of outputs in order of commands, or with fail_fast
+        disabled list of (output, error) tuples, one of them is None.
+    """
+    script_paths = []
+    general_executors_params = []
+    for idx, command in enumerate(commands):
+        if not isinstance(command, dict):
+            command = {'command': command}
+        command = dict(command)
+        # script path is taken from list and params are set in additional
+        # args, so values of caller shared by commands are not changed
+        command['command'] = list(command['command'])
+        command['additional_args'] = deepcopy(
+            command.get('additional_args') or {})
+        log_prefix = command.pop('log_prefix', str(idx))
+        command.setdefault('logger', logger)
+        script_path, general_executor_params = \
+            _get_general_executor_params(**command)
+        general_executor_params['log_prefix'] = log_prefix
+        script_paths.append(script_path)
+        general_executors_params.append(general_executor_params)
+
+    return concurrent_general_executor(
+        script_paths,
+        ctx_from_import,
+        general_executors_params,
+        max_workers=max_workers,
+        fail_fast=fail_fast)
+
+
+def _get_general_executor_params(command,
+                                 logger=None,
+                                 cwd=None,
+                                 additional_env=None,
+                                 additional_args=None,
+                                 return_output=True,
+                                 masked_env_vars=None):
+    """Script path and process params of general_executor for command."""
     logger = logger or ctx_from_import.logger
     cwd = cwd or get_node_instance_dir()
 
@@ -1625,12 +1675,10 @@ def run_subprocess(command,
         'general_executor_process', {})
     general_executor_params['max_sleep_time'] = general_executor_process.get(
         'max_sleep_time', 300)
-
-    return process_execution(
-        general_executor,
-        script_path,
-        ctx_from_import,
-        general_executor_params)
+    if 'stream_output' not in general_executor_params:
+        general_executor_params['stream_output'] = \
+            general_executor_process.get('stream_output', False)
+    return script_path, general_executor_params
 
 
 def copy_directory(src, dst):
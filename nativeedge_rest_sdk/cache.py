@@ -0,0 +1,59 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import hashlib
+from copy import deepcopy
+
+from plugins_sdk.lru_cache import LRUCache
+
+# count of responses kept
+DEFAULT_MAX_ENTRIES = 128
+
+
+class CacheEntry(object):
+    """Validators of response and result properties translated from it."""
+
+    def __init__(self, etag=None, last_modified=None,
+                 result_properties=None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.result_properties = deepcopy(result_properties or {})
+
+    def get_conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def get_result_properties(self):
+        return deepcopy(self.result_properties)
+
+
+class ResponseCache(LRUCache):
+    """Results of rest calls for conditional requests.
+
+    :param max_entries: count of responses kept, least recently used
+        response is removed when limit is reached.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        super(ResponseCache, self).__init__(max_entries)
+
+    @staticmethod
+    def get_key(call):
+        """Key of call with request properties. Every property is used,
+        so calls with other credentials or rules never share result."""
+        return hashlib.sha256(
+            repr(sorted(call.items(), key=lambda item: item[0])).encode()
+        ).hexdigest()
+
+    def remove(self, key):
+        self.pop(key)
+
+
+_response_cache = ResponseCache()
+
+
+def get_response_cache():
+    return _response_cache
@@ -0,0 +1,175 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import os
+import ssl
+import time
+import atexit
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3.util.ssl_ import create_urllib3_context
+
+from plugins_sdk.lru_cache import LRUCache
+from nativeedge_rest_sdk import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# seconds before unused certificate file is removed
+DEFAULT_TTL = 300
+# count of ssl contexts kept
+SSL_CONTEXT_CACHE_SIZE = 32
+
+
+class CertificateStore(object):
+    """Files with inline certificates, one file per unique content.
+
+    File is removed when it was not used by any call for ttl seconds.
+
+    :param ttl: seconds after which unused file is removed.
+    :param directory: directory for files, temporary one by default.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, directory=None):
+        self.ttl = ttl
+        self._directory = directory
+        # digest: [path, count of users, last used]
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def _get_directory(self):
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix='rest-sdk-certs-')
+        return self._directory
+
+    def _write(self, digest, content):
+        directory = self._get_directory()
+        destination = os.path.join(directory, digest + '.pem')
+        # file is created with owner only access
+        fd, path = tempfile.mkstemp(dir=directory)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+        os.rename(path, destination)
+        return destination
+
+    def acquire(self, content):
+        """Return path of file with content, file is kept until release."""
+        if not isinstance(content, bytes):
+            content = content.encode()
+        digest = hashlib.sha256(content).hexdigest()
+        now = time.time()
+        with self._lock:
+            self._remove_unused(now)
+            entry = self._files.get(digest)
+            if entry is None or not os.path.isfile(entry[0]):
+                logger.debug('New certificate file for %s', digest)
+                entry = [self._write(digest, content), 0, now]
+                self._files[digest] = entry
+            entry[1] += 1
+            entry[2] = now
+            return entry[0]
+
+    def release(self, path):
+        digest = os.path.splitext(os.path.basename(path))[0]
+        now = time.time()
+        with self._lock:
+            entry = self._files.get(digest)
+            if entry is not None:
+                entry[1] = max(entry[1] - 1, 0)
+                entry[2] = now
+            self._remove_unused(now)
+
+    def _remove_unused(self, now):
+        for digest, (path, users, last_used) in list(self._files.items()):
+            if not users and now - last_used > self.ttl:
+                del self._files[digest]
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except Exception as e:
+            logger.debug('Cant remove certificate file %s: %r', path, e)
+
+    def clear(self):
+        """Remove all files, including files in use."""
+        with self._lock:
+            for path, _, _ in self._files.values():
+                self._remove(path)
+            self._files.clear()
+            if self._directory is not None:
+                shutil.rmtree(self._directory, ignore_errors=True)
+                self._directory = None
+
+    def __len__(self):
+        return len(self._files)
+
+
+_certificate_store = CertificateStore()
+atexit.register(_certificate_store.clear)
+
+
+def get_certificate_store():
+    return _certificate_store
+
+
+def _get_file_version(path):
+    # contexts are rebuilt when file is changed
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _freeze_cert(cert):
+    if isinstance(cert, (list, tuple)):
+        return tuple(cert)
+    return cert
+
+
+def create_ssl_context(verify, cert=None):
+    """Create ssl context same as used by requests for verify and cert."""
+    if verify is False:
+        context = create_urllib3_context(cert_reqs=ssl.CERT_NONE)
+    else:
+        context = create_urllib3_context(cert_reqs=ssl.CERT_REQUIRED)
+        if verify is True:
+            verify = DEFAULT_CA_BUNDLE_PATH
+        if os.path.isdir(verify):
+            context.load_verify_locations(capath=verify)
+        else:
+            context.load_verify_locations(cafile=verify)
+    if isinstance(cert, tuple):
+        context.load_cert_chain(cert[0], cert[1])
+    elif cert:
+        context.load_cert_chain(cert)
+    return context
+
+
+_ssl_contexts = LRUCache(SSL_CONTEXT_CACHE_SIZE)
+
+
+def get_ssl_context(verify, cert=None):
+    """Return cached ssl context for verify and cert.
+
+    :param verify: boolean or path to ca bundle or directory.
+    :param cert: path to client cert or tuple with cert and key paths.
+    """
+    cert = _freeze_cert(cert)
+    paths = [verify] if not isinstance(verify, bool) else []
+    paths += list(cert) if isinstance(cert, tuple) else [cert] if cert else []
+    key = (verify, cert,
+           tuple(_get_file_version(path) for path in paths))
+    return _ssl_contexts.get_or_create(
+        key, lambda: create_ssl_context(verify, cert))
+
+
+def clear_ssl_contexts():
+    _ssl_contexts.clear()
@@ -0,0 +1,129 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import zlib
+import json
+from six import string_types, text_type
+from requests.models import RequestEncodingMixin
+from urllib3.util.request import ACCEPT_ENCODING
+
+from plugins_sdk.exceptions import WrongTemplateDataException
+
+# encodings of request body, deflate is zlib stream as defined by http
+REQUEST_ENCODINGS = ['gzip', 'deflate']
+# encodings of response body decoded by urllib3 while body is read
+RESPONSE_ENCODINGS = [
+    encoding.strip() for encoding in ACCEPT_ENCODING.split(',')]
+# smaller bodies are sent without compression
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_LEVEL = 6
+
+
+class RequestCompression(object):
+    """Settings of request_compression property of call.
+
+    :param type: gzip or deflate.
+    :param min_size: bodies smaller than min_size bytes are not
+        compressed, compression of small body costs more than it saves.
+    :param level: zlib compression level, 1 is fastest.
+    """
+
+    def __init__(self, type='gzip', min_size=DEFAULT_MIN_SIZE,
+                 level=DEFAULT_LEVEL):
+        if type not in REQUEST_ENCODINGS:
+            raise WrongTemplateDataException(
+                "Request compression {} is not supported. "
+                "Supported types: {}".format(repr(type), REQUEST_ENCODINGS))
+        self.type = type
+        self.min_size = min_size
+        self.level = level
+
+    @classmethod
+    def from_call(cls, value):
+        """Settings from request_compression property of call, value is
+        type of compression or dict of settings. None if not set."""
+        if not value:
+            return None
+        if value is True:
+            return cls()
+        if isinstance(value, string_types):
+            return cls(type=value)
+        if not isinstance(value, dict):
+            raise WrongTemplateDataException(
+                "Request compression had to be string or dict. "
+                "Type {} not supported.".format(type(value)))
+        try:
+            return cls(**value)
+        except TypeError as e:
+            raise WrongTemplateDataException(
+                "Unsupported request compression settings: {}".format(e))
+
+    def compress(self, body):
+        """Return compressed body, None if body is too small."""
+        if len(body) < self.min_size:
+            return None
+        # wbits 31 writes gzip header, 15 zlib header
+        compressor = zlib.compressobj(
+            self.level, zlib.DEFLATED, 31 if self.type == 'gzip' else 15)
+        return compressor.compress(body) + compressor.flush()
+
+    def compress_payload(self, json_payload, data, headers):
+        """Compress json or data payload, same as body built by requests.
+
+        :return: json payload, data and headers to send, unchanged if
+            body is not compressed.
+        """
+        if json_payload is not None:
+            body = json.dumps(json_payload, allow_nan=False)
+            content_type = 'application/json'
+        elif isinstance(data, (dict, list, tuple)):
+            body = RequestEncodingMixin._encode_params(data)
+            content_type = 'application/x-www-form-urlencoded'
+        elif isinstance(data, (string_types, bytes)):
+            body = data
+            content_type = None
+        else:
+            # streamed or empty body is sent as is
+            return json_payload, data, headers
+        if isinstance(body, text_type):
+            body = body.encode('utf-8')
+        compressed = self.compress(body)
+        if compressed is None:
+            return json_payload, data, headers
+        headers = dict(headers or {})
+        if content_type and not _has_header(headers, 'Content-Type'):
+            headers['Content-Type'] = content_type
+        headers['Content-Encoding'] = self.type
+        return None, compressed, headers
+
+
+def get_accept_encoding(value):
+    """Value of Accept-Encoding header for response_compression property
+    of call, None if requests default is used.
+
+    :param value: True for every encoding decoded by urllib3, False to
+        request not compressed response, or list of encodings.
+    """
+    if value is None:
+        return None
+    if value is True:
+        return ', '.join(RESPONSE_ENCODINGS)
+    if value is False:
+        return 'identity'
+    if isinstance(value, string_types):
+        value = [value]
+    if not isinstance(value, list):
+        raise WrongTemplateDataException(
+            "Response compression had to be bool or list. "
+            "Type {} not supported.".format(type(value)))
+    for encoding in value:
+        if encoding not in RESPONSE_ENCODINGS:
+            raise WrongTemplateDataException(
+                "Response compression {} is not supported. "
+                "Supported types: {}".format(
+                    repr(encoding), RESPONSE_ENCODINGS))
+    return ', '.join(value)
+
+
+def _has_header(headers, name):
+    name = name.lower()
+    return any(key.lower() == name for key in headers)
@@ -0,0 +1,112 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import re
+
+from plugins_sdk.lru_cache import LRUCache
+from plugins_sdk.exceptions import (
+    ExpectationException,
+    WrongTemplateDataException,
+    RecoverableResponseException,
+    NonRecoverableResponseException,
+)
+
+# count of compiled response checks kept in memory
+EXPECTATION_CACHE_SIZE = 256
+
+
+class _Check(object):
+    """Value at keys path matched by precompiled regexp."""
+
+    def __init__(self, keys, pattern):
+        self.keys = keys
+        self.pattern = pattern
+        try:
+            self.regexp = re.compile(pattern)
+        except (TypeError, re.error):
+            # error is raised on evaluation, after path is resolved
+            self.regexp = None
+
+    def match(self, json):
+        for key in self.keys:
+            try:
+                json = json[key]
+            except (TypeError, IndexError, KeyError):
+                raise ExpectationException(
+                    'No key or index "{}" in json {}'.format(key, json))
+        if self.regexp is None:
+            re.compile(self.pattern)
+        return json, self.regexp.match("{0}".format(json)) is not None
+
+
+class _InvalidRule(object):
+    """Rule with wrong type, error is raised when rule is evaluated."""
+
+    def __init__(self, rules, is_recoverable):
+        self.rules = rules
+        self.is_recoverable = is_recoverable
+
+    def match(self, json):
+        raise WrongTemplateDataException(
+            "Response ({}) had to be list. "
+            "Type {} not supported. ".format(
+                'recoverable' if self.is_recoverable else 'nonrecoverable',
+                type(self.rules)))
+
+
+class ExpectationMatcher(object):
+    """Rules of nonrecoverable_response or response_expectation compiled
+    to checks with precompiled regexps.
+
+    Rules are not changed by compilation or evaluation, so same matcher
+    is shared by every response checked with equal rules.
+
+    :param is_recoverable: True for response_expectation, every check
+        has to match. False for nonrecoverable_response, none of checks
+        can match.
+    """
+
+    def __init__(self, rules, is_recoverable):
+        self.is_recoverable = is_recoverable
+        self.checks = []
+        self._compile(rules)
+
+    def _compile(self, rules):
+        if not rules:
+            return
+        if not isinstance(rules, list):
+            self.checks.append(_InvalidRule(rules, self.is_recoverable))
+        elif isinstance(rules[0], list):
+            for item in rules:
+                self._compile(item)
+        else:
+            self.checks.append(_Check(tuple(rules[:-1]), rules[-1]))
+
+    def check(self, json):
+        for check in self.checks:
+            value, matched = check.match(json)
+            if matched and not self.is_recoverable:
+                raise NonRecoverableResponseException(
+                    "Giving up... \n"
+                    "Response value: "
+                    "{} matches regexp:{} from nonrecoverable_response. "
+                    .format(value, check.pattern))
+            if not matched and self.is_recoverable:
+                raise RecoverableResponseException(
+                    "Trying one more time...\n"
+                    "Response value:{} does not match regexp: {} "
+                    "from response_expectation".format(
+                        value, check.pattern))
+
+
+_matchers = LRUCache(EXPECTATION_CACHE_SIZE)
+
+
+def get_expectation_matcher(rules, is_recoverable):
+    """Return cached matcher for response check rules."""
+    return _matchers.get_or_create(
+        (is_recoverable, repr(rules)),
+        lambda: ExpectationMatcher(rules, is_recoverable))
+
+
+def clear_expectation_cache():
+    _matchers.clear()
@@ -0,0 +1,117 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import math
+import time
+import threading
+from collections import deque
+
+# seconds after which weight of failure and latency is halved
+DEFAULT_HALF_LIFE = 60
+# seconds added to host score for each recent failure
+DEFAULT_FAILURE_PENALTY = 30
+# count of latency samples kept per host
+DEFAULT_SAMPLES = 50
+# samples required before percentile is used
+MIN_PERCENTILE_SAMPLES = 5
+
+
+class _HostStats(object):
+
+    def __init__(self, samples):
+        self.latency = None
+        self.failures = 0.0
+        self.updated = time.time()
+        self.samples = deque(maxlen=samples)
+
+    def decay(self, now, half_life):
+        factor = 0.5 ** ((now - self.updated) / half_life)
+        self.failures *= factor
+        self.updated = now
+        return factor
+
+
+class HostHealth(object):
+    """Recent latency and failures of hosts used by rest calls.
+
+    Both values decay with half_life, so a failed host is tried first
+    again once it has been quiet for a while. Lower score is better.
+    """
+
+    def __init__(self,
+                 half_life=DEFAULT_HALF_LIFE,
+                 failure_penalty=DEFAULT_FAILURE_PENALTY,
+                 samples=DEFAULT_SAMPLES):
+        self.half_life = half_life
+        self.failure_penalty = failure_penalty
+        self.samples = samples
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        stats = self._hosts.get(key)
+        if stats is None:
+            stats = self._hosts[key] = _HostStats(self.samples)
+        return stats
+
+    def record_success(self, key, latency):
+        with self._lock:
+            stats = self._get(key)
+            factor = stats.decay(time.time(), self.half_life)
+            if stats.latency is None:
+                stats.latency = latency
+            else:
+                # weight of old latency decays with time
+                weight = min(factor, 0.8)
+                stats.latency = weight * stats.latency + \
+                    (1 - weight) * latency
+            stats.samples.append(latency)
+
+    def record_failure(self, key):
+        with self._lock:
+            stats = self._get(key)
+            stats.decay(time.time(), self.half_life)
+            stats.failures += 1
+
+    def score(self, key):
+        """Score of host, None if there are no stats for host."""
+        with self._lock:
+            stats = self._hosts.get(key)
+            if stats is None:
+                return None
+            stats.decay(time.time(), self.half_life)
+            return (stats.latency or 0) + \
+                stats.failures * self.failure_penalty
+
+    def order(self, keys):
+        """Sort keys by score, keys with same score keep their order.
+
+        Hosts without stats get the best score from the list, so new
+        hosts keep their position relative to healthy ones.
+        """
+        scores = dict((key, self.score(key)) for key in keys)
+        known = [score for score in scores.values() if score is not None]
+        default = min(known) if known else 0
+        return sorted(keys, key=lambda key: default
+                      if scores[key] is None else scores[key])
+
+    def latency_percentile(self, key, percentile):
+        """Latency percentile of recent requests, None without samples."""
+        with self._lock:
+            stats = self._hosts.get(key)
+            if stats is None or \
+                    len(stats.samples) < MIN_PERCENTILE_SAMPLES:
+                return None
+            samples = sorted(stats.samples)
+        idx = int(math.ceil(percentile / 100.0 * len(samples))) - 1
+        return samples[max(0, min(idx, len(samples) - 1))]
+
+    def clear(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+_host_health = HostHealth()
+
+
+def get_host_health():
+    return _host_health
@@ -0,0 +1,157 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import os
+from six import string_types, text_type
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
+
+# bytes read from file at once
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class LocalFile(object):
+    """File on disk sent as part of multipart body, opened only when
+    its content is sent."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __repr__(self):
+        return 'LocalFile({!r})'.format(self.path)
+
+
+class MultipartEncoder(object):
+    """Multipart/form-data body read in chunks.
+
+    Same format as body built by requests for files argument, but
+    content of files is read only while body is sent, so memory used
+    by upload does not depend on size of files.
+
+    :param fields: list of (name, value) form fields.
+    :param files: list of (name, file) like files argument of requests,
+        file is content, LocalFile, file object or tuple
+        (filename, content[, content_type[, headers]]).
+    :param chunked: length is not provided, so body is sent with
+        chunked transfer encoding.
+    """
+
+    def __init__(self, fields=None, files=None, boundary=None,
+                 chunked=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.boundary = boundary or choose_boundary()
+        self.chunk_size = chunk_size
+        self._parts = []
+        for name, value in fields or []:
+            field = RequestField(name=name, data=None)
+            field.make_multipart()
+            self._add_part(field, value)
+        for name, value in files or []:
+            content_type = None
+            headers = None
+            if isinstance(value, (tuple, list)):
+                if len(value) == 2:
+                    filename, value = value
+                elif len(value) == 3:
+                    filename, value, content_type = value
+                else:
+                    filename, value, content_type, headers = value
+            else:
+                filename = _guess_filename(value) or name
+            if value is None:
+                continue
+            field = RequestField(name=name, data=None, filename=filename,
+                                 headers=headers)
+            field.make_multipart(content_type=content_type)
+            self._add_part(field, value)
+        self._parts.append(
+            '--{}--\r\n'.format(self.boundary).encode('latin-1'))
+        self.len = None if chunked else self._get_length()
+        self._iterator = None
+        self._buffer = b''
+
+    @property
+    def content_type(self):
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    def _add_part(self, field, value):
+        self._parts.append(
+            ('--{}\r\n'.format(self.boundary) + field.render_headers())
+            .encode('latin-1'))
+        if isinstance(value, text_type):
+            value = value.encode('utf-8')
+        elif not isinstance(value, (bytes, LocalFile)) and \
+                not hasattr(value, 'read'):
+            value = str(value).encode('utf-8')
+        self._parts.append(value)
+        self._parts.append(b'\r\n')
+
+    def _get_length(self):
+        length = 0
+        for part in self._parts:
+            if isinstance(part, bytes):
+                length += len(part)
+            elif isinstance(part, LocalFile):
+                length += os.path.getsize(part.path)
+            else:
+                size = _get_file_size(part)
+                if size is None:
+                    # send with chunked transfer encoding
+                    return None
+                length += size
+        return length
+
+    def __iter__(self):
+        for part in self._parts:
+            if isinstance(part, bytes):
+                yield part
+            elif isinstance(part, LocalFile):
+                with open(part.path, 'rb') as f:
+                    for chunk in _read_chunks(f, self.chunk_size):
+                        yield chunk
+            else:
+                for chunk in _read_chunks(part, self.chunk_size):
+                    yield chunk
+
+    def read(self, size=-1):
+        """Read next size bytes of body, used when body is sent as file."""
+        if self._iterator is None:
+            self._iterator = iter(self)
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            chunk = next(self._iterator, None)
+            if chunk is None:
+                break
+            chunks.append(chunk)
+            length += len(chunk)
+        data = b''.join(chunks)
+        if size < 0:
+            self._buffer = b''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _read_chunks(f, chunk_size):
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        if isinstance(chunk, text_type):
+            chunk = chunk.encode('utf-8')
+        yield chunk
+
+
+def _get_file_size(f):
+    try:
+        size = os.fstat(f.fileno()).st_size
+        return size - f.tell()
+    except (AttributeError, IOError, OSError, ValueError):
+        return None
+
+
+def _guess_filename(value):
+    name = getattr(value, 'name', None)
+    if name and isinstance(name, string_types) and \
+            name[0] != '<' and name[-1] != '>':
+        return os.path.basename(name)
+    return None
@@ -0,0 +1,189 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import logging
+from copy import deepcopy
+from six.moves.urllib.parse import urljoin, urlparse
+
+from nativeedge_rest_sdk import LOGGER_NAME
+from plugins_sdk.filters import get_field_value_recursive
+from plugins_sdk.exceptions import WrongTemplateDataException
+
+logger = logging.getLogger(LOGGER_NAME)
+
+PAGINATION_LINK_HEADER = 'link_header'
+PAGINATION_CURSOR = 'cursor'
+PAGINATION_OFFSET = 'offset'
+PAGINATION_TYPES = [
+    PAGINATION_LINK_HEADER, PAGINATION_CURSOR, PAGINATION_OFFSET]
+# pages requested for one call, protects from endless loop of links
+DEFAULT_MAX_PAGES = 100
+# headers with credentials of host from template, same as requests
+# does for redirects they are not sent to other hosts from links
+CREDENTIAL_HEADERS = ('authorization', 'cookie')
+# fields of call with host where request is sent
+HOST_FIELDS = ('host', 'hosts', 'ssl', 'port')
+
+
+class Pagination(object):
+    """Settings of pagination block of rest call.
+
+    :param type: link_header - next page url from Link header,
+        cursor - value from cursor_path of body is sent as cursor_param,
+        offset - offset_param is increased by count of items from
+        items_path of body, until page is smaller than limit_param.
+    :param max_pages: count of pages requested for one call.
+    """
+
+    def __init__(self,
+                 type=PAGINATION_LINK_HEADER,
+                 cursor_path=None,
+                 cursor_param=None,
+                 items_path=None,
+                 offset_param='offset',
+                 limit_param='limit',
+                 max_pages=DEFAULT_MAX_PAGES):
+        if type not in PAGINATION_TYPES:
+            raise WrongTemplateDataException(
+                "Pagination type {} is not supported. "
+                "Supported types: {}".format(repr(type), PAGINATION_TYPES))
+        if type == PAGINATION_CURSOR and \
+                (not cursor_path or not cursor_param):
+            raise WrongTemplateDataException(
+                "Cursor pagination requires cursor_path and cursor_param")
+        if type == PAGINATION_OFFSET and not items_path:
+            raise WrongTemplateDataException(
+                "Offset pagination requires items_path")
+        self.type = type
+        self.cursor_path = cursor_path
+        self.cursor_param = cursor_param
+        self.items_path = items_path
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.max_pages = max_pages
+
+    @classmethod
+    def from_call(cls, value):
+        """Pagination from pagination property of call, None if not set."""
+        if not value:
+            return None
+        if not isinstance(value, dict):
+            raise WrongTemplateDataException(
+                "Pagination had to be dict. Type {} not supported.".format(
+                    type(value)))
+        try:
+            return cls(**value)
+        except TypeError as e:
+            raise WrongTemplateDataException(
+                "Unsupported pagination settings: {}".format(e))
+
+    def get_body_paths(self):
+        """Paths of body items used to find next page."""
+        if self.type == PAGINATION_CURSOR:
+            return [self.cursor_path]
+        if self.type == PAGINATION_OFFSET:
+            return [self.items_path]
+        return []
+
+    def get_next_call(self, call, base_call, response, json):
+        """Call for next page, None if it was last page.
+
+        :param call: call used for current page, with request props.
+        :param base_call: call for first page with request props, copied
+            for next page.
+        :param json: parsed body of current page.
+        """
+        if self.type == PAGINATION_LINK_HEADER:
+            link = response.links.get('next', {}).get('url')
+            if not link:
+                return None
+            return self._get_link_call(call, base_call, link)
+        params = call.get('params') or {}
+        if self.type == PAGINATION_CURSOR:
+            cursor = get_field_value_recursive(
+                logger, json, self.cursor_path)
+            if cursor in (None, '') or cursor == params.get(
+                    self.cursor_param):
+                return None
+            return self._get_params_call(base_call, params,
+                                         {self.cursor_param: cursor})
+        items = get_field_value_recursive(logger, json, self.items_path)
+        if not items or not isinstance(items, list):
+            return None
+        limit = params.get(self.limit_param)
+        if limit and len(items) < int(limit):
+            return None
+        offset = int(params.get(self.offset_param) or 0)
+        return self._get_params_call(
+            base_call, params, {self.offset_param: offset + len(items)})
+
+    @staticmethod
+    def _get_params_call(base_call, params, changes):
+        next_call = deepcopy(base_call)
+        next_call['params'] = dict(params, **changes)
+        return next_call
+
+    @staticmethod
+    def _get_link_call(call, base_call, link):
+        url = urlparse(urljoin(call['path'], link))
+        if url.query:
+            path = '{}?{}'.format(url.path, url.query)
+        else:
+            path = url.path
+        other_host = url.hostname and url.hostname not in _get_hosts(call)
+        if path == call['path'] and not other_host:
+            return None
+        next_call = deepcopy(base_call)
+        next_call['path'] = path
+        # query of link already has all params
+        next_call['params'] = {}
+        # relative link is on host of current page
+        for field in HOST_FIELDS:
+            if field in call:
+                next_call[field] = call[field]
+        if other_host:
+            next_call['host'] = url.hostname
+            next_call['hosts'] = [url.hostname]
+            next_call['ssl'] = url.scheme == 'https'
+            next_call['port'] = url.port or -1
+        if not set(_get_hosts(next_call)) <= set(_get_hosts(base_call)):
+            logger.warning('Credentials are not sent to other host of '
+                           'next page: %s', next_call['host'])
+            _drop_credentials(next_call)
+        return next_call
+
+
+def _get_hosts(call):
+    return call.get('hosts') or [call.get('host')]
+
+
+def _drop_credentials(call):
+    """Remove auth and credential headers, empty values replace values
+    from request props."""
+    call['auth'] = None
+    call['headers'] = {
+        name: value for name, value in (call.get('headers') or {}).items()
+        if name.lower() not in CREDENTIAL_HEADERS}
+
+
+def merge_page(store_props, page_props):
+    """Add result of page to results of previous pages, lists are
+    extended and dicts merged."""
+    for key, value in page_props.items():
+        current = store_props.get(key)
+        if isinstance(current, list) and isinstance(value, list):
+            current.extend(value)
+        elif isinstance(current, dict) and isinstance(value, dict):
+            merge_page(current, value)
+        else:
+            store_props[key] = value
+
+
+def merge_result(result_properties, call_props):
+    """Save result of all pages same way as translation saves result
+    of single response, dicts are merged and other values replaced."""
+    for key, value in call_props.items():
+        current = result_properties.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merge_result(current, value)
+        else:
+            result_properties[key] = value
@@ -0,0 +1,96 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import time
+import random
+from email.utils import parsedate_to_datetime
+
+from plugins_sdk.exceptions import WrongTemplateDataException
+
+# count of attempts, including first one
+DEFAULT_ATTEMPTS = 3
+# seconds before second attempt
+DEFAULT_DELAY = 1
+DEFAULT_BACKOFF_FACTOR = 2
+# upper limit of delay between attempts, Retry-After is not limited
+DEFAULT_MAX_DELAY = 30
+
+
+def parse_retry_after(value):
+    """Seconds from Retry-After header, None if header is invalid."""
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None:
+        return None
+    return max(0, date.timestamp() - time.time())
+
+
+class RetryPolicy(object):
+    """Exponential backoff for call with recoverable failure.
+
+    :param attempts: count of attempts, including first one.
+    :param delay: seconds before second attempt, multiplied by
+        backoff_factor for each next attempt.
+    :param max_delay: upper limit of delay between attempts.
+    :param max_elapsed: seconds since first attempt after which call is
+        not retried, no limit by default.
+    :param jitter: random delay between zero and backoff, so clients
+        failed at same time are not retried at same time.
+    """
+
+    def __init__(self,
+                 attempts=DEFAULT_ATTEMPTS,
+                 delay=DEFAULT_DELAY,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 max_delay=DEFAULT_MAX_DELAY,
+                 max_elapsed=None,
+                 jitter=True):
+        self.attempts = attempts
+        self.delay = delay
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.jitter = jitter
+
+    @classmethod
+    def from_call(cls, value):
+        """Policy from retry property of call, None if not set."""
+        if not value:
+            return None
+        if value is True:
+            return cls()
+        if not isinstance(value, dict):
+            raise WrongTemplateDataException(
+                "Retry had to be dict. Type {} not supported.".format(
+                    type(value)))
+        try:
+            return cls(**value)
+        except TypeError as e:
+            raise WrongTemplateDataException(
+                "Unsupported retry settings: {}".format(e))
+
+    def get_delay(self, attempt, elapsed, retry_after=None):
+        """Seconds before next attempt, None if call is not retried.
+
+        :param attempt: count of failed attempts.
+        :param elapsed: seconds since first attempt.
+        :param retry_after: seconds requested by server.
+        """
+        if attempt >= self.attempts:
+            return None
+        delay = min(self.max_delay,
+                    self.delay * self.backoff_factor ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if self.max_elapsed is not None and \
+                elapsed + delay > self.max_elapsed:
+            return None
+        return delay
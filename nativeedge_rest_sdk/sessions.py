@@ -0,0 +1,228 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import ssl
+import time
+import logging
+import requests
+import threading
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from nativeedge_rest_sdk import LOGGER_NAME
+from nativeedge_rest_sdk.timing import record_connect
+from nativeedge_rest_sdk.certificates import get_ssl_context
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# count of sessions kept open, one session per connection key
+DEFAULT_MAX_SESSIONS = 32
+# count of keep-alive connections kept per session
+DEFAULT_POOL_MAXSIZE = 10
+# seconds before an unused session is closed
+DEFAULT_IDLE_TIMEOUT = 300
+# ssl context is added to pool kwargs only by requests>=2.32.2, older
+# versions load certificates for each connection in cert_verify
+_HAS_POOL_KEY_ATTRIBUTES = hasattr(
+    requests.adapters.HTTPAdapter, 'build_connection_pool_key_attributes')
+
+
+class _RejectCookiesPolicy(DefaultCookiePolicy):
+    """Cookies are returned in response, but never stored in session.
+
+    Pooled sessions are shared between calls and operations, so a cookie
+    from one call must not be silently sent with any other call.
+    """
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+def _has_custom_tls(verify, cert):
+    return not isinstance(verify, bool) or bool(cert)
+
+
+class _ConnectTimingMixin(object):
+    """Report time of dns lookup and tcp connect to call timing."""
+
+    _new_conn_time = 0.0
+
+    def _new_conn(self):
+        start_time = time.time()
+        try:
+            return super(_ConnectTimingMixin, self)._new_conn()
+        finally:
+            self._new_conn_time = time.time() - start_time
+            record_connect('connect', self._new_conn_time)
+
+
+class _TimedHTTPConnection(_ConnectTimingMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_ConnectTimingMixin, HTTPSConnection):
+    """Also report time of tls handshake."""
+
+    def connect(self):
+        self._new_conn_time = 0.0
+        start_time = time.time()
+        try:
+            super(_TimedHTTPSConnection, self).connect()
+        finally:
+            record_connect('tls', time.time() - start_time -
+                           self._new_conn_time)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _SSLContextAdapter(requests.adapters.HTTPAdapter):
+    """Use cached ssl context for custom ca bundle and client cert.
+
+    By default every new connection loads certificates from files again,
+    with shared context they are parsed only once. Connections of the
+    adapter also report their connect time to call timing.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(_SSLContextAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+    def build_connection_pool_key_attributes(self, request, verify,
+                                             cert=None):
+        host_params, pool_kwargs = super(
+            _SSLContextAdapter, self).build_connection_pool_key_attributes(
+                request, verify, cert)
+        if host_params['scheme'] != 'https' or \
+                not _has_custom_tls(verify, cert):
+            return host_params, pool_kwargs
+        try:
+            context = get_ssl_context(verify, cert)
+        except ssl.SSLError as e:
+            raise requests.exceptions.SSLError(e, request=request)
+        for name in ['ca_certs', 'ca_cert_dir', 'cert_file', 'key_file']:
+            pool_kwargs.pop(name, None)
+        pool_kwargs['ssl_context'] = context
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn, url, verify, cert):
+        if not _HAS_POOL_KEY_ATTRIBUTES or \
+                not url.lower().startswith('https') or \
+                not _has_custom_tls(verify, cert):
+            return super(_SSLContextAdapter, self).cert_verify(
+                conn, url, verify, cert)
+        # certificates are already loaded to ssl context of pool
+        conn.cert_reqs = 'CERT_REQUIRED' if verify else 'CERT_NONE'
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted(
+            (key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class SessionPool(object):
+    """Keep-alive sessions keyed by connection parameters.
+
+    :param max_sessions: count of sessions kept, least recently used
+        session is closed when limit is reached.
+    :param pool_maxsize: count of connections kept by each session.
+    :param idle_timeout: seconds after which unused session is closed.
+    """
+
+    def __init__(self,
+                 max_sessions=DEFAULT_MAX_SESSIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.max_sessions = max_sessions
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(scheme, host, port, verify=True, cert=None, proxies=None):
+        return (scheme, host, port, _freeze(verify), _freeze(cert),
+                _freeze(proxies))
+
+    def create_session(self):
+        session = requests.Session()
+        session.cookies.set_policy(_RejectCookiesPolicy())
+        adapter = _SSLContextAdapter(
+            pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get(self, scheme, host, port, verify=True, cert=None, proxies=None):
+        """Return session for connection, create new one if required."""
+        key = self.get_key(scheme, host, port, verify, cert, proxies)
+        now = time.time()
+        with self._lock:
+            expired = self._evict_idle(now)
+            if key in self._sessions:
+                session, _ = self._sessions.pop(key)
+            else:
+                logger.debug('New session for %r', key[:3])
+                session = self.create_session()
+            self._sessions[key] = (session, now)
+            while len(self._sessions) > self.max_sessions:
+                _, (old_session, _) = self._sessions.popitem(last=False)
+                expired.append(old_session)
+        for old_session in expired:
+            old_session.close()
+        return session
+
+    def _evict_idle(self, now):
+        expired = []
+        for key, (session, last_used) in list(self._sessions.items()):
+            if now - last_used > self.idle_timeout:
+                logger.debug('Close idle session for %r', key[:3])
+                expired.append(session)
+                del self._sessions[key]
+        return expired
+
+    def clear(self):
+        with self._lock:
+            sessions = [session for session, _ in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+_session_pool = SessionPool()
+
+
+def get_session_pool():
+    return _session_pool
+
+
+def configure_session_pool(max_sessions=None,
+                           pool_maxsize=None,
+                           idle_timeout=None):
+    """Change limits of shared session pool.
+
+    Sessions created before the change keep their connection pool size.
+    """
+    if max_sessions is not None:
+        _session_pool.max_sessions = max_sessions
+    if pool_maxsize is not None:
+        _session_pool.pool_maxsize = pool_maxsize
+    if idle_timeout is not None:
+        _session_pool.idle_timeout = idle_timeout
+    return _session_pool
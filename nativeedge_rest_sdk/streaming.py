@@ -0,0 +1,386 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import logging
+import xmltodict
+from xml.parsers import expat
+
+from nativeedge_rest_sdk import LOGGER_NAME
+from nativeedge_rest_sdk.pagination import Pagination
+from plugins_sdk.filters import _check_if_v2
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# size of chunks read from response body
+CHUNK_SIZE = 64 * 1024
+# step matches any item of list, used by v2 list translation
+WILDCARD = object()
+
+
+class PathNode(object):
+    """Node of the tree of paths used by translation and checks.
+
+    :param full: whole subtree below the node is required.
+    """
+
+    def __init__(self):
+        self.full = False
+        self.keys = {}
+        self.indexes = {}
+        self.wildcard = None
+        self.all_items = False
+
+    def add(self, path):
+        node = self
+        for step in path:
+            node = node._child(step)
+        node.full = True
+
+    def _child(self, step):
+        if step is WILDCARD:
+            if self.wildcard is None:
+                self.wildcard = PathNode()
+            return self.wildcard
+        try:
+            index = int(step)
+        except (TypeError, ValueError):
+            return self.keys.setdefault(step, PathNode())
+        # same item can be used as list index and as dict key
+        node = self.indexes.get(index) or self.keys.get(step) or PathNode()
+        self.keys[step] = node
+        self.indexes[index] = node
+        if index < 0:
+            # position from end of list is unknown until list is read
+            self.all_items = True
+        return node
+
+    def get_item(self, key, in_list):
+        """Return nodes required by item, empty list if item is skipped."""
+        if self.full:
+            return [self]
+        if in_list:
+            if self.all_items:
+                return [_FULL]
+            nodes = [self.indexes.get(key), self.wildcard]
+        else:
+            nodes = [self.keys.get(key)]
+        nodes = [node for node in nodes if node is not None]
+        for node in nodes:
+            if node.full:
+                return [node]
+        return nodes
+
+
+_FULL = PathNode()
+_FULL.full = True
+
+
+def _get_items(nodes, key, in_list):
+    items = []
+    for node in nodes:
+        for item in node.get_item(key, in_list):
+            if item.full:
+                return [item]
+            items.append(item)
+    return items
+
+
+def _add_v1_paths(root, response_translation, path):
+    if isinstance(response_translation, list):
+        for idx, val in enumerate(response_translation):
+            if isinstance(val, (list, dict)):
+                _add_v1_paths(root, val, path + [idx])
+            else:
+                root.add(path)
+                return
+    elif isinstance(response_translation, dict):
+        for key, value in response_translation.items():
+            _add_v1_paths(root, value, path + [key])
+
+
+def _add_v2_paths(root, response_translation):
+    for translation in response_translation:
+        path = []
+        for key in translation[0]:
+            if isinstance(key, list):
+                path.append(WILDCARD)
+                path.append(key[0])
+            else:
+                path.append(key)
+        root.add(path)
+
+
+def _add_check_paths(root, response):
+    if not isinstance(response, list) or not response:
+        return
+    if isinstance(response[0], list):
+        for item in response:
+            _add_check_paths(root, item)
+    else:
+        root.add(response[:-1])
+
+
+def compile_response_paths(call):
+    """Build tree of body paths used by response_translation, checks
+    and pagination.
+
+    Returns None if nothing from body is used.
+    """
+    root = PathNode()
+    response_translation = call.get('response_translation', None)
+    translation_version = call.get('translation_format', 'auto')
+    if response_translation:
+        if translation_version == "v3":
+            for path in response_translation.values():
+                root.add(path)
+        elif _check_if_v2(response_translation) or \
+                translation_version == "v2":
+            _add_v2_paths(root, response_translation)
+        else:
+            _add_v1_paths(root, response_translation, [])
+    _add_check_paths(root, call.get('nonrecoverable_response'))
+    _add_check_paths(root, call.get('response_expectation'))
+    pagination = Pagination.from_call(call.get('pagination'))
+    if pagination:
+        for path in pagination.get_body_paths():
+            root.add(path)
+    if not root.full and not root.keys and root.wildcard is None:
+        return None
+    return root
+
+
+class _ChunkReader(object):
+    """File like object over iter_content of response."""
+
+    def __init__(self, response, chunk_size=CHUNK_SIZE):
+        self._chunks = response.iter_content(chunk_size)
+        self._buffer = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class _PrunedBuilder(object):
+    """Build json document from parser events, only required items are
+    created. Skipped list items before required one are kept as None, so
+    indexes are not changed."""
+
+    def __init__(self, root):
+        self.document = None
+        self.empty = True
+        # frames: [container, nodes, key, next list index]
+        self._stack = []
+        self._root = [root]
+        self._skip_depth = 0
+
+    def _get_nodes(self):
+        if not self._stack:
+            return self._root
+        frame = self._stack[-1]
+        container, nodes = frame[0], frame[1]
+        if isinstance(container, list):
+            frame[2] = frame[3]
+            frame[3] += 1
+        return _get_items(nodes, frame[2], isinstance(container, list))
+
+    def _attach(self, value):
+        if not self._stack:
+            self.document = value
+            return
+        frame = self._stack[-1]
+        container = frame[0]
+        if isinstance(container, list):
+            while len(container) < frame[2]:
+                container.append(None)
+            container.append(value)
+        else:
+            container[frame[2]] = value
+
+    def _mark_not_empty(self):
+        if len(self._stack) == 1 and self._skip_depth == 0:
+            self.empty = False
+
+    def event(self, event, value):
+        if self._skip_depth:
+            if event in ('start_map', 'start_array'):
+                self._skip_depth += 1
+            elif event in ('end_map', 'end_array'):
+                self._skip_depth -= 1
+            return
+        if event == 'map_key':
+            self._stack[-1][2] = value
+            return
+        if event in ('end_map', 'end_array'):
+            self._stack.pop()
+            return
+        self._mark_not_empty()
+        nodes = self._get_nodes()
+        if event in ('start_map', 'start_array'):
+            if not nodes:
+                self._skip_depth = 1
+                return
+            container = {} if event == 'start_map' else []
+            self._attach(container)
+            self._stack.append([container, nodes, None, 0])
+            return
+        if not self._stack:
+            self.empty = not value
+        if nodes:
+            self._attach(value)
+
+
+def load_json(response, paths):
+    """Parse json body, only items required by paths are loaded.
+
+    :return: document and flag that original document is empty.
+    """
+    builder = _PrunedBuilder(paths)
+    for _, event, value in ijson.parse(_ChunkReader(response),
+                                       use_float=True):
+        builder.event(event, value)
+    return builder.document, builder.empty
+
+
+def _push_data(item, key, data):
+    # same as xmltodict, repeated element is converted to list
+    if item is None:
+        item = {}
+    if key not in item:
+        item[key] = data
+    elif isinstance(item[key], list):
+        item[key].append(data)
+    else:
+        item[key] = [item[key], data]
+    return item
+
+
+class _PrunedXMLBuilder(object):
+    """Build same dict as xmltodict.parse from expat events, only
+    elements and attributes required by paths are created.
+
+    Element used by paths is list item once it is repeated, so nodes of
+    its first occurrence are merged with nodes of list index 0. Skipped
+    occurrence of required element is kept as None, so indexes are not
+    changed. Element with only skipped children or attributes keeps
+    first of them as None, so it is still not empty dict.
+    """
+
+    def __init__(self, root):
+        self.empty = True
+        # frames: [item, text parts, nodes, child counts, skipped key]
+        self._stack = [[None, [], [root], {}, None]]
+        self._skip_depth = 0
+
+    @property
+    def document(self):
+        item, _, _, _, skipped = self._stack[0]
+        if item is None:
+            return {skipped: None} if skipped is not None else {}
+        return item
+
+    def _get_nodes(self, frame, name):
+        index = frame[3].get(name, 0)
+        frame[3][name] = index + 1
+        for node in frame[2]:
+            if node.wildcard is not None:
+                # element is not repeated, list rule iterates over every
+                # key of its dict
+                return [_FULL]
+        nodes = _get_items(frame[2], name, False)
+        if not nodes:
+            return None
+        items = _get_items(nodes, index, True)
+        if index == 0:
+            items = nodes + items
+        for node in items:
+            if node.full:
+                return [node]
+        return items
+
+    def start_element(self, name, attrs):
+        self.empty = False
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        parent = self._stack[-1]
+        nodes = self._get_nodes(parent, name)
+        if not nodes:
+            if nodes is None:
+                if parent[4] is None:
+                    parent[4] = name
+            else:
+                # keep position of skipped list item
+                parent[0] = _push_data(parent[0], name, None)
+            self._skip_depth = 1
+            return
+        item = None
+        skipped = None
+        all_attrs = any(node.wildcard is not None for node in nodes)
+        for idx in range(0, len(attrs), 2):
+            key = '@' + attrs[idx]
+            if all_attrs or _get_items(nodes, key, False):
+                item = _push_data(item, key, attrs[idx + 1])
+            elif skipped is None:
+                skipped = key
+        self._stack.append([item, [], nodes, {}, skipped])
+
+    def end_element(self, name):
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        item, text, _, _, skipped = self._stack.pop()
+        data = ''.join(text).strip() or None
+        if item is None and skipped is not None:
+            item = {skipped: None}
+        parent = self._stack[-1]
+        if item is not None:
+            if data:
+                item = _push_data(item, '#text', data)
+            parent[0] = _push_data(parent[0], name, item)
+        else:
+            parent[0] = _push_data(parent[0], name, data)
+
+    def characters(self, data):
+        if not self._skip_depth:
+            self._stack[-1][1].append(data)
+
+
+def _forbid_entities(*args, **kwargs):
+    raise ValueError("entities are disabled")
+
+
+def load_xml(response, paths=None):
+    """Parse xml body from raw chunks without decoding whole text.
+
+    :param paths: tree of paths from compile_response_paths(), only
+        required elements are created. Whole document if not set.
+    :return: document and flag that original document is empty.
+    """
+    chunks = response.iter_content(CHUNK_SIZE)
+    if paths is None:
+        document = xmltodict.parse(chunk for chunk in chunks)
+        return document, not document
+    builder = _PrunedXMLBuilder(paths)
+    parser = expat.ParserCreate()
+    parser.ordered_attributes = True
+    parser.buffer_text = True
+    parser.StartElementHandler = builder.start_element
+    parser.EndElementHandler = builder.end_element
+    parser.CharacterDataHandler = builder.characters
+    parser.EntityDeclHandler = _forbid_entities
+    for chunk in chunks:
+        parser.Parse(chunk, False)
+    parser.Parse(b'', True)
+    return builder.document, builder.empty
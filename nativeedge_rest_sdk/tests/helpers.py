@@ -0,0 +1,51 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import mock
+import yaml
+from datetime import timedelta
+
+# properties of rest call sent to localhost by tests
+CALL_DEFAULTS = {
+    'method': 'get',
+    'host': 'localhost',
+    'port': -1,
+    'ssl': False,
+}
+
+
+def rest_template(*calls):
+    """Template of rest calls, each call is dict of properties added to
+    CALL_DEFAULTS."""
+    return yaml.safe_dump(
+        {'rest_calls': [dict(CALL_DEFAULTS, **call) for call in calls]})
+
+
+def fake_response(body=None, status_code=200, headers=None, links=None,
+                  content=None, chunk_size=7):
+    """Mock of json response returned by Session.request.
+
+    :param body: parsed json of response.
+    :param content: raw body returned by iter_content in chunks, json()
+        of such response fails, so body has to be streamed.
+    """
+    response = mock.Mock()
+    response.status_code = status_code
+    response.headers = dict(headers or {}, **{
+        'Content-Type': "application/json"})
+    response.cookies = {}
+    response.links = links or {}
+    response.elapsed = timedelta(seconds=0)
+    if content is None:
+        response.json = mock.Mock(return_value=body)
+    else:
+        response.iter_content = mock.Mock(return_value=iter([
+            content[i:i + chunk_size]
+            for i in range(0, len(content), chunk_size)]))
+        response.json = mock.Mock(side_effect=AssertionError('Not streamed'))
+    return response
+
+
+def patch_request(request):
+    """Replace requests sent by pooled sessions with mock."""
+    return mock.patch(
+        "nativeedge_rest_sdk.utility.requests.Session.request", request)
@@ -0,0 +1,105 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import mock
+import unittest
+
+from plugins_rest_sdk import cache, utility
+from nativeedge_rest_sdk.tests.helpers import (
+    fake_response, patch_request, rest_template)
+
+
+def _template(method):
+    return rest_template({
+        'path': '/status',
+        'method': method,
+        'response_cache': True,
+        'response_translation': [[['status'], ['status']]]})
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        cache.get_response_cache().clear()
+        self.addCleanup(cache.get_response_cache().clear)
+
+    def test_lru(self):
+        response_cache = cache.ResponseCache(max_entries=2)
+        first = cache.CacheEntry(etag='"a"')
+        response_cache.set('a', first)
+        response_cache.set('b', cache.CacheEntry(etag='"b"'))
+        self.assertIs(response_cache.get('a'), first)
+        response_cache.set('c', cache.CacheEntry(etag='"c"'))
+        self.assertIsNone(response_cache.get('b'))
+        self.assertEqual(len(response_cache), 2)
+        self.assertEqual(
+            cache.CacheEntry('"a"', 'Wed, 21 Oct 2015 07:28:00 GMT')
+            .get_conditional_headers(),
+            {'If-None-Match': '"a"',
+             'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+
+    def test_get_key(self):
+        key = cache.ResponseCache.get_key(
+            {'path': '/', 'params': {'a': 1}})
+        self.assertEqual(
+            key, cache.ResponseCache.get_key(
+                {'params': {'a': 1}, 'path': '/'}))
+        self.assertNotEqual(
+            key, cache.ResponseCache.get_key(
+                {'path': '/', 'params': {'a': 2}}))
+
+    def test_not_modified(self):
+        not_modified = fake_response(status_code=304)
+        request = mock.Mock(side_effect=[
+            fake_response({'status': 'running'}, headers={'ETag': '"v1"'}),
+            not_modified
+        ])
+        with patch_request(request):
+            template = _template('get')
+            self.assertEqual(
+                utility.process({}, template, {})['result_properties'],
+                {'status': 'running'})
+            self.assertEqual(
+                utility.process({}, template, {})['result_properties'],
+                {'status': 'running'})
+        self.assertEqual(request.call_args_list[0][1]['headers'], None)
+        self.assertEqual(request.call_args_list[1][1]['headers'],
+                         {'If-None-Match': '"v1"'})
+        # body of not modified response is not parsed
+        not_modified.json.assert_not_called()
+
+    def test_not_cached(self):
+        # result is cached only for get requests
+        request = mock.Mock(side_effect=[
+            fake_response({'status': 'running'}, headers={'ETag': '"v1"'}),
+            fake_response({'status': 'done'}, headers={'ETag': '"v1"'})
+        ])
+        with patch_request(request):
+            template = _template('post')
+            utility.process({}, template, {})
+            self.assertEqual(
+                utility.process({}, template, {})['result_properties'],
+                {'status': 'done'})
+        self.assertEqual(request.call_args[1]['headers'], None)
+        self.assertEqual(len(cache.get_response_cache()), 0)
+
+    def test_removed_entry(self):
+        request = mock.Mock(side_effect=[
+            fake_response(status_code=304),
+            fake_response({'status': 'done'}, headers={'ETag': '"v2"'})
+        ])
+        with patch_request(request):
+            # entry is removed after request is sent
+            with mock.patch.object(
+                cache.ResponseCache, 'get',
+                mock.Mock(side_effect=[cache.CacheEntry(etag='"v1"'), None,
+                                       None])
+            ):
+                result = utility.process(
+                    {}, _template('get'), {})
+        self.assertEqual(result['result_properties'], {'status': 'done'})
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(request.call_args[1]['headers'], None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import os
+import ssl
+import mock
+import shutil
+import tempfile
+import unittest
+
+from plugins_rest_sdk import certificates, sessions
+
+
+class TestCertificates(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.addCleanup(certificates.clear_ssl_contexts)
+
+    def test_store_shared_file(self):
+        store = certificates.CertificateStore(directory=self.directory)
+        path = store.acquire(u"some_cert")
+        self.assertEqual(store.acquire(b"some_cert"), path)
+        self.assertNotEqual(store.acquire(u"other_cert"), path)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b"some_cert")
+        self.assertEqual(os.stat(path).st_mode & 0o077, 0)
+        self.assertEqual(len(store), 2)
+        store.clear()
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(len(store), 0)
+
+    def test_store_ttl(self):
+        store = certificates.CertificateStore(ttl=10,
+                                              directory=self.directory)
+        with mock.patch('nativeedge_rest_sdk.certificates.time.time',
+                        mock.Mock(return_value=100)):
+            path = store.acquire("some_cert")
+            store.acquire("some_cert")
+            store.release(path)
+        with mock.patch('nativeedge_rest_sdk.certificates.time.time',
+                        mock.Mock(return_value=200)):
+            # still used by second call
+            store.acquire("other_cert")
+            self.assertTrue(os.path.isfile(path))
+            store.release(path)
+        with mock.patch('nativeedge_rest_sdk.certificates.time.time',
+                        mock.Mock(return_value=205)):
+            store.acquire("other_cert")
+            self.assertTrue(os.path.isfile(path))
+        with mock.patch('nativeedge_rest_sdk.certificates.time.time',
+                        mock.Mock(return_value=300)):
+            store.acquire("other_cert")
+            self.assertFalse(os.path.isfile(path))
+            # file is created again on next use
+            self.assertEqual(store.acquire("some_cert"), path)
+            self.assertTrue(os.path.isfile(path))
+
+    def test_ssl_context_cache(self):
+        bundle = os.path.join(self.directory, 'ca.pem')
+        shutil.copy(certificates.DEFAULT_CA_BUNDLE_PATH, bundle)
+        context = certificates.get_ssl_context(bundle)
+        self.assertEqual(context.verify_mode, ssl.CERT_REQUIRED)
+        self.assertIs(certificates.get_ssl_context(bundle), context)
+        # changed file is loaded again
+        with open(bundle, 'a') as f:
+            f.write('\n')
+        self.assertIsNot(certificates.get_ssl_context(bundle), context)
+        self.assertEqual(
+            certificates.get_ssl_context(False).verify_mode, ssl.CERT_NONE)
+
+    def test_adapter_ssl_context(self):
+        bundle = os.path.join(self.directory, 'ca.pem')
+        shutil.copy(certificates.DEFAULT_CA_BUNDLE_PATH, bundle)
+        adapter = sessions._SSLContextAdapter()
+        request = sessions.requests.Request(
+            'GET', 'https://localhost/').prepare()
+        _, pool_kwargs = adapter.build_connection_pool_key_attributes(
+            request, bundle)
+        self.assertIs(pool_kwargs['ssl_context'],
+                      certificates.get_ssl_context(bundle))
+        self.assertNotIn('ca_certs', pool_kwargs)
+        # default settings are not changed
+        _, pool_kwargs = adapter.build_connection_pool_key_attributes(
+            request, True)
+        self.assertNotIn('ssl_context', pool_kwargs)
+
+    def test_adapter_invalid_cert(self):
+        bundle = os.path.join(self.directory, 'ca.pem')
+        with open(bundle, 'w') as f:
+            f.write('some_server_cert')
+        adapter = sessions._SSLContextAdapter()
+        request = sessions.requests.Request(
+            'GET', 'https://localhost/').prepare()
+        with self.assertRaises(sessions.requests.exceptions.SSLError):
+            adapter.build_connection_pool_key_attributes(request, bundle)
+
+    def test_adapter_cert_verify(self):
+        bundle = os.path.join(self.directory, 'ca.pem')
+        shutil.copy(certificates.DEFAULT_CA_BUNDLE_PATH, bundle)
+        adapter = sessions._SSLContextAdapter()
+        conn = mock.Mock()
+        # certificates are in ssl context of pool
+        adapter.cert_verify(conn, 'https://localhost/', bundle, None)
+        self.assertEqual(conn.cert_reqs, 'CERT_REQUIRED')
+        self.assertIsInstance(conn.ca_certs, mock.Mock)
+        # requests without pool key hook load certificates to connection
+        conn = mock.Mock()
+        with mock.patch(
+            'nativeedge_rest_sdk.sessions._HAS_POOL_KEY_ATTRIBUTES', False
+        ):
+            adapter.cert_verify(conn, 'https://localhost/', bundle, None)
+        self.assertEqual(conn.cert_reqs, 'CERT_REQUIRED')
+        self.assertEqual(conn.ca_certs, bundle)
+
+
+if __name__ == '__main__':
+    unittest.main()
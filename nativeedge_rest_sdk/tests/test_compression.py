@@ -0,0 +1,75 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import json
+import zlib
+import gzip
+import mock
+import unittest
+
+from plugins_rest_sdk import compression, utility
+from nativeedge_common_sdk import exceptions
+from nativeedge_rest_sdk.tests.helpers import (
+    fake_response, patch_request, rest_template)
+
+TEMPLATE = rest_template({
+    'path': '/items',
+    'method': 'post',
+    'request_compression': {'type': 'gzip', 'min_size': 10},
+    'response_compression': True,
+    'payload': {'items': [1, 2, 3]},
+    'response_translation': [[['status'], ['status']]]})
+
+
+class TestCompression(unittest.TestCase):
+
+    def test_compress_payload(self):
+        settings = compression.RequestCompression(min_size=10)
+        json_payload, data, headers = settings.compress_payload(
+            {'items': list(range(10))}, None, None)
+        self.assertIsNone(json_payload)
+        self.assertEqual(json.loads(gzip.decompress(data)),
+                         {'items': list(range(10))})
+        self.assertEqual(headers, {'Content-Type': 'application/json',
+                                   'Content-Encoding': 'gzip'})
+        # small body is sent as is
+        self.assertEqual(settings.compress_payload({'a': 1}, None, None),
+                         ({'a': 1}, None, None))
+        settings = compression.RequestCompression.from_call('deflate')
+        _, data, headers = settings.compress_payload(
+            None, {'a': 'b' * 2000}, {'content-type': 'text/plain'})
+        self.assertEqual(zlib.decompress(data), ('a=' + 'b' * 2000).encode())
+        self.assertEqual(headers, {'content-type': 'text/plain',
+                                   'Content-Encoding': 'deflate'})
+
+    def test_from_call(self):
+        self.assertIsNone(compression.RequestCompression.from_call(None))
+        self.assertEqual(
+            compression.RequestCompression.from_call(True).type, 'gzip')
+        with self.assertRaises(exceptions.WrongTemplateDataException):
+            compression.RequestCompression.from_call('br')
+        with self.assertRaises(exceptions.WrongTemplateDataException):
+            compression.RequestCompression.from_call({'size': 10})
+        self.assertIsNone(compression.get_accept_encoding(None))
+        self.assertEqual(compression.get_accept_encoding(False), 'identity')
+        self.assertEqual(compression.get_accept_encoding(['deflate']),
+                         'deflate')
+        self.assertIn('gzip', compression.get_accept_encoding(True))
+        with self.assertRaises(exceptions.WrongTemplateDataException):
+            compression.get_accept_encoding(['compress'])
+
+    def test_process(self):
+        request = mock.Mock(return_value=fake_response({'status': 'ok'}))
+        with patch_request(request):
+            result = utility.process({}, TEMPLATE, {})
+        self.assertEqual(result['result_properties'], {'status': 'ok'})
+        kwargs = request.call_args[1]
+        self.assertIsNone(kwargs['json'])
+        self.assertEqual(json.loads(gzip.decompress(kwargs['data'])),
+                         {'items': [1, 2, 3]})
+        self.assertEqual(kwargs['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(kwargs['headers']['Accept-Encoding'],
+                         ', '.join(compression.RESPONSE_ENCODINGS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import re
+import unittest
+
+from plugins_rest_sdk import expectations, utility
+from nativeedge_common_sdk import exceptions
+
+
+class TestExpectations(unittest.TestCase):
+
+    def setUp(self):
+        expectations.clear_expectation_cache()
+        self.addCleanup(expectations.clear_expectation_cache)
+
+    def test_rules_not_changed(self):
+        rules = [['id', '10'], [['name', 'a.*']]]
+        utility._check_response({'id': 10, 'name': 'abc'}, rules, True)
+        utility._check_response({'id': 10, 'name': 'abc'}, rules, True)
+        self.assertEqual(rules, [['id', '10'], [['name', 'a.*']]])
+        with self.assertRaises(exceptions.RecoverableResponseException):
+            utility._check_response({'id': 10, 'name': 'xyz'}, rules, True)
+        with self.assertRaises(exceptions.NonRecoverableResponseException):
+            utility._check_response({'id': 10}, rules, False)
+
+    def test_cached_matcher(self):
+        matcher = expectations.get_expectation_matcher([['id', '10']], True)
+        self.assertIs(
+            expectations.get_expectation_matcher([['id', '10']], True),
+            matcher)
+        self.assertIsNot(
+            expectations.get_expectation_matcher([['id', '10']], False),
+            matcher)
+        self.assertEqual(len(matcher.checks), 1)
+        self.assertEqual(matcher.checks[0].keys, ('id',))
+        self.assertEqual(matcher.checks[0].regexp, re.compile('10'))
+
+    def test_invalid_rules(self):
+        # error of rule is raised in order of rules
+        with self.assertRaises(exceptions.RecoverableResponseException):
+            utility._check_response({'id': 10}, [['id', '20'], 'id'], True)
+        with self.assertRaises(exceptions.WrongTemplateDataException) as e:
+            utility._check_response({'id': 10}, [['id', '10'], 'id'], True)
+        self.assertEqual(
+            str(e.exception),
+            "Response (recoverable) had to be list. "
+            "Type <class 'str'> not supported. ")
+        # missing value is reported before wrong regexp
+        with self.assertRaises(exceptions.ExpectationException):
+            utility._check_response({'id': 10}, [['name', '(']], False)
+        with self.assertRaises(re.error):
+            utility._check_response({'id': 10}, [['id', '(']], False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import mock
+import unittest
+
+from plugins_rest_sdk import hosts
+
+
+class TestHosts(unittest.TestCase):
+
+    def test_order(self):
+        health = hosts.HostHealth()
+        keys = ['a', 'b', 'c']
+        # no stats, order is not changed
+        self.assertEqual(health.order(keys), keys)
+        health.record_success('a', 0.5)
+        health.record_success('b', 0.1)
+        health.record_success('c', 0.2)
+        self.assertEqual(health.order(keys), ['b', 'c', 'a'])
+        health.record_failure('b')
+        self.assertEqual(health.order(keys), ['c', 'a', 'b'])
+        health.clear()
+        self.assertEqual(health.order(keys), keys)
+
+    def test_failures_decay(self):
+        health = hosts.HostHealth(half_life=10, failure_penalty=8)
+        with mock.patch('nativeedge_rest_sdk.hosts.time.time',
+                        mock.Mock(return_value=100)):
+            health.record_failure('a')
+            self.assertEqual(health.score('a'), 8)
+        with mock.patch('nativeedge_rest_sdk.hosts.time.time',
+                        mock.Mock(return_value=120)):
+            self.assertEqual(health.score('a'), 2)
+
+    def test_latency_percentile(self):
+        health = hosts.HostHealth()
+        health.record_success('a', 1)
+        self.assertIsNone(health.latency_percentile('a', 95))
+        self.assertIsNone(health.latency_percentile('b', 95))
+        for latency in range(2, 11):
+            health.record_success('a', latency)
+        self.assertEqual(health.latency_percentile('a', 50), 5)
+        self.assertEqual(health.latency_percentile('a', 95), 10)
+        self.assertEqual(health.latency_percentile('a', 0), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import io
+import os
+import mock
+import shutil
+import tempfile
+import unittest
+
+from requests.models import RequestEncodingMixin
+
+from plugins_rest_sdk import multipart, utility
+from nativeedge_common_sdk import exceptions
+from nativeedge_rest_sdk.tests.helpers import (
+    fake_response, patch_request, rest_template)
+
+TEMPLATE = rest_template({
+    'path': '/upload',
+    'method': 'post',
+    'files_streaming': True,
+    'files_raw': {'firmware': 'some_name'}})
+
+
+class TestMultipart(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.path = os.path.join(self.directory, 'firmware.bin')
+        with open(self.path, 'wb') as f:
+            f.write(b'0123456789' * 1000)
+
+    def test_same_body_as_requests(self):
+        files = [('a', b'abc'),
+                 ('b', (u'b.txt', u'some text', 'text/plain')),
+                 ('c', io.BytesIO(b'xyz'))]
+        expected, content_type = RequestEncodingMixin._encode_files(
+            files, {'field': 'value'})
+        boundary = content_type.split('boundary=')[-1]
+        files[2] = ('c', io.BytesIO(b'xyz'))
+        encoder = multipart.MultipartEncoder(
+            [('field', 'value')], files, boundary=boundary)
+        self.assertEqual(encoder.content_type, content_type)
+        # size of file object is unknown
+        self.assertIsNone(encoder.len)
+        self.assertEqual(b''.join(encoder), expected)
+
+    def test_local_file(self):
+        encoder = multipart.MultipartEncoder(
+            files=[('firmware', ('firmware.bin',
+                                 multipart.LocalFile(self.path)))],
+            chunk_size=512)
+        chunks = list(encoder)
+        self.assertLessEqual(max(len(chunk) for chunk in chunks), 512)
+        body = b''.join(chunks)
+        self.assertEqual(encoder.len, len(body))
+        self.assertIn(b'0123456789' * 1000 + b'\r\n', body)
+        # read by file api returns same body
+        encoder = multipart.MultipartEncoder(
+            files=[('firmware', ('firmware.bin',
+                                 multipart.LocalFile(self.path)))],
+            boundary=encoder.boundary, chunk_size=512)
+        parts = []
+        while True:
+            part = encoder.read(1000)
+            if not part:
+                break
+            parts.append(part)
+        self.assertEqual(b''.join(parts), body)
+        # length is not provided for chunked transfer encoding
+        self.assertIsNone(multipart.MultipartEncoder(
+            files=[('a', b'abc')], chunked=True).len)
+
+    def test_process_streaming(self):
+        bodies = []
+
+        def _fake_request(method, url, **kwargs):
+            bodies.append(b''.join(kwargs['data']))
+            return fake_response({})
+
+        resource_callback = mock.Mock(return_value=b'')
+        request = mock.Mock(side_effect=_fake_request)
+        with patch_request(request):
+            utility.process({}, TEMPLATE, {},
+                            resource_callback=resource_callback,
+                            resource_path_callback=lambda name: self.path)
+        # file was not loaded to memory by resource callback
+        resource_callback.assert_not_called()
+        kwargs = request.call_args[1]
+        self.assertIsNone(kwargs['files'])
+        self.assertIsNone(kwargs['json'])
+        self.assertTrue(kwargs['headers']['Content-Type'].startswith(
+            'multipart/form-data; boundary='))
+        self.assertEqual(kwargs['data'].len, len(bodies[0]))
+        self.assertIn(b'name="firmware"; filename="firmware"', bodies[0])
+
+        # without path callback file is loaded by resource callback
+        resource_callback = mock.Mock(return_value=b'abc')
+        with patch_request(request):
+            utility.process({}, TEMPLATE, {},
+                            resource_callback=resource_callback)
+        resource_callback.assert_called_once_with('some_name')
+        self.assertIn(b'\r\n\r\nabc\r\n', bodies[1])
+
+    def test_streaming_payload(self):
+        call = {'files_streaming': True,
+                'files': {'a': 'abc'},
+                'payload_format': 'raw',
+                'payload': {'field': ['x', 'y']}}
+        kwargs = utility._get_request_kwargs(call, None)
+        body = b''.join(kwargs['data'])
+        self.assertIn(b'name="field"\r\n\r\nx\r\n', body)
+        self.assertIn(b'name="field"\r\n\r\ny\r\n', body)
+        call['payload'] = 'some_text'
+        with self.assertRaises(exceptions.WrongTemplateDataException):
+            utility._get_request_kwargs(call, None)
+
+    def test_path_callback_only(self):
+        loader = utility._get_resource_loader(False, lambda name: self.path)
+        # raw payload is skipped same as without path callback
+        kwargs = utility._get_request_kwargs(
+            {'payload_raw': 'payload.json', 'payload': {'a': 'b'}}, loader)
+        self.assertEqual(kwargs['json'], {'a': 'b'})
+        # raw files are still streamed from path
+        kwargs = utility._get_request_kwargs(
+            {'files_streaming': True, 'files_raw': {'firmware': 'a'}},
+            loader)
+        self.assertIn(b'0123456789' * 1000, b''.join(kwargs['data']))
+
+
+if __name__ == '__main__':
+    unittest.main()
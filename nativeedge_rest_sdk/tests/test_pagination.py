@@ -0,0 +1,137 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import mock
+import unittest
+from six.moves.urllib.parse import urlparse
+
+from plugins_rest_sdk import pagination, utility
+from nativeedge_common_sdk import exceptions
+from nativeedge_rest_sdk.tests.helpers import (
+    fake_response, patch_request, rest_template)
+
+ITEMS = [{'id': idx} for idx in range(5)]
+
+
+class TestPagination(unittest.TestCase):
+
+    def _process(self, call, fake_request, request_props=None):
+        template = rest_template(dict(
+            call, path='/items',
+            response_translation=[[['items', ['id']], ['ids']]]))
+        request = mock.Mock(side_effect=fake_request)
+        with patch_request(request):
+            result = utility.process({}, template, request_props or {})
+        return result['result_properties'], request
+
+    def test_link_header(self):
+        def _fake_request(method, url, **kwargs):
+            page = int(url.split('page=')[-1]) if 'page=' in url else 0
+            links = {}
+            if page < 2:
+                links['next'] = {'url': '/items?page={}'.format(page + 1)}
+            return fake_response(
+                {'items': ITEMS[page * 2:page * 2 + 2], 'page': page},
+                links=links)
+
+        result, request = self._process(
+            {'pagination': {'type': 'link_header'}}, _fake_request)
+        self.assertEqual(result, {'ids': [0, 1, 2, 3, 4]})
+        self.assertEqual(
+            [call[0][1] for call in request.call_args_list],
+            ['http://localhost:80/items',
+             'http://localhost:80/items?page=1',
+             'http://localhost:80/items?page=2'])
+
+    def test_link_header_other_host(self):
+        links = {
+            '/items': 'https://other.example.com/steal?page=1',
+            '/steal': '/steal?page=2',
+        }
+
+        def _fake_request(method, url, **kwargs):
+            page = int(url.split('page=')[-1]) if 'page=' in url else 0
+            next_link = links.get(urlparse(url).path) if page < 2 else None
+            return fake_response(
+                {'items': ITEMS[page * 2:page * 2 + 2]},
+                links={'next': {'url': next_link}} if next_link else None)
+
+        result, request = self._process({
+            'auth': {'user': 'admin', 'password': 's3cret'},
+            'headers': {'Authorization': 'Bearer TOKEN',
+                        'cookie': 'session=a',
+                        'Accept': 'application/json'},
+            'pagination': {'type': 'link_header'},
+        }, _fake_request, {'headers': {'Authorization': 'Bearer OTHER'}})
+        self.assertEqual(result, {'ids': [0, 1, 2, 3, 4]})
+        self.assertEqual(
+            [call[0][1] for call in request.call_args_list],
+            ['http://localhost:80/items',
+             'https://other.example.com:443/steal?page=1',
+             'https://other.example.com:443/steal?page=2'])
+        first, second, third = [
+            call[1] for call in request.call_args_list]
+        self.assertEqual(first['auth'], ('admin', 's3cret'))
+        self.assertEqual(first['headers']['Authorization'], 'Bearer TOKEN')
+        # credentials of template host are not sent to host from link
+        for kwargs in (second, third):
+            self.assertIsNone(kwargs['auth'])
+            self.assertEqual(kwargs['headers'],
+                             {'Accept': 'application/json'})
+
+    def test_cursor(self):
+        def _fake_request(method, url, params, **kwargs):
+            start = int(params.get('token', 0))
+            body = {'items': ITEMS[start:start + 2], 'meta': {'next': None}}
+            if start + 2 < len(ITEMS):
+                body['meta']['next'] = str(start + 2)
+            return fake_response(body)
+
+        result, request = self._process({'pagination': {
+            'type': 'cursor',
+            'cursor_path': ['meta', 'next'],
+            'cursor_param': 'token'}}, _fake_request)
+        self.assertEqual(result, {'ids': [0, 1, 2, 3, 4]})
+        self.assertEqual(request.call_count, 3)
+
+    def test_offset(self):
+        def _fake_request(method, url, params, **kwargs):
+            start = params.get('offset', 0)
+            return fake_response(
+                {'items': ITEMS[start:start + params['limit']]})
+
+        result, request = self._process({
+            'params': {'limit': 2},
+            'pagination': {'type': 'offset',
+                           'items_path': ['items'],
+                           'max_pages': 2}}, _fake_request)
+        # stopped by max_pages
+        self.assertEqual(result, {'ids': [0, 1, 2, 3]})
+        self.assertEqual(request.call_args[1]['params'],
+                         {'limit': 2, 'offset': 2})
+
+    def test_from_call(self):
+        self.assertIsNone(pagination.Pagination.from_call(None))
+        with self.assertRaises(exceptions.WrongTemplateDataException):
+            pagination.Pagination.from_call({'type': 'pages'})
+        with self.assertRaises(exceptions.WrongTemplateDataException):
+            pagination.Pagination.from_call({'type': 'cursor'})
+        with self.assertRaises(exceptions.WrongTemplateDataException):
+            pagination.Pagination.from_call({'size': 10})
+        self.assertEqual(
+            pagination.Pagination.from_call(
+                {'type': 'offset', 'items_path': ['a']}).get_body_paths(),
+            [['a']])
+
+    def test_merge(self):
+        call_props = {}
+        pagination.merge_page(call_props, {'a': [1], 'b': {'c': [1]}})
+        pagination.merge_page(call_props, {'a': [2], 'b': {'c': [2]}})
+        self.assertEqual(call_props, {'a': [1, 2], 'b': {'c': [1, 2]}})
+        result_properties = {'a': [0], 'b': {'d': 1}}
+        pagination.merge_result(result_properties, call_props)
+        self.assertEqual(result_properties,
+                         {'a': [1, 2], 'b': {'c': [1, 2], 'd': 1}})
+
+
+if __name__ == '__main__':
+    unittest.main()
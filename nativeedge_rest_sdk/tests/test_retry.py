@@ -0,0 +1,52 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import mock
+import unittest
+from email.utils import formatdate
+
+from plugins_rest_sdk import retry
+from nativeedge_common_sdk import exceptions
+
+
+class TestRetry(unittest.TestCase):
+
+    def test_parse_retry_after(self):
+        self.assertEqual(retry.parse_retry_after('120'), 120)
+        self.assertIsNone(retry.parse_retry_after(None))
+        self.assertIsNone(retry.parse_retry_after('soon'))
+        with mock.patch('nativeedge_rest_sdk.retry.time.time',
+                        mock.Mock(return_value=1000)):
+            self.assertEqual(retry.parse_retry_after(
+                formatdate(1030, usegmt=True)), 30)
+            # date in past
+            self.assertEqual(retry.parse_retry_after(
+                formatdate(900, usegmt=True)), 0)
+
+    def test_get_delay(self):
+        policy = retry.RetryPolicy(attempts=4, delay=1, max_delay=3,
+                                   jitter=False)
+        self.assertEqual(
+            [policy.get_delay(attempt, 0) for attempt in range(1, 5)],
+            [1, 2, 3, None])
+        # server asks for longer delay
+        self.assertEqual(policy.get_delay(1, 0, retry_after=10), 10)
+        policy = retry.RetryPolicy(attempts=10, delay=4, max_elapsed=10)
+        for _ in range(10):
+            self.assertLessEqual(policy.get_delay(1, 0), 4)
+        self.assertIsNone(policy.get_delay(1, 9, retry_after=2))
+
+    def test_from_call(self):
+        self.assertIsNone(retry.RetryPolicy.from_call(None))
+        self.assertEqual(
+            retry.RetryPolicy.from_call(True).attempts,
+            retry.DEFAULT_ATTEMPTS)
+        self.assertEqual(
+            retry.RetryPolicy.from_call({'attempts': 5}).attempts, 5)
+        with self.assertRaises(exceptions.WrongTemplateDataException):
+            retry.RetryPolicy.from_call(['attempts'])
+        with self.assertRaises(exceptions.WrongTemplateDataException):
+            retry.RetryPolicy.from_call({'count': 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
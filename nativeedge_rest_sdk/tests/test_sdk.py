@@ -1,12 +1,16 @@
 # Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
 
+import time
 import unittest
 import json
 import mock
 import six
+import threading
 
 from plugins_rest_sdk import utility
 from nativeedge_common_sdk import exceptions
+from nativeedge_rest_sdk.tests.helpers import (
+    fake_response, patch_request, rest_template)
 
 
 class TestSdk(unittest.TestCase):
@@ -388,7 +392,7 @@ class TestSdk(unittest.TestCase):
         response.cookies = mock.Mock()
         response.cookies.get_dict = mock.Mock(return_value={'a': 'b'})
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(utility._send_request(call), response)
         request.assert_called_with('get', 'https://localhost:443/',
@@ -436,7 +440,7 @@ class TestSdk(unittest.TestCase):
             return a
 
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             with mock.patch(
                 "nativeedge_rest_sdk.utility.StringIO", _fake_StringIO
@@ -490,7 +494,7 @@ class TestSdk(unittest.TestCase):
             return a
 
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(
                 utility._send_request(call, response_callback),
@@ -541,7 +545,7 @@ class TestSdk(unittest.TestCase):
             return a
 
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(
                 utility._send_request(call, response_callback),
@@ -586,7 +590,7 @@ class TestSdk(unittest.TestCase):
         response.cookies.get_dict = mock.Mock(return_value={'a': 'b'})
         request = mock.Mock(return_value=response)
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(utility._send_request(call), response)
         request.assert_called_with('get', 'https://localhost:443/xml',
@@ -606,7 +610,7 @@ class TestSdk(unittest.TestCase):
             side_effect=utility.requests.exceptions.HTTPError('Error!')
         )
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             with self.assertRaises(
                 utility.requests.exceptions.HTTPError
@@ -617,7 +621,7 @@ class TestSdk(unittest.TestCase):
         # expected error
         call['recoverable_codes'] = [404]
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             with self.assertRaises(
                 exceptions.RecoverableStatusCodeCodeException
@@ -631,7 +635,7 @@ class TestSdk(unittest.TestCase):
         call['recoverable_codes'] = []
         call['successful_codes'] = [404]
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(utility._send_request(call), response)
 
@@ -641,7 +645,7 @@ class TestSdk(unittest.TestCase):
                 'check connect')
         )
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             with self.assertRaises(
                 utility.requests.exceptions.ConnectionError
@@ -656,7 +660,7 @@ class TestSdk(unittest.TestCase):
                 'check connect')
         )
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             with self.assertRaises(
                 exceptions.RecoverableResponseException
@@ -701,7 +705,7 @@ class TestSdk(unittest.TestCase):
         response.cookies.get_dict = mock.Mock(return_value={'a': 'b'})
         request = mock.Mock(return_value=response)
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(
                 utility.process({'payload': '<object>11</object>'}, template,
@@ -710,14 +714,14 @@ class TestSdk(unittest.TestCase):
                         'headers': {'a': 'b'},
                         'host': 'localhost',
                         'method': 'get',
-                        'nonrecoverable_response': [['object']],
+                        'nonrecoverable_response': [['object', '20']],
                         'path': '/xml',
                         'payload': '<object>11</object>',
                         'payload_format': 'raw',
                         'port': -1,
-                        'response_expectation': [['object']],
+                        'response_expectation': [['object', '10']],
                         'response_format': 'xml',
-                        'response_translation': {'object': []},
+                        'response_translation': {'object': ['object_id']},
                         'ssl': True,
                         'verify': False
                     }],
@@ -766,7 +770,7 @@ class TestSdk(unittest.TestCase):
         response.cookies.get_dict = mock.Mock(return_value={'a': 'b'})
         request = mock.Mock(return_value=response)
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(
                 utility.process({'payload': '<object>11</object>'}, template,
@@ -776,15 +780,15 @@ class TestSdk(unittest.TestCase):
                         'headers': {'a': 'b'},
                         'host': 'localhost',
                         'method': 'get',
-                        'nonrecoverable_response': [['object']],
+                        'nonrecoverable_response': [['object', '20']],
                         'path': '/xml',
                         'raw_payload': 'payload.xml',
                         'payload': '<object>11</object>',
                         'payload_format': 'raw',
                         'port': -1,
-                        'response_expectation': [['object']],
+                        'response_expectation': [['object', '10']],
                         'response_format': 'xml',
-                        'response_translation': {'object': []},
+                        'response_translation': {'object': ['object_id']},
                         'ssl': True,
                         'verify': False
                     }],
@@ -845,44 +849,35 @@ class TestSdk(unittest.TestCase):
         response.cookies.get_dict = mock.Mock(return_value={'a': 'b'})
         request = mock.Mock(return_value=response)
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
+            certificate_store = mock.Mock()
+            certificate_store.acquire = mock.Mock(
+                return_value='/tmp/fake_tmp')
             with mock.patch(
-                "nativeedge_rest_sdk.utility.tempfile.mkstemp",
-                mock.Mock(return_value=['fake_fd', '/tmp/fake_tmp'])
+                "nativeedge_rest_sdk.utility.get_certificate_store",
+                mock.Mock(return_value=certificate_store)
             ):
-                def _verify_cert_data_type(_, data):
-                    assert isinstance(data, bytes), \
-                        "Attempt of writing to temp file certificate data " \
-                        "which has invalid type: " \
-                        f"`{type(data).__name__}`, expected: `bytes`"
-
-                fake_os = mock.Mock()
-                fake_os.path.isfile = mock.Mock(return_value=False)
-                fake_os.write = mock.Mock(side_effect=_verify_cert_data_type)
-                fake_os.remove = mock.Mock(
-                    side_effect=Exception("can't remove"))
-                with mock.patch("nativeedge_rest_sdk.utility.os", fake_os):
-                    self.assertEqual(
-                        utility.process({}, template, {}), {
-                            'calls': [{
-                                'headers': {'a': 'b'},
-                                'host': 'localhost',
-                                'method': 'get',
-                                'nonrecoverable_response': [['object']],
-                                'path': '/xml',
-                                'payload': '<object>11</object>',
-                                'payload_format': 'raw',
-                                'port': -1,
-                                'response_expectation': [['object']],
-                                'response_format': 'xml',
-                                'response_translation': {'object': []},
-                                'ssl': True,
-                                'timeout': 300,
-                                'cert': "some_client_cert",
-                                'verify': "some_server_cert",
-                            }],
-                            'result_properties': {'object_id': u'10'}})
+                self.assertEqual(
+                    utility.process({}, template, {}), {
+                        'calls': [{
+                            'headers': {'a': 'b'},
+                            'host': 'localhost',
+                            'method': 'get',
+                            'nonrecoverable_response': [['object', '20']],
+                            'path': '/xml',
+                            'payload': '<object>11</object>',
+                            'payload_format': 'raw',
+                            'port': -1,
+                            'response_expectation': [['object', '10']],
+                            'response_format': 'xml',
+                            'response_translation': {'object': ['object_id']},
+                            'ssl': True,
+                            'timeout': 300,
+                            'cert': "some_client_cert",
+                            'verify': "some_server_cert",
+                        }],
+                        'result_properties': {'object_id': u'10'}})
         request.assert_called_with('get', 'https://localhost:443/xml',
                                    data='<object>11</object>',
                                    headers={'a': 'b'},
@@ -894,6 +889,10 @@ class TestSdk(unittest.TestCase):
                                    proxies=None,
                                    timeout=300,
                                    verify='/tmp/fake_tmp')
+        certificate_store.acquire.assert_has_calls([
+            mock.call("some_server_cert"), mock.call("some_client_cert")])
+        certificate_store.release.assert_has_calls([
+            mock.call('/tmp/fake_tmp'), mock.call('/tmp/fake_tmp')])
         # without params
         template = """
             rest_calls:
@@ -925,7 +924,7 @@ class TestSdk(unittest.TestCase):
         response.cookies.get_dict = mock.Mock(return_value={'a': 'b'})
         request = mock.Mock(return_value=response)
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(
                 utility.process({}, template, {}), {
@@ -933,14 +932,14 @@ class TestSdk(unittest.TestCase):
                         'headers': {'a': 'b'},
                         'host': 'localhost',
                         'method': 'get',
-                        'nonrecoverable_response': [['object']],
+                        'nonrecoverable_response': [['object', '20']],
                         'path': '/xml',
                         'payload': '<object>11</object>',
                         'payload_format': 'raw',
                         'port': -1,
-                        'response_expectation': [['object']],
+                        'response_expectation': [['object', '10']],
                         'response_format': 'xml',
-                        'response_translation': {'object': []},
+                        'response_translation': {'object': ['object_id']},
                         'ssl': True,
                         'verify': False
                     }],
@@ -977,7 +976,7 @@ class TestSdk(unittest.TestCase):
                 - object_id"""
         request = mock.Mock(return_value=response)
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(
                 utility.process({'custom': [1, 2, 3]}, template,
@@ -986,14 +985,14 @@ class TestSdk(unittest.TestCase):
                         'headers': {'a': 'b'},
                         'host': 'localhost',
                         'method': 'get',
-                        'nonrecoverable_response': [['object']],
+                        'nonrecoverable_response': [['object', '20']],
                         'path': '/xml',
                         'payload': [1, 2, 3],
                         'payload_format': 'raw',
                         'port': -1,
-                        'response_expectation': [['object']],
+                        'response_expectation': [['object', '10']],
                         'response_format': 'xml',
-                        'response_translation': {'object': []},
+                        'response_translation': {'object': ['object_id']},
                         'ssl': True,
                         'verify': False
                     }],
@@ -1044,7 +1043,7 @@ class TestSdk(unittest.TestCase):
         response.cookies.get_dict = mock.Mock(return_value={'a': 'b'})
         request = mock.Mock(return_value=response)
         with mock.patch(
-            "nativeedge_rest_sdk.utility.requests.request", request
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
         ):
             self.assertEqual(
                 utility.process({}, template, {}),
@@ -1053,17 +1052,17 @@ class TestSdk(unittest.TestCase):
                         'headers': {'a': 'b'},
                         'host': 'localhost',
                         'method': 'get',
-                        'nonrecoverable_response': [['object']],
+                        'nonrecoverable_response': [['object', '20']],
                         'path': '/xml',
                         'payload': {
                             'object': 11
                         },
                         'payload_format': 'urlencoded',
                         'port': -1,
-                        'response_expectation': [['object']],
+                        'response_expectation': [['object', '10']],
                         'response_format': 'xml',
-                        'response_translation': {'object': []},
-                        'cookies_translation': {'a': []},
+                        'response_translation': {'object': ['object_id']},
+                        'cookies_translation': {'a': ['a']},
                         'ssl': True,
                         'verify': False
                     }],
@@ -1083,6 +1082,367 @@ class TestSdk(unittest.TestCase):
                                    timeout=None,
                                    verify=False)
 
+    def test_compiled_template_cache(self):
+        utility.clear_template_cache()
+        template = """
+            rest_calls:
+            - path: "/{{ object_id }}"
+              method: get
+              host: localhost
+              port: -1
+              ssl: false"""
+        with mock.patch(
+            "nativeedge_rest_sdk.utility.yaml.safe_load",
+            mock.Mock(wraps=utility.yaml.safe_load)
+        ) as safe_load:
+            compiled = utility.get_compiled_template(template)
+            self.assertIs(utility.get_compiled_template(template), compiled)
+            self.assertEqual(safe_load.call_count, 1)
+        self.assertIsNot(
+            utility.get_compiled_template(template, prerender=True),
+            compiled)
+        self.assertEqual(compiled.render_call(0, {'object_id': 10}), {
+            'path': '/10',
+            'method': 'get',
+            'host': 'localhost',
+            'port': -1,
+            'ssl': False})
+        # rendered calls are independent from cached one
+        self.assertIsNot(compiled.render_call(0, {'object_id': 10}),
+                         compiled.rest_calls[0])
+
+        # lru eviction
+        with mock.patch.object(utility._template_cache, 'max_size', 2):
+            utility.clear_template_cache()
+            first = utility.get_compiled_template("rest_calls: []")
+            utility.get_compiled_template(template)
+            # touch first template, so second one is evicted
+            utility.get_compiled_template("rest_calls: []")
+            utility.get_compiled_template("")
+            self.assertIs(
+                utility.get_compiled_template("rest_calls: []"), first)
+            self.assertIsNot(
+                utility.get_compiled_template(template), compiled)
+        utility.clear_template_cache()
+
+    def test_compiled_template_dependencies(self):
+        template = """
+            rest_calls:
+            - path: "/users"
+              method: get
+              host: localhost
+              port: -1
+              ssl: false
+              response_translation:
+                id: [user_id]
+            - path: "/groups"
+              method: get
+              host: localhost
+              port: -1
+              ssl: false
+              response_translation: [[['id'], ['group_id']]]
+            - path: "/users/{{ user_id }}"
+              method: get
+              host: localhost
+              port: -1
+              ssl: false
+              response_format: text
+            - path: "/{{ text }}/{{ group_id }}"
+              method: get
+              host: localhost
+              port: -1
+              ssl: false
+              response_translation:
+                "{{ name }}": [other]
+            - path: "/last"
+              method: get
+              host: localhost
+              port: -1
+              ssl: false"""
+        compiled = utility.CompiledTemplate(template)
+        self.assertEqual(compiled.dependencies,
+                         [set(), set(), {0}, {1, 2}, {3}])
+
+    def test_process_parallel(self):
+        template = rest_template(
+            {'path': '/a', 'response_translation': [[['id'], ['a']]]},
+            {'path': '/b', 'response_translation': [[['id'], ['b']]]},
+            {'path': '/{{ a }}{{ b }}',
+             'response_translation': [[['id'], ['a']]]})
+
+        def _fake_request(method, url, **kwargs):
+            return fake_response({'id': url.split('/')[-1] + '1'})
+
+        request = mock.Mock(side_effect=_fake_request)
+        with patch_request(request):
+            result = utility.process({}, template, {}, concurrency=4)
+        self.assertEqual(result['result_properties'],
+                         {'a': 'a1b11', 'b': 'b1'})
+        self.assertEqual([call['path'] for call in result['calls']],
+                         ['/a', '/b', '/a1b1'])
+        self.assertEqual(request.call_count, 3)
+
+        # failed call stops processing
+        request = mock.Mock(
+            side_effect=utility.requests.exceptions.ConnectionError('fail'))
+        with patch_request(request):
+            with self.assertRaises(
+                utility.requests.exceptions.ConnectionError
+            ):
+                utility.process({}, template, {}, concurrency=4)
+        # third call depends on failed one, so it is never sent
+        self.assertLessEqual(request.call_count, 2)
+
+    def test_send_request_hosts(self):
+        utility.get_host_health().clear()
+        call = {
+            'ssl': False,
+            'path': "/",
+            'method': 'get',
+            'hosts': ['a', 'b', 'c'],
+            'port': 80,
+        }
+        response = mock.Mock()
+        response.status_code = 200
+
+        def _fake_request(method, url, **kwargs):
+            if url.startswith('http://a:'):
+                raise utility.requests.exceptions.ConnectionError('down')
+            return response
+
+        request = mock.Mock(side_effect=_fake_request)
+        with mock.patch(
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
+        ):
+            self.assertEqual(utility._send_request(call), response)
+            # stop on first available host
+            self.assertEqual(
+                [args[0][1] for args in request.call_args_list],
+                ['http://a:80/', 'http://b:80/'])
+            # failed host is moved to the end of the list
+            request.reset_mock()
+            self.assertEqual(utility._send_request(call), response)
+            self.assertEqual(
+                [args[0][1] for args in request.call_args_list],
+                ['http://b:80/'])
+        utility.get_host_health().clear()
+
+    def test_send_request_hedged(self):
+        utility.get_host_health().clear()
+        call = {
+            'ssl': False,
+            'path': "/",
+            'method': 'get',
+            'hosts': ['slow', 'fast'],
+            'port': 80,
+            'hedged_requests': True,
+            'hedge_delay': 0.01,
+        }
+        slow_response = mock.Mock()
+        fast_response = mock.Mock()
+        fast_response.status_code = 200
+        slow_done = utility.threading.Event()
+
+        def _fake_request(method, url, **kwargs):
+            if url.startswith('http://slow:'):
+                slow_done.wait(5)
+                return slow_response
+            return fast_response
+
+        request = mock.Mock(side_effect=_fake_request)
+        with mock.patch(
+            "nativeedge_rest_sdk.utility.requests.Session.request", request
+        ):
+            self.assertEqual(utility._send_request(call), fast_response)
+            slow_done.set()
+        self.assertEqual(request.call_count, 2)
+        # only idempotent methods are hedged
+        call['method'] = 'post'
+        self.assertFalse(utility._can_hedge(call, call['hosts']))
+        call['method'] = 'get'
+        self.assertTrue(utility._can_hedge(call, call['hosts']))
+        self.assertFalse(utility._can_hedge(call, ['one']))
+        utility.get_host_health().clear()
+
+    def test_send_request_hedged_errors(self):
+        utility.get_host_health().clear()
+        self.addCleanup(utility.get_host_health().clear)
+        call = {
+            'ssl': False,
+            'path': "/",
+            'method': 'get',
+            'hosts': ['slow', 'fast'],
+            'port': 80,
+            'hedged_requests': True,
+            'hedge_delay': 0.01,
+        }
+        fast_response = mock.Mock()
+        hedged = threading.Event()
+        errors = {
+            'slow': utility.requests.exceptions.ReadTimeout('timeout'),
+        }
+
+        def _fake_request(method, url, **kwargs):
+            if url.startswith('http://slow:'):
+                hedged.wait(5)
+                raise errors['slow']
+            hedged.set()
+            if 'fast' in errors:
+                time.sleep(0.1)
+                raise errors['fast']
+            return fast_response
+
+        # error of first host is not returned if second host answers
+        request = mock.Mock(side_effect=_fake_request)
+        with patch_request(request):
+            self.assertEqual(utility._send_request(call), fast_response)
+
+        # both failed, error other than connection error is raised
+        hedged.clear()
+        errors['fast'] = utility.requests.exceptions.ConnectionError('down')
+        with patch_request(request):
+            with self.assertRaises(utility.requests.exceptions.ReadTimeout):
+                utility._send_request(call)
+
+        # unexpected error, response of other host is closed
+        utility.get_host_health().clear()
+        hedged.clear()
+        errors['slow'] = ValueError('unexpected')
+        del errors['fast']
+        fast_done = threading.Event()
+        fast_response.close.side_effect = fast_done.set
+
+        def _slow_fast_request(method, url, **kwargs):
+            if url.startswith('http://fast:'):
+                hedged.set()
+                time.sleep(0.1)
+                return fast_response
+            hedged.wait(5)
+            raise errors['slow']
+
+        with patch_request(mock.Mock(side_effect=_slow_fast_request)):
+            with self.assertRaises(ValueError):
+                utility._send_request(call)
+        self.assertTrue(fast_done.wait(5))
+
+    def test_process_logs_are_lazy(self):
+        template = rest_template({
+            'path': '/',
+            'auth': {'user': 'admin', 'password': 'secret'},
+            'response_expectation': [['id', '10']],
+            'response_translation': [[['id'], ['id']]]})
+        request = mock.Mock(return_value=fake_response({'id': 10}))
+        previous_level = utility.logger.level
+        utility.logger.setLevel(utility.logging.WARNING)
+        try:
+            with patch_request(request):
+                with mock.patch(
+                    "nativeedge_common_sdk.filters.obfuscate_passwords"
+                ) as obfuscate:
+                    self.assertEqual(
+                        utility.process({}, template, {})[
+                            'result_properties'], {'id': 10})
+            obfuscate.assert_not_called()
+        finally:
+            utility.logger.setLevel(previous_level)
+
+    def test_process_many(self):
+        template = rest_template({
+            'path': '/{{ port }}',
+            'response_translation': [[['id'], ['id']]]})
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def _fake_request(method, url, **kwargs):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            port = url.split('/')[-1]
+            if port == 'bad':
+                raise utility.requests.exceptions.ConnectionError('fail')
+            return fake_response({'id': port})
+
+        request = mock.Mock(side_effect=_fake_request)
+        utility.clear_template_cache()
+        with patch_request(request):
+            with mock.patch.object(
+                utility, 'CompiledTemplate',
+                mock.Mock(side_effect=utility.CompiledTemplate)
+            ) as compiled:
+                results = utility.process_many(
+                    ({'port': str(port)} for port in range(20)),
+                    template, {}, concurrency=3)
+                self.assertEqual(
+                    [result['result_properties']['id']
+                     for result in results],
+                    [str(port) for port in range(20)])
+            compiled.assert_called_once_with(template, False)
+            self.assertLessEqual(running[1], 3)
+            self.assertEqual(request.call_count, 20)
+
+            results = list(utility.process_many(
+                [{'port': 'a'}, {'port': 'bad'}, {'port': 'b'}],
+                template, {}, concurrency=2, return_exceptions=True))
+            self.assertEqual(results[0]['result_properties'], {'id': 'a'})
+            self.assertIsInstance(
+                results[1], utility.requests.exceptions.ConnectionError)
+            self.assertEqual(results[2]['result_properties'], {'id': 'b'})
+
+            with self.assertRaises(
+                utility.requests.exceptions.ConnectionError
+            ):
+                list(utility.process_many(
+                    [{'port': 'bad'}, {'port': 'b'}], template, {}))
+
+    def test_process_retry(self):
+        template = rest_template(
+            {'path': '/token', 'response_translation': [[['id'], ['token']]]},
+            {'path': '/job/{{ token }}',
+             'recoverable_codes': [503],
+             'response_expectation': [['status', 'done']],
+             'response_translation': [[['status'], ['status']]],
+             'retry': {'attempts': 4, 'jitter': False}})
+        responses = {
+            '/token': [(200, {}, {'id': 'a'})],
+            '/job/a': [(503, {'Retry-After': '7'}, {}),
+                       (200, {}, {'status': 'running'}),
+                       (200, {}, {'status': 'done'})],
+        }
+
+        def _fake_request(method, url, **kwargs):
+            status_code, headers, body = \
+                responses[url.split(':80')[-1]].pop(0)
+            response = fake_response(body, status_code, headers)
+            if status_code >= 400:
+                response.raise_for_status = mock.Mock(
+                    side_effect=utility.requests.exceptions.HTTPError())
+            return response
+
+        request = mock.Mock(side_effect=_fake_request)
+        with patch_request(request):
+            with mock.patch("nativeedge_rest_sdk.utility.time.sleep") as sleep:
+                result = utility.process({}, template, {})
+        self.assertEqual(result['result_properties'],
+                         {'token': 'a', 'status': 'done'})
+        # only failed call is sent again
+        self.assertEqual(request.call_count, 4)
+        self.assertEqual(sleep.call_args_list,
+                         [mock.call(7), mock.call(2)])
+
+        # no more attempts
+        responses['/token'] = [(200, {}, {'id': 'a'})]
+        responses['/job/a'] = [(200, {}, {'status': 'running'})] * 4
+        with patch_request(request):
+            with mock.patch("nativeedge_rest_sdk.utility.time.sleep"):
+                with self.assertRaises(
+                    exceptions.RecoverableResponseException
+                ):
+                    utility.process({}, template, {}, concurrency=2)
+        self.assertEqual(responses['/job/a'], [])
+
 
 if __name__ == '__main__':
     unittest.main()
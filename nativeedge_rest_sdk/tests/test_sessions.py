@@ -0,0 +1,76 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import unittest
+import mock
+
+from plugins_rest_sdk import sessions
+
+
+class TestSessions(unittest.TestCase):
+
+    def test_reuse_session(self):
+        pool = sessions.SessionPool()
+        session = pool.get('https', 'localhost', 443, verify=False)
+        self.assertIs(
+            pool.get('https', 'localhost', 443, verify=False), session)
+        # different tls settings use different session
+        self.assertIsNot(
+            pool.get('https', 'localhost', 443, verify=True), session)
+        self.assertIsNot(
+            pool.get('https', 'localhost', 443, verify=False,
+                     proxies={'https': 'http://proxy:3128'}),
+            session)
+        self.assertEqual(len(pool), 3)
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+
+    def test_max_sessions(self):
+        pool = sessions.SessionPool(max_sessions=2)
+        first = pool.get('http', 'a', 80)
+        second = pool.get('http', 'b', 80)
+        # touch first session, so second one is evicted
+        pool.get('http', 'a', 80)
+        with mock.patch.object(second, 'close') as close:
+            pool.get('http', 'c', 80)
+        close.assert_called_once_with()
+        self.assertEqual(len(pool), 2)
+        self.assertIs(pool.get('http', 'a', 80), first)
+        self.assertIsNot(pool.get('http', 'b', 80), second)
+
+    def test_idle_timeout(self):
+        pool = sessions.SessionPool(idle_timeout=10)
+        with mock.patch('nativeedge_rest_sdk.sessions.time.time',
+                        mock.Mock(return_value=100)):
+            session = pool.get('http', 'a', 80)
+        with mock.patch('nativeedge_rest_sdk.sessions.time.time',
+                        mock.Mock(return_value=105)):
+            self.assertIs(pool.get('http', 'a', 80), session)
+        with mock.patch('nativeedge_rest_sdk.sessions.time.time',
+                        mock.Mock(return_value=200)):
+            with mock.patch.object(session, 'close') as close:
+                self.assertIsNot(pool.get('http', 'a', 80), session)
+        close.assert_called_once_with()
+
+    def test_cookies_not_stored(self):
+        session = sessions.SessionPool().create_session()
+        cookie = sessions.requests.cookies.create_cookie('a', 'b')
+        self.assertFalse(
+            session.cookies.get_policy().set_ok(cookie, mock.Mock()))
+
+    def test_configure_session_pool(self):
+        pool = sessions.get_session_pool()
+        limits = (pool.max_sessions, pool.pool_maxsize, pool.idle_timeout)
+        try:
+            self.assertIs(
+                sessions.configure_session_pool(max_sessions=1,
+                                                idle_timeout=5),
+                pool)
+            self.assertEqual(pool.max_sessions, 1)
+            self.assertEqual(pool.idle_timeout, 5)
+            self.assertEqual(pool.pool_maxsize, limits[1])
+        finally:
+            sessions.configure_session_pool(*limits)
+
+
+if __name__ == '__main__':
+    unittest.main()
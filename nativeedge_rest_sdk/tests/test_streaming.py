@@ -0,0 +1,152 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import json
+import mock
+import unittest
+
+from plugins_rest_sdk import streaming, utility
+from nativeedge_rest_sdk.tests.helpers import fake_response
+
+
+class TestStreaming(unittest.TestCase):
+
+    document = {
+        "id": 10,
+        "payload": {
+            "pages": [
+                {"page_name": "marvin", "color": "blue", "size": 1.5},
+                {"page_name": "cool_wool", "color": "red", "size": 2.5}
+            ],
+            "unused": {"a": [1, 2, {"b": None}]}
+        },
+        "items": ["a", "b", "c", "d"],
+        "status": "Success"
+    }
+
+    def _load(self, call):
+        body = json.dumps(self.document).encode()
+        paths = streaming.compile_response_paths(call)
+        return streaming.load_json(fake_response(content=body), paths)
+
+    def test_load_json_v1(self):
+        self.assertEqual(self._load({
+            'response_translation': {
+                'id': ['id'],
+                'items': [{}, {}, ['third']]
+            }
+        }), ({'id': 10, 'items': [None, None, 'c']}, False))
+
+    def test_load_json_v2(self):
+        self.assertEqual(self._load({
+            'response_translation': [
+                [['payload', 'pages', ['page_name']], ['pages', ['name']]]
+            ],
+            'response_expectation': [['status', 'Success']]
+        }), ({
+            'payload': {
+                'pages': [{'page_name': 'marvin'},
+                          {'page_name': 'cool_wool'}]
+            },
+            'status': 'Success'
+        }, False))
+
+    def test_load_json_v3(self):
+        self.assertEqual(self._load({
+            'translation_format': 'v3',
+            'response_translation': {
+                'size': ['payload', 'pages', '1', 'size'],
+                'last': ['items', '-1'],
+                'unused': ['payload', 'unused'],
+            }
+        }), ({
+            'payload': {
+                'pages': [None, {'size': 2.5}],
+                'unused': {"a": [1, 2, {"b": None}]}
+            },
+            'items': ["a", "b", "c", "d"]
+        }, False))
+
+    def test_load_json_empty(self):
+        paths = streaming.compile_response_paths(
+            {'response_translation': {'id': ['id']}})
+        self.assertEqual(
+            streaming.load_json(fake_response(content=b'{}'), paths),
+            ({}, True))
+        self.assertEqual(
+            streaming.load_json(fake_response(content=b'{"a": 1}'), paths),
+            ({}, False))
+        self.assertIsNone(streaming.compile_response_paths({}))
+
+    def test_process_response_streaming(self):
+        call = {
+            'response_streaming': True,
+            'response_translation': [
+                [['payload', 'pages', ['page_name']], ['pages', ['name']]]
+            ],
+            'translation_format': 'v2',
+            'nonrecoverable_response': [['status', 'Failed']],
+        }
+        response = fake_response(content=json.dumps(self.document).encode())
+        store_props = {}
+        utility._process_response(response, call, store_props)
+        self.assertEqual(store_props, {
+            'pages': [{'name': 'cool_wool'}, {'name': 'cool_wool'}]})
+        response.close.assert_called_once_with()
+
+    def test_process_response_streaming_xml(self):
+        call = {
+            'response_streaming': True,
+            'response_format': 'xml',
+            'response_translation': {'object': ['object_id']},
+        }
+        response = fake_response(content=b'<object>10</object>')
+        store_props = {}
+        utility._process_response(response, call, store_props)
+        self.assertEqual(store_props, {'object_id': '10'})
+
+    def test_load_xml(self):
+        body = (b'<root><status>ok</status><items>'
+                b'<item id="1" kind="a"><name>x</name><desc>d</desc></item>'
+                b'<item id="2"><name>y</name><cfg><mtu>1</mtu></cfg></item>'
+                b'<item id="3"><name>z</name></item>'
+                b'</items><unused><a>1</a></unused></root>')
+        paths = streaming.compile_response_paths({
+            'translation_format': 'v3',
+            'response_translation': {
+                'id': ['root', 'items', 'item', '1', '@id'],
+                'last': ['root', 'items', 'item', '2', 'name'],
+            },
+            'response_expectation': [['root', 'status', 'ok']]
+        })
+        # unused elements are skipped, first item keeps only placeholder
+        # of skipped attribute, so it is still not empty
+        self.assertEqual(
+            streaming.load_xml(fake_response(content=body), paths),
+            ({'root': {
+                'status': 'ok',
+                'items': {'item': [{'@id': None}, {'@id': '2'},
+                                   {'name': 'z'}]}}}, False))
+        # whole document without paths
+        document, _ = streaming.load_xml(fake_response(content=body))
+        self.assertEqual(document['root']['unused'], {'a': '1'})
+
+    def test_process_response_streaming_no_ijson(self):
+        call = {
+            'response_streaming': True,
+            'response_translation': {'id': ['id']},
+        }
+        with mock.patch.object(streaming, 'ijson', None), \
+                mock.patch.object(utility, '_ijson_warning_logged', False), \
+                mock.patch.object(utility, 'logger') as logger:
+            for _ in range(2):
+                store_props = {}
+                utility._process_response(
+                    fake_response(self.document), call, store_props)
+                self.assertEqual(store_props, {'id': 10})
+        # fallback is logged once, not for every response
+        logger.warning.assert_called_once_with(
+            'ijson is not installed, json responses are not streamed')
+
+
+if __name__ == '__main__':
+    unittest.main()
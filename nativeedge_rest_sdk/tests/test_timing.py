@@ -0,0 +1,77 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import mock
+import unittest
+
+from plugins_rest_sdk import sessions, timing, utility
+from nativeedge_rest_sdk.tests.helpers import (
+    fake_response, patch_request, rest_template)
+
+TEMPLATE = rest_template(
+    {'path': '/status',
+     'timing': True,
+     'response_translation': [[['status'], ['status']]]},
+    {'path': '/other'})
+
+
+def _fake_request(method, url, **kwargs):
+    timing.record_connect('connect', 0.5)
+    return fake_response({'status': 'running'})
+
+
+class TestTiming(unittest.TestCase):
+
+    def test_call_timing(self):
+        call_timing = timing.CallTiming()
+        with timing.measure(call_timing, 'parse'):
+            pass
+        with timing.measure(None, 'parse'):
+            pass
+        call_timing.add('render', 1.0)
+        call_timing.add_request(timing.RequestTiming(connect=1.0, tls=2.0))
+        call_timing.add_request(timing.RequestTiming(first_byte=3.0))
+        result = call_timing.as_dict()
+        self.assertGreaterEqual(result['parse'], 0)
+        self.assertEqual(result['requests'], 2)
+        self.assertEqual(result['tls'], 2.0)
+        self.assertEqual(result['total'], 7.0 + result['parse'])
+
+    def test_connect_timer(self):
+        # nothing recorded without timer
+        timing.record_connect('connect', 1.0)
+        self.assertEqual(timing.stop_connect_timer(), (0.0, 0.0))
+        timing.start_connect_timer()
+        timing.record_connect('connect', 1.0)
+        timing.record_connect('tls', 2.0)
+        timing.record_connect('connect', 1.0)
+        self.assertEqual(timing.stop_connect_timer(), (2.0, 2.0))
+
+    def test_adapter_pools(self):
+        adapter = sessions._SSLContextAdapter()
+        self.assertIs(
+            adapter.poolmanager.pool_classes_by_scheme['https'].ConnectionCls,
+            sessions._TimedHTTPSConnection)
+
+    def test_process(self):
+        hook = mock.Mock(side_effect=[None, Exception('metrics are down')])
+        timing.add_timing_hook(hook)
+        self.addCleanup(timing.remove_timing_hook, hook)
+        with patch_request(mock.Mock(side_effect=_fake_request)):
+            result = utility.process({}, TEMPLATE, {})
+        self.assertEqual(result['result_properties'], {'status': 'running'})
+        call_timing = result['calls'][0]['timing']
+        self.assertEqual(call_timing['connect'], 0.5)
+        self.assertEqual(call_timing['requests'], 1)
+        self.assertEqual(sorted(call_timing),
+                         sorted(timing.TIMING_PHASES + ['total', 'requests']))
+        # timing is not added to calls without flag
+        self.assertNotIn('timing', result['calls'][1])
+        # every call is reported to hook, failed hook is ignored
+        self.assertEqual(hook.call_count, 2)
+        self.assertEqual(hook.call_args_list[0][0],
+                         (result['calls'][0], call_timing))
+        self.assertEqual(hook.call_args[0][0]['path'], '/other')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# Copyright © 2024 Dell Inc. or its subsidiaries. All Rights Reserved.
+
+import time
+import logging
+import threading
+
+from nativeedge_rest_sdk import LOGGER_NAME
+
+logger = logging.getLogger(LOGGER_NAME)
+
+# phases of rest call, in seconds
+TIMING_PHASES = ['render', 'connect', 'tls', 'first_byte', 'download',
+                 'parse', 'translation']
+
+_hooks = []
+_hooks_lock = threading.Lock()
+_local = threading.local()
+
+
+class CallTiming(object):
+    """Seconds spent in each phase of rest call.
+
+    Network phases are summed for every request sent by call, so retries
+    and pages are included. Connect covers dns lookup and tcp connect,
+    it is zero when pooled connection is reused. For streamed responses
+    download is part of parse, as body is parsed while it is downloaded.
+    """
+
+    def __init__(self):
+        for phase in TIMING_PHASES:
+            setattr(self, phase, 0.0)
+        self.requests = 0
+
+    def add(self, phase, seconds):
+        setattr(self, phase, getattr(self, phase) + seconds)
+
+    def add_request(self, request_timing):
+        self.requests += 1
+        for phase in request_timing.PHASES:
+            self.add(phase, getattr(request_timing, phase))
+
+    def as_dict(self):
+        timing = dict((phase, getattr(self, phase))
+                      for phase in TIMING_PHASES)
+        timing['total'] = sum(timing.values())
+        timing['requests'] = self.requests
+        return timing
+
+
+class RequestTiming(object):
+    """Network phases of single request, saved with its response."""
+
+    PHASES = ['connect', 'tls', 'first_byte', 'download']
+
+    def __init__(self, connect=0.0, tls=0.0, first_byte=0.0, download=0.0):
+        self.connect = connect
+        self.tls = tls
+        self.first_byte = first_byte
+        self.download = download
+
+
+class _Measure(object):
+
+    def __init__(self, call_timing, phase):
+        self.call_timing = call_timing
+        self.phase = phase
+        self.start_time = None
+
+    def __enter__(self):
+        self.start_time = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.call_timing is not None:
+            self.call_timing.add(self.phase, time.time() - self.start_time)
+
+
+def measure(call_timing, phase):
+    """Context manager adding time of block to phase of call_timing,
+    call_timing can be None."""
+    return _Measure(call_timing, phase)
+
+
+def start_connect_timer():
+    """Collect connect time of connections opened by current thread."""
+    _local.connect = {'connect': 0.0, 'tls': 0.0}
+
+
+def stop_connect_timer():
+    """Return connect and tls seconds since start_connect_timer()."""
+    timer = getattr(_local, 'connect', None)
+    _local.connect = None
+    if timer is None:
+        return 0.0, 0.0
+    return timer['connect'], timer['tls']
+
+
+def record_connect(phase, seconds):
+    """Called by pooled connections, ignored if timer is not started."""
+    timer = getattr(_local, 'connect', None)
+    if timer is not None:
+        timer[phase] += seconds
+
+
+def add_timing_hook(hook):
+    """Register hook called with call and its timing dict after each
+    rest call is processed, e.g. to push timing to metrics."""
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_timing_hook(hook):
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def has_timing_hooks():
+    return bool(_hooks)
+
+
+def call_timing_hooks(call, timing):
+    with _hooks_lock:
+        hooks = list(_hooks)
+    for hook in hooks:
+        try:
+            hook(call, timing)
+        except Exception as e:
+            # metrics must never break rest call
+            logger.warning('Timing hook %r failed: %r', hook, e)
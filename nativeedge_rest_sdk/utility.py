@@ -3,178 +3,607 @@
 import os
 import re
 import ast
+import time
 import yaml
+import hashlib
 import logging
 import requests
-import tempfile
+import threading
 import xmltodict
+from datetime import timedelta
+from functools import partial
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from six import StringIO, string_types
 
 from nativeedge_rest_sdk import LOGGER_NAME
+from nativeedge_rest_sdk import streaming
+from nativeedge_rest_sdk import timing
+from nativeedge_rest_sdk.multipart import LocalFile, MultipartEncoder
+from nativeedge_rest_sdk.hosts import get_host_health
+from nativeedge_rest_sdk.certificates import get_certificate_store
+from nativeedge_rest_sdk.sessions import get_session_pool
+from nativeedge_rest_sdk.retry import RetryPolicy, parse_retry_after
+from nativeedge_rest_sdk.cache import CacheEntry, get_response_cache
+from nativeedge_rest_sdk.expectations import get_expectation_matcher
+from nativeedge_rest_sdk.compression import (
+    RequestCompression,
+    get_accept_encoding
+)
+from nativeedge_rest_sdk.pagination import (
+    Pagination,
+    merge_page,
+    merge_result
+)
 from plugins_sdk.filters import (
-    shorted_text,
-    render_template,
+    LazyLogText,
+    compile_template,
     translate_and_save,
-    obfuscate_passwords,
+    get_template_variables,
+    get_translation_result_keys,
 )
+from plugins_sdk.lru_cache import LRUCache
 from plugins_sdk.exceptions import (
-    ExpectationException,
     WrongTemplateDataException,
     RecoverableResponseException,
-    NonRecoverableResponseException,
     RecoverableStatusCodeCodeException,
 )
 
 logger = logging.getLogger(LOGGER_NAME)
 
 TEMPLATE_PROPERTY_RETRY_ON_CONNECTION_ERROR = 'retry_on_connection_error'
+TEMPLATE_PROPERTY_RESPONSE_STREAMING = 'response_streaming'
+TEMPLATE_PROPERTY_HEDGED_REQUESTS = 'hedged_requests'
+TEMPLATE_PROPERTY_RETRY = 'retry'
+TEMPLATE_PROPERTY_PAGINATION = 'pagination'
+TEMPLATE_PROPERTY_RESPONSE_CACHE = 'response_cache'
+TEMPLATE_PROPERTY_FILES_STREAMING = 'files_streaming'
+TEMPLATE_PROPERTY_FILES_CHUNKED = 'files_chunked'
+TEMPLATE_PROPERTY_TIMING = 'timing'
+TEMPLATE_PROPERTY_REQUEST_COMPRESSION = 'request_compression'
+TEMPLATE_PROPERTY_RESPONSE_COMPRESSION = 'response_compression'
+TRANSLATION_FIELDS = [
+    'header_translation', 'cookies_translation', 'response_translation']
+
+# only requests safe to send twice are hedged
+HEDGED_METHODS = ['GET', 'HEAD', 'OPTIONS']
+# methods with result saved by response_cache
+CACHED_METHODS = ['GET']
+# latency percentile of first host to wait before hedged request is sent
+DEFAULT_HEDGE_PERCENTILE = 95
+# seconds to wait before hedged request if host has no latency stats
+DEFAULT_HEDGE_DELAY = 1
+HEDGE_MAX_WORKERS = 16
+
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+# count of compiled templates kept in memory by process()
+TEMPLATE_CACHE_SIZE = 128
+
+_template_cache = LRUCache(TEMPLATE_CACHE_SIZE)
+# json responses are not streamed without ijson, it is logged only once
+_ijson_warning_logged = False
+
+
+class CompiledTemplate(object):
+    """Template parsed once and reused by every process() call.
+
+    Without prerender the yaml is parsed here and each rest call is
+    converted to a precompiled Jinja template, so later invocations only
+    render. With prerender the rest calls depend on params, so only the
+    whole template text can be compiled.
+    """
+
+    def __init__(self, template, prerender=False):
+        self.prerender = prerender
+        self.rest_calls = []
+        self.call_sources = []
+        self.call_templates = []
+        self._dependencies = None
+        if prerender:
+            self.template = compile_template(template)
+            return
+        self.template = None
+        template_yaml = yaml.safe_load(template)
+        if not template_yaml or not template_yaml.get('rest_calls'):
+            return
+        self.rest_calls = template_yaml['rest_calls']
+        for call in self.rest_calls:
+            call = "{0}".format(call)
+            # Remove quotation marks before and after jinja blocks
+            call = re.sub(r'\'\{\%', '{%', call)
+            call = re.sub(r'\%\}\'', '%}', call)
+            self.call_sources.append(call)
+            self.call_templates.append(compile_template(call))
+
+    def get_rest_calls(self, params):
+        if not self.prerender:
+            return self.rest_calls
+        template_yaml = yaml.safe_load(self.template.render(params))
+        if not template_yaml or not template_yaml.get('rest_calls'):
+            return []
+        return template_yaml['rest_calls']
+
+    def render_call(self, idx, params):
+        rendered_call = self.call_templates[idx].render(params)
+        return ast.literal_eval(rendered_call)
+
+    @property
+    def dependencies(self):
+        """Indexes of previous calls required by each call.
+
+        Call depends on a previous call if its template references any
+        result property stored by that call, or if stored properties of
+        previous call can't be detected before render.
+        """
+        if self._dependencies is None:
+            dependencies = []
+            result_keys = []
+            for idx, source in enumerate(self.call_sources):
+                variables = get_template_variables(source)
+                dependencies.append(set(
+                    prev_idx for prev_idx, keys in enumerate(result_keys)
+                    if keys is None or keys & variables))
+                result_keys.append(
+                    _get_call_result_keys(self.rest_calls[idx]))
+            self._dependencies = dependencies
+        return self._dependencies
+
+
+def _has_jinja(value):
+    if isinstance(value, dict):
+        return any(_has_jinja(k) or _has_jinja(v) for k, v in value.items())
+    if isinstance(value, list):
+        return any(_has_jinja(v) for v in value)
+    return isinstance(value, string_types) and \
+        ('{{' in value or '{%' in value)
+
+
+def _get_call_result_keys(call):
+    """Keys stored to result_properties by call, None if unknown."""
+    if not isinstance(call, dict):
+        return None
+    fields = TRANSLATION_FIELDS + ['translation_format', 'response_format']
+    if _has_jinja([call.get(field) for field in fields]):
+        return None
+    keys = set()
+    response_format = call.get('response_format', 'auto')
+    if not isinstance(response_format, string_types):
+        return None
+    if response_format.lower() == 'text':
+        keys.add('text')
+    translation_version = call.get('translation_format', 'auto')
+    for field in TRANSLATION_FIELDS:
+        field_keys = get_translation_result_keys(call.get(field),
+                                                 translation_version)
+        if field_keys is None:
+            return None
+        keys |= field_keys
+    return keys
+
+
+def get_compiled_template(template, prerender=False):
+    """Return compiled template from cache or compile and store it."""
+    key = (hashlib.sha256(template.encode()).hexdigest(), prerender)
+    return _template_cache.get_or_create(
+        key, lambda: CompiledTemplate(template, prerender))
+
+
+def clear_template_cache():
+    _template_cache.clear()
 
 
 #  request_props (port, ssl, verify, hosts )
 def process(params, template, request_props, prerender=False,
-            resource_callback=False):
-    logger.info(
-        'Template:\n{}'.format(shorted_text(obfuscate_passwords(template))))
-    if prerender:
-        rendered_call = render_template(template, params)
-        template_yaml = yaml.safe_load(rendered_call)
-    else:
-        template_yaml = yaml.safe_load(template)
-    result_properties = {}
-    calls = []
-    if not template_yaml or not template_yaml.get('rest_calls'):
+            resource_callback=False, session_pool=None, concurrency=1,
+            resource_path_callback=None):
+    """Run rest calls from template.
+
+    :param concurrency: count of rest calls sent in parallel. A call is
+        sent once every previous call whose result properties it
+        references is processed. Responses are processed in template
+        order, so result properties are the same as in sequential run.
+    :param resource_path_callback: returns local path of resource, used
+        for files_raw of calls with files_streaming, so file is read
+        from disk in chunks instead of being loaded to memory.
+
+    Calls with timing property get timing record in calls of result,
+    timing of every call is also passed to hooks registered by
+    timing.add_timing_hook().
+    """
+    logger.info('Template:\n%s', LazyLogText(template))
+    compiled = get_compiled_template(template, prerender)
+    resource_callback = _get_resource_loader(resource_callback,
+                                             resource_path_callback)
+    return _process_compiled(compiled, params, request_props, prerender,
+                             resource_callback, session_pool, concurrency)
+
+
+def process_many(params_iterable, template, request_props, prerender=False,
+                 resource_callback=False, session_pool=None, concurrency=1,
+                 return_exceptions=False, resource_path_callback=None):
+    """Run rest calls from template for each item of params_iterable.
+
+    Template is compiled once and parameter sets are processed by
+    concurrency threads. Results are yielded in order of params, each
+    one same as result of process() for these params.
+
+    :param return_exceptions: yield exception raised for parameter set
+        instead of stopping, other parameter sets are still processed.
+    :param resource_path_callback: same as for process().
+    """
+    logger.info('Template:\n%s', LazyLogText(template))
+    compiled = get_compiled_template(template, prerender)
+    session_pool = session_pool or get_session_pool()
+    resource_callback = _get_resource_loader(resource_callback,
+                                             resource_path_callback)
+    if concurrency <= 1:
+        for params in params_iterable:
+            try:
+                yield _process_compiled(compiled, params, request_props,
+                                        prerender, resource_callback,
+                                        session_pool, 1)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                yield e
+        return
+
+    # keep workers busy while first result in queue is waited for
+    window = concurrency * 2
+    pending = deque()
+    params_iterator = iter(params_iterable)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        while True:
+            for params in params_iterator:
+                pending.append(executor.submit(
+                    _process_compiled, compiled, params, request_props,
+                    prerender, resource_callback, session_pool, 1))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+            future = pending.popleft()
+            try:
+                result = future.result()
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                result = e
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+class _ResourceLoader(object):
+    """Resource callback with path callback, passed through call
+    processing as single callable. It is false without resource
+    callback, so raw payload is skipped same as without path callback,
+    but raw files can still be streamed from paths."""
+
+    def __init__(self, resource_callback, resource_path_callback):
+        self.resource_callback = resource_callback
+        self.get_path = resource_path_callback
+
+    def __bool__(self):
+        return bool(self.resource_callback)
+
+    def __call__(self, name):
+        return self.resource_callback(name)
+
+
+def _get_resource_loader(resource_callback, resource_path_callback):
+    if not resource_path_callback:
+        return resource_callback
+    return _ResourceLoader(resource_callback, resource_path_callback)
+
+
+def _process_compiled(compiled, params, request_props, prerender,
+                      resource_callback, session_pool, concurrency):
+    rest_calls = compiled.get_rest_calls(params)
+    if not rest_calls:
         logger.debug('Empty call list')
         return {}
 
-    for call in template_yaml['rest_calls']:
-        call_with_request_props = request_props.copy()
-        logger.debug(
-            'Call: {}'.format(shorted_text(obfuscate_passwords(call))))
-        # enrich params with items stored in runtime props by prev calls
-        params.update(result_properties)
-        if not prerender:
-            call = "{0}".format(call)
-            # Remove quotation marks before and after jinja blocks
-            call = re.sub(r'\'\{\%', '{%', call)
-            call = re.sub(r'\%\}\'', '%}', call)
-            rendered_call = render_template(call, params)
-            call = ast.literal_eval(rendered_call)
-        calls.append(call)
-        logger.debug('Rendered call: {}'.format(
-            shorted_text(obfuscate_passwords(call))))
-        call_with_request_props.update(call)
-
-        # client/server side certification check
-        file_to_remove = []
-        for field in ['verify', 'cert']:
-            if isinstance(call_with_request_props.get(field), string_types):
-                if not os.path.isfile(call_with_request_props.get(field)):
-                    fd, destination = tempfile.mkstemp()
-                    os.write(fd, call_with_request_props.get(field).encode())
-                    os.close(fd)
-                    # replace to path to content
-                    call_with_request_props[field] = destination
-                    file_to_remove.append(destination)
-
-        # run requests
-        try:
-            response = _send_request(call_with_request_props,
-                                     resource_callback=resource_callback)
-        finally:
-            for path in file_to_remove:
-                try:
-                    os.remove(path)
-                except Exception as e:
-                    logger.debug(
-                        'Cant remove temporary file {path}: {error}'
-                        .format(path=path, error=repr(e))
-                    )
-        _process_response(response, call, result_properties)
+    if concurrency > 1 and len(rest_calls) > 1:
+        calls, result_properties = _process_parallel(
+            compiled, rest_calls, params, request_props, prerender,
+            resource_callback, session_pool, concurrency)
+    else:
+        result_properties = {}
+        calls = []
+        for idx, call in enumerate(rest_calls):
+            call_timing = timing.CallTiming()
+            with timing.measure(call_timing, 'render'):
+                call = _render_call(compiled, idx, call, params,
+                                    result_properties, prerender)
+            calls.append(call)
+            _complete_call(call, partial(_run_call, call, request_props,
+                                         resource_callback, session_pool),
+                           request_props, resource_callback, session_pool,
+                           result_properties, call_timing)
     result_properties = {'result_properties': result_properties,
                          'calls': calls}
     return result_properties
 
 
-def _send_request(call, resource_callback=None):
-    logger.debug(
-        'Request props: {}'.format(shorted_text(obfuscate_passwords(call))))
+def _process_parallel(compiled, rest_calls, params, request_props,
+                      prerender, resource_callback, session_pool,
+                      concurrency):
+    if prerender:
+        # everything is rendered before first call
+        dependencies = [set() for _ in rest_calls]
+    else:
+        dependencies = compiled.dependencies
+    result_properties = {}
+    calls = [None] * len(rest_calls)
+    call_timings = [timing.CallTiming() for _ in rest_calls]
+    futures = {}
+    processed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            while processed < len(rest_calls):
+                for idx, call in enumerate(rest_calls):
+                    if idx in futures or \
+                            max(dependencies[idx], default=-1) >= processed:
+                        continue
+                    logger.debug('Submit call %s', idx)
+                    with timing.measure(call_timings[idx], 'render'):
+                        calls[idx] = _render_call(
+                            compiled, idx, call, params, result_properties,
+                            prerender)
+                    futures[idx] = executor.submit(
+                        _run_call, calls[idx], request_props,
+                        resource_callback, session_pool)
+                _complete_call(calls[processed], futures[processed].result,
+                               request_props, resource_callback,
+                               session_pool, result_properties,
+                               call_timings[processed])
+                processed += 1
+        except Exception:
+            for future in futures.values():
+                future.cancel()
+            raise
+    return calls, result_properties
+
+
+def _complete_call(call, get_response, request_props, resource_callback,
+                   session_pool, result_properties, call_timing=None):
+    """Process response of call and report its timing."""
+    _complete_pages(call, get_response, request_props, resource_callback,
+                    session_pool, result_properties, call_timing)
+    if call_timing is None:
+        return
+    call_timing = call_timing.as_dict()
+    if call.get(TEMPLATE_PROPERTY_TIMING,
+                request_props.get(TEMPLATE_PROPERTY_TIMING)):
+        # flag is replaced by timing record in calls of result
+        call[TEMPLATE_PROPERTY_TIMING] = call_timing
+    timing.call_timing_hooks(call, call_timing)
+
+
+def _complete_pages(call, get_response, request_props, resource_callback,
+                    session_pool, result_properties, call_timing):
+    """Process response of call, next pages of paginated call are
+    requested and processed one by one."""
+    pagination = Pagination.from_call(
+        call.get(TEMPLATE_PROPERTY_PAGINATION))
+    if pagination is None:
+        _complete_request(call, get_response, request_props,
+                          resource_callback, session_pool, result_properties,
+                          call_timing)
+        return
+    # next page is sent to host from request props or link
+    base_call = request_props.copy()
+    base_call.update(call)
+    call_props = {}
+    pages = 1
+    while True:
+        page_props = {}
+        response, json = _complete_request(
+            call, get_response, request_props, resource_callback,
+            session_pool, page_props, call_timing)
+        # only translated items are kept from page
+        merge_page(call_props, page_props)
+        current_call = request_props.copy()
+        current_call.update(call)
+        next_call = pagination.get_next_call(
+            current_call, base_call, response, json)
+        if next_call is None:
+            break
+        if pages >= pagination.max_pages:
+            logger.warning('Pagination stopped after %s pages', pages)
+            break
+        pages += 1
+        call = next_call
+        logger.debug('Request page %s: %s', pages, LazyLogText(call))
+        get_response = partial(_run_call, call, request_props,
+                               resource_callback, session_pool)
+    merge_result(result_properties, call_props)
+
+
+def _complete_request(call, get_response, request_props, resource_callback,
+                      session_pool, store_props, call_timing=None):
+    """Process response of call, failed call is sent again by retry
+    policy of call. Result properties of previous calls are kept.
+
+    :return: response and parsed body.
+    """
+    policy = RetryPolicy.from_call(call.get(TEMPLATE_PROPERTY_RETRY))
+    cache_key = _get_cache_key(call, request_props)
+    if policy is None:
+        response, entry = _get_response(
+            get_response, cache_key, call, request_props, resource_callback,
+            session_pool)
+        _add_request_timing(call_timing, response)
+        return response, _process_cached_response(
+            response, entry, call, store_props, cache_key, call_timing)
+    start_time = time.time()
+    attempt = 0
+    while True:
+        response = None
+        try:
+            response, entry = _get_response(
+                get_response, cache_key, call, request_props,
+                resource_callback, session_pool)
+            _add_request_timing(call_timing, response)
+            return response, _process_cached_response(
+                response, entry, call, store_props, cache_key, call_timing)
+        except (RecoverableStatusCodeCodeException,
+                RecoverableResponseException) as e:
+            attempt += 1
+            retry_after = getattr(e, 'retry_after', None)
+            if retry_after is None and response is not None:
+                retry_after = parse_retry_after(
+                    response.headers.get('Retry-After'))
+            delay = policy.get_delay(attempt, time.time() - start_time,
+                                     retry_after)
+            if delay is None:
+                logger.debug('Call failed %s times, give up', attempt)
+                raise
+            logger.info('Attempt %s failed: %r, retry in %.2f seconds',
+                        attempt, e, delay)
+            time.sleep(delay)
+        get_response = partial(_run_call, call, request_props,
+                               resource_callback, session_pool)
+
+
+def _add_request_timing(call_timing, response):
+    request_timing = getattr(response, 'request_timing', None)
+    if call_timing is not None and \
+            isinstance(request_timing, timing.RequestTiming):
+        call_timing.add_request(request_timing)
+
+
+def _get_cache_key(call, request_props):
+    """Key of call in response cache, None if result is not cached."""
+    call_with_request_props = request_props.copy()
+    call_with_request_props.update(call)
+    if not call_with_request_props.get(TEMPLATE_PROPERTY_RESPONSE_CACHE) \
+            or call_with_request_props.get(TEMPLATE_PROPERTY_PAGINATION) \
+            or call_with_request_props.get('method', '').upper() \
+            not in CACHED_METHODS:
+        return None
+    return get_response_cache().get_key(call_with_request_props)
+
+
+def _get_response(get_response, cache_key, call, request_props,
+                  resource_callback, session_pool):
+    """Return response and cache entry to use instead of response."""
+    response = get_response()
+    if not cache_key or response.status_code != 304:
+        return response, None
+    entry = get_response_cache().get(cache_key)
+    if entry is None:
+        # result was removed from cache while request was sent
+        logger.debug('No cached result for not modified response')
+        response.close()
+        response = _run_call(call, request_props, resource_callback,
+                             session_pool)
+    return response, entry
+
+
+def _process_cached_response(response, entry, call, store_props,
+                             cache_key, call_timing=None):
+    if not cache_key:
+        return _process_response(response, call, store_props, call_timing)
+    if entry is not None:
+        logger.info('Response is not modified, cached result is used')
+        response.close()
+        merge_result(store_props, entry.get_result_properties())
+        return None
+    call_props = {}
+    json = _process_response(response, call, call_props, call_timing)
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        get_response_cache().set(
+            cache_key, CacheEntry(etag, last_modified, call_props))
+    else:
+        get_response_cache().remove(cache_key)
+    merge_result(store_props, call_props)
+    return json
+
+
+def _render_call(compiled, idx, call, params, result_properties, prerender):
+    logger.debug('Call: %s', LazyLogText(call))
+    # enrich params with items stored in runtime props by prev calls
+    params.update(result_properties)
+    if not prerender:
+        call = compiled.render_call(idx, params)
+    logger.debug('Rendered call: %s', LazyLogText(call))
+    return call
+
+
+def _run_call(call, request_props, resource_callback, session_pool):
+    call_with_request_props = request_props.copy()
+    call_with_request_props.update(call)
+
+    cache_key = _get_cache_key(call, request_props)
+    entry = get_response_cache().get(cache_key) if cache_key else None
+    if entry is not None:
+        # server sends 304 without body if result is not changed
+        headers = dict(call_with_request_props.get('headers') or {})
+        headers.update(entry.get_conditional_headers())
+        call_with_request_props['headers'] = headers
+
+    # client/server side certification check
+    certificate_store = get_certificate_store()
+    acquired_files = []
+    for field in ['verify', 'cert']:
+        if isinstance(call_with_request_props.get(field), string_types):
+            if not os.path.isfile(call_with_request_props.get(field)):
+                # replace to path to content, file is shared by calls
+                # with same content
+                destination = certificate_store.acquire(
+                    call_with_request_props.get(field))
+                call_with_request_props[field] = destination
+                acquired_files.append(destination)
+
+    # run requests
+    try:
+        return _send_request(call_with_request_props,
+                             resource_callback=resource_callback,
+                             session_pool=session_pool)
+    finally:
+        for path in acquired_files:
+            certificate_store.release(path)
+
+
+def _send_request(call, resource_callback=None, session_pool=None):
+    logger.debug('Request props: %s', LazyLogText(call))
     port = call['port']
     ssl = call['ssl']
     if port == -1:
         port = 443 if ssl else 80
     if not call.get('hosts', None):
         call['hosts'] = [call['host']]
-    for i, host in enumerate(call['hosts']):
-        full_url = '{}://{}:{}{}'.format('https' if ssl else 'http', host,
-                                         port,
-                                         call['path'])
-        logger.debug('Full url: {}'.format(repr(full_url)))
-        # check if payload can be used as json
-        payload_format = call.get('payload_format', 'json')
-        payload_data = call.get('payload', None)
-        # check that we have some raw payload
-        payload_raw = call.get('payload_raw', call.get('raw_payload'))
-        if resource_callback and payload_raw:
-            payload_data = resource_callback(payload_raw)
-        # url params
-        params = call.get('params', {})
-        # files magic
-        files_merged = {}
-        files = {}
-        files_raw = call.get("files_raw", call.get("raw_files", {}))
-        # add all raw files
-        for name in files_raw:
-            files_merged[name] = resource_callback(files_raw[name])
-        # add inline files
-        files_merged.update(call.get("files", {}))
-        logger.debug('Files merged: {files_merged}'
-                     .format(files_merged=shorted_text(files_merged)))
-        # convert files strcut to correct type
-        for name in files_merged:
-            if isinstance(files_merged[name], list):
-                # convert to correct struct
-                files[name] = tuple(files_merged[name])
-            elif isinstance(files_merged[name], string_types):
-                # send string as file
-                files[name] = StringIO(files_merged[name])
-            else:
-                # let's request decide about format
-                files[name] = files_merged[name]
-        logger.debug('Files: {files}'
-                     .format(files=shorted_text(files)))
-        # combine payloads and params
-        if payload_format == 'json':
-            json_payload = payload_data
-            data = None
-        elif payload_format == 'urlencoded' and isinstance(payload_data, dict):
-            json_payload = None
-            params.update(payload_data)
-            data = None
-        else:
-            json_payload = None
-            data = payload_data
-
-        # auth
-        if 'auth' not in call:
-            auth = None
-        else:
-            auth = (call['auth'].get('user'), call['auth'].get('password'))
-
-        # run request
+    session_pool = session_pool or get_session_pool()
+    scheme = 'https' if ssl else 'http'
+    host_health = get_host_health()
+    # try hosts with best recent latency and least failures first
+    hosts = [key[1] for key in host_health.order(
+        [(scheme, host, port) for host in call['hosts']])]
+    if _can_hedge(call, hosts):
+        # first attempt is hedged between two best hosts
+        host_groups = [hosts[:2]] + [[host] for host in hosts[2:]]
+    else:
+        host_groups = [[host] for host in hosts]
+    for i, group in enumerate(host_groups):
         try:
-            response = requests.request(call['method'], full_url,
-                                        auth=auth,
-                                        headers=call.get('headers', None),
-                                        verify=call.get('verify', True),
-                                        cert=call.get('cert', None),
-                                        proxies=call.get('proxies', None),
-                                        timeout=call.get('timeout', None),
-                                        json=json_payload,
-                                        params=params,
-                                        files=files if files else None,
-                                        data=data)
+            if len(group) > 1:
+                response = _send_hedged(session_pool, scheme, group, port,
+                                        call, resource_callback)
+            else:
+                response = _send_to_host(session_pool, scheme, group[0],
+                                         port, call, resource_callback)
         except requests.exceptions.ConnectionError as e:
-            logger.debug('ConnectionError for host: {}'.format(repr(host)))
+            logger.debug('ConnectionError for host: %r',
+                         group[0] if len(group) == 1 else group)
 
             if TEMPLATE_PROPERTY_RETRY_ON_CONNECTION_ERROR in call and \
                     call[TEMPLATE_PROPERTY_RETRY_ON_CONNECTION_ERROR]:
@@ -188,53 +617,305 @@ def _send_request(call, resource_callback=None):
                     )
                 )
 
-            if i == len(call['hosts']) - 1:
+            if i == len(host_groups) - 1:
                 logger.error('No host from list available')
                 raise
+        else:
+            break
 
-    logger.info('Response content: \n{}...'.format(
-        shorted_text(obfuscate_passwords(repr(response.content)))))
-    logger.info('Status code: {}'.format(repr(response.status_code)))
+    if call.get(TEMPLATE_PROPERTY_RESPONSE_STREAMING):
+        logger.info('Response content is streamed')
+    else:
+        logger.info('Response content: \n%s...',
+                    LazyLogText(response.content, use_repr=True))
+    logger.info('Status code: %r', response.status_code)
 
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError as e:
-        logger.debug(repr(e))
+        logger.debug('%r', e)
         if response.status_code in call.get('recoverable_codes', []):
             raise RecoverableStatusCodeCodeException(
                 'Response code {} defined as recoverable'.format(
-                    response.status_code))
+                    response.status_code),
+                retry_after=parse_retry_after(
+                    response.headers.get('Retry-After')))
         if response.status_code not in call.get('successful_codes', []):
             # code is not marked as successful
             raise
 
         # success?
-        logger.debug(
-            'Response code {} defined as successful.'.format(
-                response.status_code))
+        logger.debug('Response code %s defined as successful.',
+                     response.status_code)
+
+    return response
+
 
+def _get_request_kwargs(call, resource_callback):
+    # check if payload can be used as json
+    payload_format = call.get('payload_format', 'json')
+    payload_data = call.get('payload', None)
+    # check that we have some raw payload
+    payload_raw = call.get('payload_raw', call.get('raw_payload'))
+    if resource_callback and payload_raw:
+        payload_data = resource_callback(payload_raw)
+    # url params
+    params = call.get('params', {})
+    # files magic
+    files_merged = {}
+    files = {}
+    files_raw = call.get("files_raw", call.get("raw_files", {}))
+    files_streaming = call.get(TEMPLATE_PROPERTY_FILES_STREAMING)
+    stream_raw_files = files_streaming and isinstance(
+        resource_callback, _ResourceLoader)
+    # add all raw files
+    for name in files_raw:
+        if stream_raw_files:
+            # file is read from disk while request is sent
+            files_merged[name] = LocalFile(
+                resource_callback.get_path(files_raw[name]))
+        else:
+            files_merged[name] = resource_callback(files_raw[name])
+    # add inline files
+    files_merged.update(call.get("files", {}))
+    logger.debug('Files merged: %s',
+                 LazyLogText(files_merged, obfuscate=False))
+    if files_streaming and files_merged:
+        return _get_streaming_request_kwargs(
+            call, files_merged, payload_format, payload_data, params)
+    # convert files strcut to correct type
+    for name in files_merged:
+        if isinstance(files_merged[name], list):
+            # convert to correct struct
+            files[name] = tuple(files_merged[name])
+        elif isinstance(files_merged[name], string_types):
+            # send string as file
+            files[name] = StringIO(files_merged[name])
+        else:
+            # let's request decide about format
+            files[name] = files_merged[name]
+    logger.debug('Files: %s', LazyLogText(files, obfuscate=False))
+    # combine payloads and params
+    if payload_format == 'json':
+        json_payload = payload_data
+        data = None
+    elif payload_format == 'urlencoded' and isinstance(payload_data, dict):
+        json_payload = None
+        params.update(payload_data)
+        data = None
+    else:
+        json_payload = None
+        data = payload_data
+
+    headers = call.get('headers', None)
+    compression = RequestCompression.from_call(
+        call.get(TEMPLATE_PROPERTY_REQUEST_COMPRESSION))
+    if compression and not files:
+        json_payload, data, headers = compression.compress_payload(
+            json_payload, data, headers)
+    return _build_request_kwargs(call, headers, json_payload, params,
+                                 files or None, data)
+
+
+def _get_streaming_request_kwargs(call, files_merged, payload_format,
+                                  payload_data, params):
+    # same body as requests builds for files, but file content is read
+    # in chunks while body is sent
+    files = []
+    for name in files_merged:
+        value = files_merged[name]
+        if isinstance(value, list):
+            value = tuple(value)
+        files.append((name, value))
+    fields = []
+    if payload_format == 'json':
+        # json payload is ignored by requests when files are sent
+        payload_data = None
+    if payload_format == 'urlencoded' and isinstance(payload_data, dict):
+        params.update(payload_data)
+    elif isinstance(payload_data, dict):
+        # dict payload is sent as form fields, like requests does
+        for name in payload_data:
+            values = payload_data[name]
+            if not isinstance(values, list):
+                values = [values]
+            fields.extend((name, value) for value in values
+                          if value is not None)
+    elif payload_data:
+        raise WrongTemplateDataException(
+            "Payload of {} can't be sent with streamed files, "
+            "only dict payload is supported.".format(type(payload_data)))
+    encoder = MultipartEncoder(
+        fields, files, chunked=call.get(TEMPLATE_PROPERTY_FILES_CHUNKED))
+    headers = dict(call.get('headers') or {})
+    headers['Content-Type'] = encoder.content_type
+    return _build_request_kwargs(call, headers, None, params, None, encoder)
+
+
+def _build_request_kwargs(call, headers, json_payload, params, files, data):
+    accept_encoding = get_accept_encoding(
+        call.get(TEMPLATE_PROPERTY_RESPONSE_COMPRESSION))
+    if accept_encoding:
+        # compressed body is decoded by urllib3 while it is read
+        headers = dict(headers or {})
+        headers['Accept-Encoding'] = accept_encoding
+
+    # auth
+    if not call.get('auth'):
+        auth = None
+    else:
+        auth = (call['auth'].get('user'), call['auth'].get('password'))
+
+    request_kwargs = {
+        'auth': auth,
+        'headers': headers,
+        'verify': call.get('verify', True),
+        'cert': call.get('cert', None),
+        'proxies': call.get('proxies', None),
+        'timeout': call.get('timeout', None),
+        'json': json_payload,
+        'params': params,
+        'files': files,
+        'data': data,
+    }
+    if call.get(TEMPLATE_PROPERTY_RESPONSE_STREAMING):
+        # body is read by parser in _process_response
+        request_kwargs['stream'] = True
+    return request_kwargs
+
+
+def _send_to_host(session_pool, scheme, host, port, call, resource_callback):
+    full_url = '{}://{}:{}{}'.format(scheme, host, port, call['path'])
+    logger.debug('Full url: %r', full_url)
+    request_kwargs = _get_request_kwargs(call, resource_callback)
+    # run request, connections are reused by pooled sessions
+    session = session_pool.get(scheme, host, port,
+                               verify=request_kwargs['verify'],
+                               cert=request_kwargs['cert'],
+                               proxies=request_kwargs['proxies'])
+    host_health = get_host_health()
+    timing.start_connect_timer()
+    start_time = time.time()
+    try:
+        response = session.request(call['method'], full_url,
+                                   **request_kwargs)
+    except requests.exceptions.ConnectionError:
+        host_health.record_failure((scheme, host, port))
+        raise
+    finally:
+        connect_time, tls_time = timing.stop_connect_timer()
+    duration = time.time() - start_time
+    host_health.record_success((scheme, host, port), duration)
+    response.request_timing = _get_request_timing(
+        response, duration, connect_time, tls_time)
     return response
 
 
-def _process_response(response, call, store_props):
-    logger.debug('Process Response: {}'.format(shorted_text(response)))
-    logger.debug(
-        'Call: {}'.format(shorted_text(obfuscate_passwords(call))))
-    logger.debug('Store props: {}'.format(shorted_text(store_props)))
-    logger.debug('Store headers: {}'.format(shorted_text(obfuscate_passwords(
-        response.headers))))
+def _get_request_timing(response, duration, connect_time, tls_time):
+    # elapsed is time until headers are parsed, body of not streamed
+    # response is downloaded after that
+    elapsed = getattr(response, 'elapsed', None)
+    if isinstance(elapsed, timedelta):
+        elapsed = min(elapsed.total_seconds(), duration)
+    else:
+        elapsed = duration
+    return timing.RequestTiming(
+        connect=connect_time, tls=tls_time,
+        first_byte=max(elapsed - connect_time - tls_time, 0.0),
+        download=duration - elapsed)
+
+
+def _can_hedge(call, hosts):
+    if not call.get(TEMPLATE_PROPERTY_HEDGED_REQUESTS) or len(hosts) < 2:
+        return False
+    if call.get('files') or call.get('files_raw', call.get('raw_files')):
+        # file objects can't be sent twice
+        return False
+    return call['method'].upper() in HEDGED_METHODS
+
+
+def _get_hedge_executor():
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=HEDGE_MAX_WORKERS,
+                thread_name_prefix='rest-hedge')
+        return _hedge_executor
+
+
+def _close_response(future):
+    try:
+        future.result().close()
+    except Exception:
+        pass
+
+
+def _send_hedged(session_pool, scheme, hosts, port, call, resource_callback):
+    """Send request to first host, and if there is no response after
+    percentile of its recent latency, send same request to second host.
+    First successful response is used."""
+    executor = _get_hedge_executor()
+    primary = executor.submit(_send_to_host, session_pool, scheme, hosts[0],
+                              port, call, resource_callback)
+    delay = get_host_health().latency_percentile(
+        (scheme, hosts[0], port),
+        call.get('hedge_percentile', DEFAULT_HEDGE_PERCENTILE))
+    if delay is None:
+        delay = call.get('hedge_delay', DEFAULT_HEDGE_DELAY)
+    done, _ = wait([primary], timeout=delay)
+    if done and not primary.exception():
+        return primary.result()
+    logger.debug('Hedged request to host: %r', hosts[1])
+    secondary = executor.submit(_send_to_host, session_pool, scheme,
+                                hosts[1], port, call, resource_callback)
+    futures = [primary, secondary]
+    errors = []
+    try:
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except requests.exceptions.RequestException as e:
+                # other request can still answer
+                errors.append(e)
+                continue
+            for other in futures:
+                if other is not future:
+                    # response of slower request is not used
+                    other.add_done_callback(_close_response)
+            return response
+    except Exception:
+        # response of request still running is not used
+        for future in futures:
+            future.add_done_callback(_close_response)
+        raise
+    # same as for single host, only connection errors are sent to next
+    # hosts
+    for error in errors:
+        if not isinstance(error, requests.exceptions.ConnectionError):
+            raise error
+    raise errors[-1]
+
+
+def _process_response(response, call, store_props, call_timing=None):
+    logger.debug('Process Response: %s',
+                 LazyLogText(response, obfuscate=False))
+    logger.debug('Call: %s', LazyLogText(call))
+    logger.debug('Store props: %s', LazyLogText(store_props, obfuscate=False))
+    logger.debug('Store headers: %s', LazyLogText(response.headers))
     translation_version = call.get('translation_format', 'auto')
 
-    # process headers
-    if response.headers:
-        translate_and_save(logger, response.headers,
-                           call.get('header_translation', None),
-                           store_props, translation_version)
-    # process cookies
-    if response.cookies:
-        translate_and_save(logger, response.cookies.get_dict(),
-                           call.get('cookies_translation', None),
-                           store_props, translation_version)
+    with timing.measure(call_timing, 'translation'):
+        # process headers
+        if response.headers:
+            translate_and_save(logger, response.headers,
+                               call.get('header_translation', None),
+                               store_props, translation_version)
+        # process cookies
+        if response.cookies:
+            translate_and_save(logger, response.cookies.get_dict(),
+                               call.get('cookies_translation', None),
+                               store_props, translation_version)
     # process body
     response_format = call.get('response_format', 'auto').lower()
     if response_format == 'auto':
@@ -250,30 +931,30 @@ def _process_response(response, call, store_props):
                 response_content_type.startswith('application/xml')
             ):
                 response_format = 'xml'
-            logger.debug('Detected type is {}'.format(repr(response_format)))
+            logger.debug('Detected type is %r', response_format)
         # for backward compatibility set json for unknown types
         if response_format == 'auto':
             response_format = 'json'
-    logger.debug('Response format is {}'.format(repr(response_format)))
+    logger.debug('Response format is %r', response_format)
     if response_format == 'json' or response_format == 'xml':
-        if response_format == 'json':
-            json = response.json()
-        else:  # XML
-            json = xmltodict.parse(response.text)
-            logger.debug('XML transformed to dict: {}'
-                         .format(shorted_text(obfuscate_passwords(json))))
+        with timing.measure(call_timing, 'parse'):
+            json, is_empty = _load_response(response, call, response_format)
 
         # if empty do nothing
-        if not json:
-            logger.debug('Empty {0} response'.format(response_format))
-            return
-
-        _check_response(json, call.get('nonrecoverable_response'), False)
-        _check_response(json, call.get('response_expectation'), True)
-
-        translate_and_save(logger, json,
-                           call.get('response_translation', None),
-                           store_props, translation_version)
+        if is_empty:
+            logger.debug('Empty %s response', response_format)
+            return json
+
+        # checks are counted as part of translation
+        with timing.measure(call_timing, 'translation'):
+            _check_response(json, call.get('nonrecoverable_response'),
+                            False)
+            _check_response(json, call.get('response_expectation'), True)
+
+            translate_and_save(logger, json,
+                               call.get('response_translation', None),
+                               store_props, translation_version)
+        return json
     elif response_format == 'text':
         store_props['text'] = response.text
     elif response_format == 'raw':
@@ -285,62 +966,54 @@ def _process_response(response, call, store_props):
                 repr(response_format)))
 
 
+def _load_response(response, call, response_format):
+    if call.get(TEMPLATE_PROPERTY_RESPONSE_STREAMING):
+        try:
+            return _load_streamed_response(response, call, response_format)
+        finally:
+            response.close()
+    if response_format == 'json':
+        json = response.json()
+    else:  # XML
+        json = xmltodict.parse(response.text)
+        logger.debug('XML transformed to dict: %s', LazyLogText(json))
+    return json, not json
+
+
+def _load_streamed_response(response, call, response_format):
+    """Parse body while it is downloaded.
+
+    Json and xml are read by incremental parsers and only items used by
+    response_translation and response checks are kept in memory.
+    """
+    global _ijson_warning_logged
+    if response_format == 'json' and not streaming.ijson:
+        if not _ijson_warning_logged:
+            _ijson_warning_logged = True
+            logger.warning(
+                'ijson is not installed, json responses are not streamed')
+        json = response.json()
+        return json, not json
+    paths = streaming.compile_response_paths(call)
+    if not paths:
+        logger.debug('Nothing is used from response body')
+        return None, True
+    if response_format == 'xml':
+        json, is_empty = streaming.load_xml(response, paths)
+        logger.debug('XML transformed to dict: %s', LazyLogText(json))
+        return json, is_empty
+    return streaming.load_json(response, paths)
+
+
 def _check_response(json, response, is_recoverable):
     if not is_recoverable:
-        logger.debug(
-            'Check response (nonrecoverable) in json: {} by {}'.format(
-                shorted_text(obfuscate_passwords(json)),
-                repr(response)))
+        logger.debug('Check response (nonrecoverable) in json: %s by %r',
+                     LazyLogText(json), response)
     else:
-        logger.debug(
-            'Check response (recoverable) in json: {} by {}'.format(
-                shorted_text(obfuscate_passwords(json)),
-                repr(response)))
+        logger.debug('Check response (recoverable) in json: %s by %r',
+                     LazyLogText(json), response)
 
     if not response:
         return
-
-    if not isinstance(response, list) and not is_recoverable:
-        raise WrongTemplateDataException(
-            "Response (nonrecoverable) had to be list. "
-            "Type {} not supported. ".format(
-                type(response)))
-
-    if not isinstance(response, list) and is_recoverable:
-        raise WrongTemplateDataException(
-            "Response (recoverable) had to be list. "
-            "Type {} not supported. ".format(
-                type(response)))
-
-    if isinstance(response[0], list):
-        for item in response:
-            _check_response(json, item, is_recoverable)
-    else:
-        pattern = response.pop(-1)
-        for key in response:
-
-            try:
-                json = json[key]
-            except (TypeError, IndexError, KeyError) as e:
-                logger.debug(repr(e))
-                raise ExpectationException(
-                        'No key or index "{}" in json {}'.format(key, json))
-
-        if (
-            re.match(pattern, "{0}".format(json)) and
-            not is_recoverable
-        ):
-            raise NonRecoverableResponseException(
-                "Giving up... \n"
-                "Response value: "
-                "{} matches regexp:{} from nonrecoverable_response. ".format(
-                    json, pattern))
-        if (
-            not re.match(pattern, "{0}".format(json)) and
-            is_recoverable
-        ):
-            raise RecoverableResponseException(
-                "Trying one more time...\n"
-                "Response value:{} does not match regexp: {} "
-                "from response_expectation".format(
-                    json, pattern))
+    # compiled checks are cached and never change rules of call
+    get_expectation_matcher(response, is_recoverable).check(json)
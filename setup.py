@@ -8,6 +8,7 @@ install_requires = [
     'boto3',
     'psutil',
     'xmltodict',  # rest
+    'ijson',  # rest
     "pycdlib",  # cdrom image
     "Jinja2>=3.1.4",  # terminal
     'azure-identity',